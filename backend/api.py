@@ -1,36 +1,146 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import Depends, FastAPI, UploadFile, File, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from backend.core.orchestrator import LegalAssistantBackend
+from backend.core.jobs import JobManager, QueueFullError
+from backend.core import metrics
+from backend.core.scheduler import any_saturated
+from backend.core.uploads import UploadStore
+from backend.core.batch import BatchRunner, BatchTooLargeError, collect_files
+from backend.core.clause_selection import ClauseBudget
+from starlette.routing import Match
 import os
-import shutil
-import uuid
+import json
+import threading
+import time
+import zipfile
+from contextlib import asynccontextmanager
+from typing import List, Optional
 
-app = FastAPI(title="Legal Assistant API for Indian SMEs")
+# Cheap to construct: parser, spaCy and the LLM SDKs load on first use (or during warm-up)
 backend = LegalAssistantBackend()
+jobs = JobManager()
+batches = BatchRunner(backend)
+
+@asynccontextmanager
+async def lifespan(app):
+    # Optional background warm-up keeps startup (and the liveness probe) fast
+    if os.getenv("WARMUP_ON_STARTUP", "1") != "0":
+        threading.Thread(target=_warm_up, name="warm-up", daemon=True).start()
+    yield
+
+def _warm_up():
+    """Retries a failed warm-up with backoff (WARMUP_RETRY_SECONDS, doubling up to 10 minutes) until it succeeds."""
+    delay = float(os.getenv("WARMUP_RETRY_SECONDS", "30"))
+    while not backend.ready:
+        try:
+            backend.warm_up()
+        except Exception as e:
+            print(f"Warm-up Error: {str(e)}")
+            time.sleep(delay)
+            delay = min(delay * 2, 600)
+
+app = FastAPI(title="Legal Assistant API for Indian SMEs", lifespan=lifespan)
 
 # Get absolute path to the project root
 ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 UPLOAD_DIR = os.path.join(ROOT_DIR, "data", "uploads")
-if not os.path.exists(UPLOAD_DIR):
-    os.makedirs(UPLOAD_DIR)
+# Uploads are parsed from memory; with UPLOAD_PERSIST=1 they are also stored once per content hash
+# and evicted by age / total size (UPLOAD_RETENTION_DAYS, UPLOAD_MAX_BYTES)
+uploads = UploadStore(UPLOAD_DIR)
+
+@app.middleware("http")
+async def track_requests(request: Request, call_next):
+    # Label by route template (e.g. /jobs/{job_id}) so ids do not explode the label set
+    route = request.url.path
+    for candidate in app.router.routes:
+        if candidate.matches(request.scope)[0] == Match.FULL:
+            route = candidate.path
+            break
+    if route == "/metrics":
+        return await call_next(request)
+    start = time.perf_counter()
+    status = 500
+    with metrics.HTTP_IN_FLIGHT.track_inprogress(route=route):
+        try:
+            response = await call_next(request)
+            status = response.status_code
+        finally:
+            metrics.HTTP_SECONDS.observe(time.perf_counter() - start, method=request.method, route=route)
+            metrics.HTTP_REQUESTS.inc(method=request.method, route=route, status=status)
+    return response
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus text exposition of stage timings, LLM usage/cost, cache lookups and in-flight gauges."""
+    job_stats = jobs.stats()
+    for status in ("queued", "running"):
+        metrics.JOBS.set(job_stats[status], status=status)
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type="text/plain; version=0.0.4")
 
 @app.get("/")
 async def root():
     return {"message": "Legal Assistant AI API is running"}
 
+@app.get("/health")
+async def health():
+    """Liveness: the process is up and serving requests."""
+    return {"status": "ok"}
+
+@app.get("/ready")
+async def ready():
+    """Readiness: heavy components are loaded and the first analysis will not pay the cold start."""
+    if not backend.ready:
+        return JSONResponse(status_code=503, content={"status": "warming_up"})
+    return {"status": "ready"}
+
+def clause_budget(max_clauses: Optional[int] = Query(None, ge=0), max_llm_calls: Optional[int] = Query(None, ge=0),
+                  max_tokens: Optional[int] = Query(None, ge=0), max_seconds: Optional[float] = Query(None, ge=0)):
+    """Per-request clause budget; unset limits fall back to CLAUSE_BUDGET_* and 0 lifts a limit."""
+    return ClauseBudget.from_env(max_clauses=max_clauses, max_llm_calls=max_llm_calls,
+                                 max_tokens=max_tokens, max_seconds=max_seconds)
+
+def _run_job(source, original_filename, content_hash=None, previous_report_id=None, budget=None, progress=None):
+    try:
+        report = backend.process_contract(source, progress=progress, priority="batch", content_hash=content_hash,
+                                          filename=original_filename, previous_report_id=previous_report_id,
+                                          budget=budget)
+    finally:
+        uploads.release(source)
+    if "error" not in report:
+        report["original_filename"] = original_filename
+    return report
+
 @app.post("/analyze")
-async def analyze_contract(file: UploadFile = File(...)):
-    # 1. Save uploaded file temporarily
-    file_id = str(uuid.uuid4())
-    ext = os.path.splitext(file.filename)[1]
-    temp_filename = f"{file_id}{ext}"
-    temp_path = os.path.join(UPLOAD_DIR, temp_filename)
-    
+async def analyze_contract(file: UploadFile = File(...), background: bool = Query(False),
+                           previous_report_id: Optional[str] = Query(None), budget: ClauseBudget = Depends(clause_budget)):
+    """
+    Analyzes an upload. With background=true the file is queued and a job id is returned
+    immediately; poll GET /jobs/{job_id} for progress and the final report.
+    previous_report_id marks the upload as a revision: only changed clauses are re-analyzed
+    and the report includes a redline "revision" delta.
+    max_clauses, max_llm_calls, max_tokens and max_seconds cap the clause analysis; the
+    riskiest clauses are analyzed first and the report lists the skipped ones.
+    """
+    _check_previous_report(previous_report_id)
+    if not background:
+        _check_llm_capacity()
+    # 1. Hash the upload; it is parsed from the spooled buffer unless persisted for retention
+    content_hash, source = await run_in_threadpool(uploads.accept, file.file, file.filename, background)
+    release = True
+
     try:
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        if background:
+            try:
+                job = jobs.submit(_run_job, source, file.filename, content_hash, previous_report_id, budget)
+            except QueueFullError as e:
+                raise HTTPException(status_code=503, detail=str(e))
+            release = False  # The job releases it
+            return JSONResponse(status_code=202, content={"job_id": job.id, "status": job.status})
         
-        # 2. Process via Backend Orchestrator
-        report = backend.process_contract(temp_path)
+        # 2. Process via Backend Orchestrator (off the event loop); a re-upload is served from the report cache
+        report = await run_in_threadpool(backend.process_contract, source, content_hash=content_hash,
+                                         filename=file.filename, previous_report_id=previous_report_id, budget=budget)
         
         # 3. Handle errors
         if "error" in report:
@@ -41,21 +151,114 @@ async def analyze_contract(file: UploadFile = File(...)):
         
         return report
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        # Cleanup (Optional: keep or delete based on performance vs audit requirements)
-        # os.remove(temp_path)
-        pass
+        if release:
+            uploads.release(source)
+
+@app.post("/analyze/stream")
+async def analyze_contract_stream(file: UploadFile = File(...), format: str = Query("ndjson", pattern="^(ndjson|sse)$"),
+                                  previous_report_id: Optional[str] = Query(None), budget: ClauseBudget = Depends(clause_budget)):
+    """
+    Streaming variant of /analyze. Emits one event per line as the pipeline produces it:
+    metadata (contract type, entities), summary, each clause analysis in order, then the full report.
+    format=sse switches from NDJSON to Server-Sent Events framing.
+    """
+    _check_previous_report(previous_report_id)
+    _check_llm_capacity()
+    # The upload stays open until the response has been sent, so the stream can parse it in place
+    content_hash, source = await run_in_threadpool(uploads.accept, file.file, file.filename)
+
+    def event_stream():
+        # Sync generator: Starlette iterates it in the threadpool, keeping the event loop free
+        try:
+            for event in backend.iter_contract_events(source, content_hash=content_hash, filename=file.filename,
+                                                      previous_report_id=previous_report_id, budget=budget):
+                if event["event"] == "report":
+                    event["report"]["original_filename"] = file.filename
+                yield _frame(event, format)
+        except Exception as e:
+            yield _frame({"event": "error", "error": str(e)}, format)
+        finally:
+            uploads.release(source)
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(event_stream(), media_type=media_type)
+
+def _run_batch(files, progress=None):
+    try:
+        return batches.run(files, progress=progress)
+    finally:
+        for _, _, source in files:
+            uploads.release(source)
+
+@app.post("/analyze/batch")
+async def analyze_batch(files: List[UploadFile] = File(...)):
+    """
+    Portfolio audit: accepts several contracts and/or ZIP archives of them and queues one
+    background job. Poll GET /jobs/{job_id} for contracts_done / contracts_total; the result
+    holds every report plus a portfolio summary (risk distribution, missing clauses, types).
+    """
+    try:
+        entries = await run_in_threadpool(collect_files, [(f.filename, f.file) for f in files], uploads)
+    except BatchTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except zipfile.BadZipFile as e:
+        raise HTTPException(status_code=400, detail=f"Invalid ZIP archive: {str(e)}")
+    if not entries:
+        raise HTTPException(status_code=400, detail="No PDF, DOCX or TXT contracts found in the upload")
+
+    try:
+        job = jobs.submit(_run_batch, entries)
+    except QueueFullError as e:
+        for _, _, source in entries:
+            uploads.release(source)
+        raise HTTPException(status_code=503, detail=str(e))
+    return JSONResponse(status_code=202, content={"job_id": job.id, "status": job.status, "contracts": len(entries)})
+
+def _check_previous_report(report_id):
+    if report_id and backend.audit.get(report_id) is None:
+        raise HTTPException(status_code=404, detail="Previous report not found")
+
+def _check_llm_capacity():
+    """Backpressure: refuse new interactive work while the LLM scheduler queue is full or paused by a 429."""
+    if any_saturated():
+        raise HTTPException(status_code=503, detail="LLM capacity exhausted, retry shortly", headers={"Retry-After": "10"})
+
+def _frame(event, format):
+    payload = json.dumps(event)
+    if format == "sse":
+        return f"event: {event['event']}\ndata: {payload}\n\n"
+    return payload + "\n"
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+@app.get("/jobs")
+async def get_job_stats():
+    return jobs.stats()
 
 @app.get("/audit-logs")
-async def get_logs():
-    log_file = os.path.join(ROOT_DIR, "logs", "audit_trail.json")
-    if os.path.exists(log_file):
-        import json
-        with open(log_file, 'r') as f:
-            return json.load(f)
-    return {"message": "No logs found"}
+async def get_logs(limit: int = Query(50, ge=1, le=500), offset: int = Query(0, ge=0), since: Optional[str] = None):
+    """Newest-first page of audit reports, optionally only those at or after `since` (ISO timestamp)."""
+    page = backend.audit.list(limit=limit, offset=offset, since=since)
+    if page["total"] == 0:
+        return {"message": "No logs found", **page}
+    return page
+
+@app.get("/audit-logs/{report_id}")
+async def get_log(report_id: str):
+    report = backend.audit.get(report_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Report not found")
+    return report
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,168 @@
+import asyncio
+import threading
+import time
+from . import metrics
+from .llm_engine import LLMBusyError, LLMEngine, LLMRequestError
+from .scheduler import SchedulerBusyError
+
+
+class AsyncLLMEngine(LLMEngine):
+    """
+    Awaitable LLMEngine built on AsyncOpenAI / AsyncAnthropic. Prompts, caching, scheduling,
+    metrics and the demo mode are shared with LLMEngine; an in-flight call holds no thread,
+    so one process can keep hundreds of them open over the pooled keep-alive connections.
+    Response cache reads and writes (SQLite) run in worker threads, never on the event loop.
+    """
+    def __init__(self, provider="openai", cache=None):
+        super().__init__(provider=provider, cache=cache)
+        self._async_clients = {}  # event loop -> SDK client (see http_pool.async_client)
+
+    def _make_client(self):
+        return None  # Async clients are bound to an event loop; built on first use in _send
+
+    def _loop_client(self):
+        from .http_pool import async_client
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            if self.provider == "openai":
+                from openai import AsyncOpenAI
+                client = AsyncOpenAI(api_key=self._key, max_retries=0, http_client=async_client())
+            else:
+                from anthropic import AsyncAnthropic
+                client = AsyncAnthropic(api_key=self._key, max_retries=0, http_client=async_client())
+            self._async_clients[loop] = client
+        return client
+
+    async def analyze_clause(self, clause_text: str, contract_type: str):
+        if not self.is_live():
+            return self._offline_clause_analysis(clause_text, contract_type)
+        return await self._get_completion(*self._clause_request(clause_text, contract_type))
+
+    async def analyze_clause_batch(self, clauses, contract_type: str):
+        results, keys = await asyncio.to_thread(self._cached_batch, clauses, contract_type)
+        todo = [i for i, r in enumerate(results) if r is None]
+        if len(todo) > 1 and self.is_live():
+            response = await self._get_completion(self._batch_prompt(clauses, todo, contract_type))
+            await asyncio.to_thread(self._store_batch, response, todo, keys, results)
+
+        # Clauses the batch did not answer are retried concurrently
+        missing = [i for i, r in enumerate(results) if r is None]
+        retried = await asyncio.gather(*(self.analyze_clause(clauses[i], contract_type) for i in missing))
+        for i, analysis in zip(missing, retried):
+            results[i] = analysis
+        return results
+
+    async def summarize_contract(self, full_text: str, contract_type: str, sections=None):
+        chunks = self._summary_chunks(full_text, sections)
+        if len(chunks) == 1:
+            return await self._get_completion(*self._summary_request(full_text, contract_type))
+        partials = await asyncio.gather(*(self._get_completion(*self._section_request(chunk, contract_type)) for chunk in chunks))
+        parts, covered = self._summary_parts(partials), None
+        if not parts:
+            return partials[0]
+        while True:
+            groups = self._reduce_groups(parts, contract_type)
+            if groups is None:
+                break
+            merged = await asyncio.gather(*(self._get_completion(*self._merge_request(group, contract_type)) for group in groups))
+            parts, covered = self._merged_parts(groups, merged, covered)
+            if not parts:
+                return merged[0]
+        summary = await self._get_completion(*self._reduce_request(parts, contract_type))
+        return self._with_coverage(summary, chunks, sum(covered) if covered else len(parts))
+
+    async def detect_hindi_and_translate(self, text: str):
+        return await self._get_completion(*self._translate_request(text))
+
+    async def _get_completion(self, prompt: str, cache_key: str = None):
+        if not self.is_live():
+            return self._simulated(prompt)
+        cached = await asyncio.to_thread(self._cached, cache_key) if cache_key is not None else None
+        if cached is not None:
+            return cached
+
+        try:
+            result = await self._request_completion(prompt)
+        except LLMRequestError as e:
+            return self._request_error(e)
+
+        if cache_key is not None:
+            await asyncio.to_thread(self.cache.set, cache_key, result)
+        return result
+
+    async def _request_completion(self, prompt: str):
+        request = metrics.current_request.get()
+        priority = getattr(request, "priority", "interactive")
+        estimate = self._estimate(prompt)
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self.scheduler.acquire_async(estimate, priority=priority, job=request)
+            except SchedulerBusyError as e:
+                metrics.LLM_REQUESTS.inc(provider=self.provider, model=self.model, outcome="rejected")
+                raise LLMBusyError(str(e))
+            options = self._request_options(estimate, last_error)
+            start = time.perf_counter()
+            try:
+                with metrics.LLM_IN_FLIGHT.track_inprogress(provider=self.provider):
+                    response = await self._send(prompt, **options)
+            except LLMRequestError:
+                raise
+            except Exception as e:
+                last_error = e
+                backoff = self._on_failure(e, estimate, attempt)
+                if backoff is None:
+                    break
+                await asyncio.sleep(self._backoff_within_deadline(backoff))
+                continue
+            return self._on_response(response, estimate, start)
+        raise LLMRequestError(str(last_error))
+
+    async def _send(self, prompt: str, **options):
+        if not self._key:
+            raise LLMRequestError(f"No API key configured for {self.provider}")
+        client = self._loop_client()
+        if self.provider == "openai":
+            return await client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                response_format={"type": "json_object"},
+                **options
+            )
+        return await client.messages.create(
+            model=self.model,
+            max_tokens=2000,
+            messages=[{"role": "user", "content": prompt}],
+            **options
+        )
+
+
+class LLMEventLoop:
+    """
+    A private asyncio loop on a daemon thread. Synchronous code (the orchestrator's worker
+    threads) hands it coroutines with submit() and gets concurrent.futures.Future objects back.
+    """
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="llm-loop", daemon=True)
+        self._thread.start()
+
+    def submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro):
+        """Runs a coroutine on the loop and blocks the calling thread for its result."""
+        return self.submit(coro).result()
+
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def get_llm_loop() -> LLMEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = LLMEventLoop()
+        return _loop
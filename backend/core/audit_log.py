@@ -0,0 +1,150 @@
+import json
+import os
+import threading
+import uuid
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+
+class AuditLog:
+    """
+    Append-only JSONL audit trail with a small offset index.
+    Each report is written as one line to audit_trail.jsonl; audit_index.jsonl records
+    (id, timestamp, offset, length) so readers can page or fetch a report without
+    loading the full history. Writers serialize on an exclusive file lock.
+    """
+    def __init__(self, logs_dir: str):
+        self.logs_dir = logs_dir
+        os.makedirs(logs_dir, exist_ok=True)
+        self.data_file = os.path.join(logs_dir, "audit_trail.jsonl")
+        self.index_file = os.path.join(logs_dir, "audit_index.jsonl")
+        self.lock_file = os.path.join(logs_dir, ".audit.lock")
+
+        self._lock = threading.Lock()
+        self._index = []
+        self._by_id = {}
+        self._index_pos = 0
+
+        self._migrate_legacy()
+
+    def _file_lock(self):
+        return _FileLock(self.lock_file, self._lock)
+
+    def append(self, report: dict) -> str:
+        """Appends a report and returns its id."""
+        report.setdefault("report_id", uuid.uuid4().hex)
+        line = (json.dumps(report, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._file_lock():
+            with open(self.data_file, "ab") as f:
+                f.seek(0, os.SEEK_END)
+                offset = f.tell()
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            entry = {
+                "id": report["report_id"],
+                "timestamp": report.get("timestamp", ""),
+                "offset": offset,
+                "length": len(line),
+            }
+            with open(self.index_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+        return report["report_id"]
+
+    def _refresh_index(self):
+        """Reads only the index lines appended since the last refresh."""
+        if not os.path.exists(self.index_file):
+            return
+        with self._lock:
+            with open(self.index_file, "rb") as f:
+                f.seek(self._index_pos)
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        break  # Partially written line; pick it up next time
+                    self._index_pos += len(raw)
+                    try:
+                        entry = json.loads(raw)
+                    except ValueError:
+                        continue
+                    self._by_id[entry["id"]] = len(self._index)
+                    self._index.append(entry)
+
+    def _read(self, entry):
+        with open(self.data_file, "rb") as f:
+            f.seek(entry["offset"])
+            return json.loads(f.read(entry["length"]))
+
+    def count(self) -> int:
+        self._refresh_index()
+        return len(self._index)
+
+    def list(self, limit: int = 50, offset: int = 0, since: str = None):
+        """
+        Newest-first page of reports. `since` is an ISO timestamp; only reports at or
+        after it are returned.
+        """
+        self._refresh_index()
+        entries = self._index
+        if since:
+            entries = [e for e in entries if e["timestamp"] >= since]
+        total = len(entries)
+        end = max(total - offset, 0)
+        page = entries[max(end - limit, 0):end][::-1]
+        return {
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "items": [self._read(e) for e in page],
+        }
+
+    def recent(self, n: int = 5):
+        return self.list(limit=n)["items"]
+
+    def get(self, report_id: str):
+        self._refresh_index()
+        pos = self._by_id.get(report_id)
+        if pos is None:
+            return None
+        return self._read(self._index[pos])
+
+    def _migrate_legacy(self):
+        """One-time import of the old read-modify-write audit_trail.json array."""
+        legacy = os.path.join(self.logs_dir, "audit_trail.json")
+        if not os.path.exists(legacy):
+            return
+        with self._file_lock():
+            if not os.path.exists(legacy):
+                return
+            try:
+                with open(legacy, "r") as f:
+                    reports = json.load(f)
+            except ValueError:
+                reports = []
+            os.replace(legacy, legacy + ".migrated")
+        for report in reports:
+            self.append(report)
+
+
+class _FileLock:
+    """Thread lock plus an advisory flock so separate worker processes also serialize."""
+    def __init__(self, path, thread_lock):
+        self.path = path
+        self.thread_lock = thread_lock
+        self._fd = None
+
+    def __enter__(self):
+        self.thread_lock.acquire()
+        if fcntl is not None:
+            self._fd = open(self.path, "a")
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            self._fd.close()
+            self._fd = None
+        self.thread_lock.release()
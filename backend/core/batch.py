@@ -0,0 +1,258 @@
+import os
+import threading
+import time
+import uuid
+import zipfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from .process_pool import discard_process_pool, get_process_pool
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".txt")
+
+# Composite risk score (1-10) bands for the portfolio view, by upper bound
+RISK_BANDS = (("Low", 3), ("Medium", 6), ("High", 10))
+
+
+class BatchTooLargeError(ValueError):
+    """Raised when an upload exceeds the file count or size limits of a batch."""
+
+
+def _no_progress(stage, **details):
+    pass
+
+
+def _is_contract(name):
+    return os.path.splitext(name or "")[1].lower() in SUPPORTED_EXTENSIONS
+
+
+def collect_files(uploads, store, max_files=None, max_bytes=None):
+    """
+    Expands ZIP archives and returns [(filename, content_hash, source)] for every PDF, DOCX
+    and TXT among `uploads` ((filename, file object) pairs). Sources come from
+    store.accept, so they are bytes, or held paths when uploads are persisted.
+    """
+    max_files = max_files or int(os.getenv("BATCH_MAX_FILES", "500"))
+    max_bytes = max_bytes or int(os.getenv("BATCH_MAX_BYTES", str(512 * 1024 ** 2)))
+    members = []
+    total = 0
+
+    def check(count, size):
+        if count > max_files:
+            raise BatchTooLargeError(f"A batch may contain at most {max_files} contracts")
+        if size > max_bytes:
+            raise BatchTooLargeError(f"A batch may contain at most {max_bytes} bytes of contracts")
+
+    for filename, fileobj in uploads:
+        if os.path.splitext(filename or "")[1].lower() == ".zip":
+            with zipfile.ZipFile(fileobj) as archive:
+                infos = [i for i in archive.infolist() if not i.is_dir() and _is_contract(i.filename)
+                         and not i.filename.startswith("__MACOSX/") and not os.path.basename(i.filename).startswith(".")]
+                # Declared sizes are checked before decompressing (reads never exceed them)
+                total += sum(i.file_size for i in infos)
+                check(len(members) + len(infos), total)
+                members.extend((i.filename, archive.read(i)) for i in infos)
+        elif _is_contract(filename):
+            data = fileobj.read()
+            total += len(data)
+            check(len(members) + 1, total)
+            members.append((filename, data))
+    return [(name, *store.accept(data, name, detach=True)) for name, data in members]
+
+
+_worker_backend = None
+
+
+def _init_worker():
+    """Builds the worker's backend once; pool workers live across batches (see get_process_pool)."""
+    global _worker_backend
+    from .orchestrator import LegalAssistantBackend
+    from .parser import ContractParser
+    _worker_backend = LegalAssistantBackend(concurrent=False)
+    _worker_backend._parser = ContractParser(workers=1)  # The batch pool already uses every core
+
+
+def _prepare(source, filename):
+    """Runs in a worker process; module-level so the pool can pickle it."""
+    return _worker_backend.prepare_contract(source, filename)
+
+
+class BatchRunner:
+    """
+    Analyzes many contracts as one job. Parsing and NER run in the shared "batch" process
+    pool (spawned or forkserver workers, reused by every batch), while the LLM stages of up to `concurrency` contracts run at once at batch priority. Their calls
+    all share the provider's rate-limit scheduler, so a large batch keeps the queue full
+    and finishes about as fast as the RPM/TPM budget allows. A contract starts its LLM
+    stage only while the scheduler's backlog is under `max_backlog` seconds, and one whose
+    calls were turned away or timed out ("retryable" errors) is analyzed again, up to
+    `retries` times, instead of reporting those errors.
+    """
+    def __init__(self, backend, workers=None, concurrency=None, max_backlog=None, retries=None):
+        self.backend = backend
+        self.workers = workers or int(os.getenv("BATCH_WORKERS", str(os.cpu_count() or 1)))
+        self.concurrency = concurrency or int(os.getenv("BATCH_CONCURRENCY", "8"))
+        self.max_backlog = max_backlog if max_backlog is not None else float(os.getenv("BATCH_MAX_BACKLOG", "30"))
+        self.retries = retries if retries is not None else int(os.getenv("BATCH_RETRIES", "2"))
+        self.pace_seconds = 0.5
+
+    @staticmethod
+    def _prepared(future, pool):
+        """A worker's prepare_contract result; None (the analysis then parses in-process) if there is none or the pool broke."""
+        if future is None:
+            return None
+        try:
+            return future.result()
+        except BrokenProcessPool as e:
+            print(f"Batch Pool Error: {str(e) or type(e).__name__}")
+            discard_process_pool("batch", pool)
+            return None
+
+    def _pace(self):
+        """Waits while the provider's queue already holds more than max_backlog seconds of calls."""
+        scheduler = self.backend.llm.scheduler
+        while scheduler.backlog_seconds() > self.max_backlog:
+            time.sleep(self.pace_seconds)
+
+    @staticmethod
+    def _retryable(report):
+        """True if the summary or a clause failed only because the LLM calls were turned away or timed out."""
+        results = [report.get("summary")] + [item.get("analysis") for item in report.get("clause_analysis", [])]
+        return any(isinstance(r, dict) and r.get("retryable") for r in results)
+
+    def _analyze(self, source, content_hash, filename, ready):
+        """process_contract, paced by the scheduler backlog and repeated while the report has retryable errors."""
+        for attempt in range(self.retries + 1):
+            self._pace()
+            report = self.backend.process_contract(source, priority="batch", content_hash=content_hash,
+                                                   filename=filename, prepared=ready)
+            if "error" in report or not self._retryable(report):
+                break
+            print(f"Batch Retry ({filename}): LLM calls turned away or timed out (attempt {attempt + 1})")
+        return report
+
+    def run(self, files, progress=None):
+        """
+        Analyzes [(filename, content_hash, source)] and returns the per-contract reports (in
+        input order), the failures and the portfolio summary. Identical files are analyzed
+        once. `progress` is called as progress(stage, contracts_done=..., contracts_total=..., failed=...).
+        """
+        started = time.perf_counter()
+        progress = progress or _no_progress
+        first = {}  # content hash -> index of its first file
+        for i, (_, content_hash, _) in enumerate(files):
+            first.setdefault(content_hash, i)
+        unique = sorted(first.values())
+        counts = {"done": 0, "failed": 0}
+        lock = threading.Lock()
+        progress("preparing", contracts_done=0, contracts_total=len(unique), failed=0)
+
+        pool = get_process_pool("batch", max(1, self.workers), initializer=_init_worker)
+        prepared = {}
+        try:
+            # Files with a cached report are replayed without going through the workers
+            for i in unique:
+                filename, content_hash, source = files[i]
+                if not self.backend.has_cached_report(source, content_hash):
+                    prepared[i] = pool.submit(_prepare, source, filename)
+
+            def analyze(i):
+                filename, content_hash, source = files[i]
+                try:
+                    report = self._analyze(source, content_hash, filename, self._prepared(prepared.get(i), pool))
+                except Exception as e:
+                    print(f"Batch Error ({filename}): {str(e)}")
+                    report = {"error": str(e)}
+                with lock:
+                    counts["done"] += 1
+                    counts["failed"] += "error" in report
+                    progress("analyzing", contracts_done=counts["done"], contracts_total=len(unique), failed=counts["failed"])
+                return report
+
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="batch") as threads:
+                reports = dict(zip(unique, threads.map(analyze, unique)))
+        finally:
+            # The pool is shared: only this batch's unstarted preparations are dropped
+            for future in prepared.values():
+                future.cancel()
+
+        succeeded, failed = [], []
+        for i, (filename, content_hash, _) in enumerate(files):
+            report = reports[first[content_hash]]
+            if "error" in report:
+                failed.append({"filename": filename, "error": report["error"]})
+            elif i in reports:
+                succeeded.append(report)
+            else:
+                succeeded.append(dict(report, filename=filename, duplicate_of=report["report_id"]))
+        return {
+            "batch_id": uuid.uuid4().hex,
+            "contracts_total": len(files),
+            "reports": succeeded,
+            "failed": failed,
+            "portfolio": portfolio_summary(succeeded),
+            "seconds": round(time.perf_counter() - started, 3)
+        }
+
+
+def portfolio_summary(reports, top_n=10):
+    """
+    Aggregate view over a set of reports: contracts by type, clause and contract risk
+    distributions, the most commonly missing clauses and the riskiest contracts. Clauses
+    and summaries that failed are counted as failed, not in the risk figures.
+    """
+    by_type = Counter(r.get("contract_type") or "Unknown" for r in reports)
+    clause_risk = Counter({"High": 0, "Medium": 0, "Low": 0})
+    contract_risk = Counter({band: 0 for band, _ in RISK_BANDS})
+    missing = Counter()
+    missing_labels = {}
+    scored = []
+    usage = Counter()
+    failed_clauses, incomplete = 0, 0
+
+    for report in reports:
+        failed = 0
+        for item in report.get("clause_analysis", []):
+            analysis = item.get("analysis") or {}
+            if "error" in analysis:
+                failed += 1
+            elif analysis.get("risk_level") in clause_risk:
+                clause_risk[analysis["risk_level"]] += 1
+        failed_clauses += failed
+
+        summary = report.get("summary") or {}
+        incomplete += bool(failed or "error" in summary)
+        score = summary.get("composite_risk_score")
+        if isinstance(score, (int, float)):
+            contract_risk[next((band for band, upper in RISK_BANDS if score <= upper), "High")] += 1
+            scored.append((score, report))
+
+        # Count each clause once per contract, merging differently cased spellings
+        names = {str(n).strip().lower(): str(n).strip() for n in summary.get("missing_clauses") or [] if str(n).strip()}
+        for key, label in names.items():
+            missing[key] += 1
+            missing_labels.setdefault(key, label)
+
+        if "duplicate_of" not in report:
+            for key, value in (report.get("llm_usage") or {}).items():
+                usage[key] += value
+
+    scored.sort(key=lambda pair: pair[0], reverse=True)
+    return {
+        "contracts": len(reports),
+        "by_type": dict(by_type.most_common()),
+        "clause_risk_distribution": dict(clause_risk),
+        "failed_clauses": failed_clauses,
+        "incomplete_contracts": incomplete,
+        "contract_risk_distribution": dict(contract_risk),
+        "average_risk_score": round(sum(s for s, _ in scored) / len(scored), 2) if scored else None,
+        "most_common_missing_clauses": [
+            {"clause": missing_labels[key], "contracts": n, "share": round(n / len(reports), 3)}
+            for key, n in missing.most_common(top_n)
+        ],
+        "highest_risk_contracts": [
+            {"report_id": r.get("report_id"), "filename": r.get("filename"),
+             "contract_type": r.get("contract_type"), "composite_risk_score": s}
+            for s, r in scored[:top_n]
+        ],
+        "llm_usage": {k: round(v, 6) if isinstance(v, float) else v for k, v in usage.items()}
+    }
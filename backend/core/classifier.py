@@ -0,0 +1,89 @@
+import math
+import re
+from collections import defaultdict
+from .patterns import compile_phrases, phrase_of
+
+# Keyword/phrase weights per contract type. Distinctive terms weigh more than generic ones.
+CONTRACT_TYPE_KEYWORDS = {
+    "Employment Agreement": {
+        "employment agreement": 6, "employment": 3, "employer": 3, "employee": 2, "salary": 2,
+        "probation": 2, "notice period": 1, "designation": 1, "gratuity": 2,
+    },
+    "Lease Agreement": {
+        "lease agreement": 6, "lease deed": 6, "leave and license": 6, "lease": 3, "lessor": 3,
+        "lessee": 3, "tenant": 2, "landlord": 2, "rent": 2, "premises": 1, "security deposit": 1,
+    },
+    "Vendor Contract": {
+        "vendor agreement": 6, "supply agreement": 6, "vendor": 3, "supplier": 3,
+        "purchase order": 2, "procurement": 2, "goods": 1, "delivery": 1,
+    },
+    "Partnership Deed": {
+        "partnership deed": 6, "partnership": 3, "partners": 2, "capital contribution": 2,
+        "profit sharing": 2, "firm": 1,
+    },
+    "Service Contract": {
+        "master services agreement": 6, "master service agreement": 6, "service agreement": 5,
+        "statement of work": 3, "service provider": 2, "service level": 2, "services": 1, "service": 1,
+    },
+}
+DEFAULT_LABEL = "General Agreement"
+
+# Where the title and recitals end: the first top-level clause heading
+FIRST_CLAUSE = re.compile(r'\n\s*(?:1\.|Article\s+(?:I|1)\b|ARTICLE\s+(?:I|1)\b|Section\s+1\b)')
+
+
+class ContractClassifier:
+    """
+    Weighted multi-pattern contract-type classifier.
+    All keyword patterns for all labels are compiled into one trie-shaped regex and found in
+    a single pass. Each label scores sum(weight * log(1 + occurrences)), where occurrences in
+    the title/recitals count `header_boost` times. Returns a ranked list with confidences;
+    without enough evidence it falls back to DEFAULT_LABEL with confidence 0.
+    """
+    def __init__(self, keywords=None, header_chars=3000, header_boost=3.0, min_score=1.0):
+        self.keywords = keywords or CONTRACT_TYPE_KEYWORDS
+        self.header_chars = header_chars
+        self.header_boost = header_boost
+        self.min_score = min_score
+
+        # phrase -> [(label, weight)]; one phrase may signal several labels
+        self._phrase_labels = defaultdict(list)
+        for label, phrases in self.keywords.items():
+            for phrase, weight in phrases.items():
+                self._phrase_labels[phrase].append((label, weight))
+        self._matcher = compile_phrases(self._phrase_labels)
+
+    def _header_end(self, text):
+        m = FIRST_CLAUSE.search(text, 0, self.header_chars)
+        return m.start() if m else min(len(text), self.header_chars)
+
+    def rank(self, text: str):
+        """Returns [{"label", "score", "confidence"}] sorted best first."""
+        header_end = self._header_end(text)
+        counts = defaultdict(float)
+        for m in self._matcher.finditer(text):
+            counts[phrase_of(m)] += self.header_boost if m.start() < header_end else 1.0
+
+        scores = defaultdict(float)
+        for phrase, count in counts.items():
+            for label, weight in self._phrase_labels[phrase]:
+                scores[label] += weight * math.log1p(count)
+
+        total = sum(scores.values())
+        if total < self.min_score:
+            return [{"label": DEFAULT_LABEL, "score": 0.0, "confidence": 0.0}]
+        ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+        return [
+            {"label": label, "score": round(score, 3), "confidence": round(score / total, 3)}
+            for label, score in ranked
+        ]
+
+    def classify(self, text: str) -> str:
+        return self.rank(text)[0]["label"]
+
+    def classify_batch(self, texts, top_k: int = 1):
+        """
+        Classifies many documents with the same compiled matcher. Returns the top_k ranked
+        labels for each text, in input order.
+        """
+        return [self.rank(text)[:top_k] for text in texts]
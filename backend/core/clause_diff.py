@@ -0,0 +1,93 @@
+import difflib
+from .segmenter import HEADING
+
+# Order of risk levels, for the direction of a change
+RISK_ORDER = {"Low": 0, "Medium": 1, "High": 2}
+
+
+def _normalize(text: str) -> str:
+    """Whitespace- and case-insensitive text without its heading number, so renumbering is no change."""
+    heading = HEADING.match(text)
+    if heading:
+        text = text[heading.end():]
+    return " ".join(text.split()).lower()
+
+
+def similarity(a: str, b: str) -> float:
+    """Word-level similarity (0-1) of two clause texts."""
+    return difflib.SequenceMatcher(None, _normalize(a).split(), _normalize(b).split(), autojunk=False).ratio()
+
+
+def align_clauses(old, new, threshold=0.5):
+    """
+    Stable clause-level diff of two versions. Returns ops in document order, each a dict
+    {"status", "old", "new", "similarity"} where status is "unchanged" (same text up to
+    whitespace and case), "moved" (same text elsewhere), "modified" (a replaced clause at
+    least `threshold` similar, paired in order), "added" or "removed".
+    """
+    a = [_normalize(t) for t in old]
+    b = [_normalize(t) for t in new]
+    ops = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag == "equal":
+            ops.extend({"status": "unchanged", "old": i, "new": j, "similarity": 1.0}
+                       for i, j in zip(range(i1, i2), range(j1, j2)))
+            continue
+        # Pair each new clause with the most similar old one after the last pairing
+        next_old = i1
+        for j in range(j1, j2):
+            scored = [(similarity(old[i], new[j]), i) for i in range(next_old, i2)]
+            score, best = max(scored, default=(0.0, None), key=lambda pair: pair[0])
+            if best is None or score < threshold:
+                ops.append({"status": "added", "old": None, "new": j, "similarity": 0.0})
+                continue
+            ops.extend({"status": "removed", "old": i, "new": None, "similarity": 0.0} for i in range(next_old, best))
+            ops.append({"status": "modified", "old": best, "new": j, "similarity": round(score, 3)})
+            next_old = best + 1
+        ops.extend({"status": "removed", "old": i, "new": None, "similarity": 0.0} for i in range(next_old, i2))
+
+    # An added clause whose exact text was removed elsewhere was only moved
+    removed = {a[op["old"]]: op for op in ops if op["status"] == "removed"}
+    for op in ops:
+        if op["status"] == "added" and b[op["new"]] in removed:
+            source = removed.pop(b[op["new"]])
+            op.update(status="moved", old=source["old"], similarity=1.0)
+            ops.remove(source)
+    return ops
+
+
+def changed_ratio(old, new, ops) -> float:
+    """Share of the clause text (by characters) that was added, removed or rewritten."""
+    changed = 0.0
+    for op in ops:
+        if op["status"] == "added":
+            changed += len(new[op["new"]])
+        elif op["status"] == "removed":
+            changed += len(old[op["old"]])
+        elif op["status"] == "modified":
+            changed += len(new[op["new"]]) * (1 - op["similarity"])
+    total = max(sum(len(t) for t in old), sum(len(t) for t in new), 1)
+    return min(1.0, changed / total)
+
+
+def redline(old: str, new: str):
+    """Word-level redline of a modified clause: [{"op": "equal" | "delete" | "insert", "text"}]."""
+    a, b = old.split(), new.split()
+    segments = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag == "equal":
+            segments.append({"op": "equal", "text": " ".join(a[i1:i2])})
+            continue
+        if i2 > i1:
+            segments.append({"op": "delete", "text": " ".join(a[i1:i2])})
+        if j2 > j1:
+            segments.append({"op": "insert", "text": " ".join(b[j1:j2])})
+    return segments
+
+
+def risk_change(before, after) -> str:
+    """"increased", "decreased", "unchanged" or "unknown" between two risk levels."""
+    if before not in RISK_ORDER or after not in RISK_ORDER:
+        return "unknown"
+    diff = RISK_ORDER[after] - RISK_ORDER[before]
+    return "increased" if diff > 0 else "decreased" if diff < 0 else "unchanged"
@@ -0,0 +1,197 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import struct
+import threading
+import time
+from . import metrics
+
+# Masks for values that vary between copies of the same template clause
+NUMBER = re.compile(r'(?:rs\.?|inr|\u20b9|\$)?\s?\d[\d,./-]*')
+WORD = re.compile(r'\w+')
+# Words that flip or weaken an obligation; a stored analysis is reused only if they match in order.
+# "t" is what is left of contractions such as "can't" after splitting on \w+
+GUARD_WORDS = {"not", "no", "nor", "never", "neither", "none", "nothing", "without", "unless", "except", "only",
+               "shall", "may", "must", "will", "can", "cannot", "should", "might", "t"}
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+_MERSENNE = (1 << 61) - 1
+
+
+def _permutations(n):
+    """Deterministic (a, b) pairs so signatures stay comparable across restarts."""
+    perms = []
+    for i in range(n):
+        digest = hashlib.sha256(f"minhash-{i}".encode()).digest()
+        a, b = struct.unpack("<QQ", digest[:16])
+        perms.append((a % _MERSENNE or 1, b % _MERSENNE))
+    return perms
+
+
+PERMUTATIONS = _permutations(NUM_PERM)
+
+
+class ClauseIndex:
+    """
+    Persistent near-duplicate index of analyzed clauses (MinHash + LSH over word shingles).
+    Party names, amounts and dates are masked before hashing, so the same template clause
+    from a different contract still matches and its earlier analysis can be reused.
+    Similarity alone cannot tell "shall indemnify" from "shall not indemnify", so a match
+    must also have the same negation and modal words (GUARD_WORDS) in the same order.
+    Entries are scoped to the provider, model and prompt versions that produced them, expire
+    after `ttl_seconds` and are trimmed to the `max_entries` most recently used.
+    """
+    def __init__(self, path=None, threshold=None, shingle_size=3, max_entries=None, ttl_seconds=None):
+        self.threshold = threshold or float(os.getenv("CLAUSE_REUSE_THRESHOLD", "0.9"))
+        self.shingle_size = shingle_size
+        self.max_entries = max_entries or int(os.getenv("CLAUSE_INDEX_MAX_ENTRIES", "100000"))
+        self.ttl_seconds = ttl_seconds or float(os.getenv("CLAUSE_INDEX_TTL", str(90 * 24 * 3600)))
+        self.path = path or os.getenv("CLAUSE_INDEX_PATH", self._default_path())
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(clauses)")}
+        if columns and "scope" not in columns:
+            # Rows from before scoping cannot be traced to a model or prompt version
+            self._db.execute("DROP TABLE clauses")
+            self._db.execute("DROP TABLE IF EXISTS bands")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS clauses ("
+            "id INTEGER PRIMARY KEY, scope TEXT NOT NULL, contract_type TEXT NOT NULL, guards TEXT NOT NULL, "
+            "signature BLOB NOT NULL, analysis TEXT NOT NULL, source TEXT NOT NULL, "
+            "created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS bands ("
+            "band INTEGER NOT NULL, bucket INTEGER NOT NULL, clause_id INTEGER NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_bands ON bands (band, bucket)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_bands_clause ON bands (clause_id)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_clauses_accessed ON clauses (accessed)")
+        self._db.commit()
+        self._adds_since_trim = 0
+
+    @staticmethod
+    def _default_path():
+        root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        return os.path.join(root_dir, "data", "cache", "clause_index.sqlite3")
+
+    @staticmethod
+    def entity_masker(mentions):
+        """Compiles one regex over the texts of the document's entity mentions (longest first)."""
+        terms = sorted({m["text"] for m in mentions or () if len(m["text"]) > 1}, key=len, reverse=True)
+        if not terms:
+            return None
+        return re.compile("|".join(re.escape(t.lower()) for t in terms))
+
+    def normalize(self, text, masker=None):
+        text = text.lower()
+        if masker is not None:
+            text = masker.sub(" ent ", text)
+        text = NUMBER.sub(" num ", text)
+        return WORD.findall(text)
+
+    @staticmethod
+    def guards(words):
+        """The negation and modal words of a normalized clause, in order."""
+        return " ".join(w for w in words if w in GUARD_WORDS)
+
+    def signature(self, text, masker=None):
+        return self._signature(self.normalize(text, masker))
+
+    def _signature(self, words):
+        k = self.shingle_size
+        shingles = {" ".join(words[i:i + k]) for i in range(max(len(words) - k + 1, 1))}
+        hashes = [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "little") for s in shingles]
+        return tuple(min((a * h + b) % _MERSENNE for h in hashes) for a, b in PERMUTATIONS)
+
+    @staticmethod
+    def _buckets(signature):
+        for band in range(BANDS):
+            rows = signature[band * ROWS:(band + 1) * ROWS]
+            digest = hashlib.blake2b(struct.pack(f"<{ROWS}Q", *rows), digest_size=8).digest()
+            yield band, struct.unpack("<q", digest)[0]
+
+    @staticmethod
+    def similarity(sig_a, sig_b):
+        """Estimated Jaccard similarity of the two shingle sets."""
+        return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+    def lookup(self, text, contract_type, masker=None, scope=""):
+        """
+        Returns (analysis, similarity, source) for the closest stored clause of the same
+        contract type and scope at or above the threshold with the same guard words, or None.
+        """
+        words = self.normalize(text, masker)
+        signature = self._signature(words)
+        guards = self.guards(words)
+        now = time.time()
+        with self._lock:
+            candidate_ids = set()
+            for band, bucket in self._buckets(signature):
+                rows = self._db.execute("SELECT clause_id FROM bands WHERE band = ? AND bucket = ?", (band, bucket))
+                candidate_ids.update(r[0] for r in rows)
+            rows = []
+            if candidate_ids:
+                placeholders = ",".join("?" * len(candidate_ids))
+                rows = self._db.execute(
+                    f"SELECT id, signature, analysis, source FROM clauses WHERE scope = ? AND contract_type = ? "
+                    f"AND guards = ? AND created >= ? AND id IN ({placeholders})",
+                    (scope, contract_type, guards, now - self.ttl_seconds, *candidate_ids)
+                ).fetchall()
+
+            best = None
+            for clause_id, blob, analysis, source in rows:
+                score = self.similarity(signature, struct.unpack(f"<{NUM_PERM}Q", blob))
+                if score >= self.threshold and (best is None or score > best[1]):
+                    best = (clause_id, score, analysis, source)
+            if best is not None:
+                self._db.execute("UPDATE clauses SET accessed = ? WHERE id = ?", (now, best[0]))
+                self._db.commit()
+        metrics.CACHE_LOOKUPS.inc(cache="clause_index", result="hit" if best else "miss")
+        if best is None:
+            return None
+        return json.loads(best[2]), best[1], json.loads(best[3])
+
+    def add(self, text, contract_type, analysis, source, masker=None, scope=""):
+        words = self.normalize(text, masker)
+        signature = self._signature(words)
+        now = time.time()
+        with self._lock:
+            cur = self._db.execute(
+                "INSERT INTO clauses (scope, contract_type, guards, signature, analysis, source, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (scope, contract_type, self.guards(words), struct.pack(f"<{NUM_PERM}Q", *signature),
+                 json.dumps(analysis), json.dumps(source), now, now)
+            )
+            self._db.executemany(
+                "INSERT INTO bands (band, bucket, clause_id) VALUES (?, ?, ?)",
+                [(band, bucket, cur.lastrowid) for band, bucket in self._buckets(signature)]
+            )
+            self._db.commit()
+            self._adds_since_trim += 1
+            if self._adds_since_trim >= 100:
+                self._trim(now)
+
+    def _trim(self, now):
+        """Drops expired clauses, then the least recently used ones above max_entries, with their bands."""
+        self._adds_since_trim = 0
+        stale = [r[0] for r in self._db.execute("SELECT id FROM clauses WHERE created < ?", (now - self.ttl_seconds,))]
+        stale += [r[0] for r in self._db.execute(
+            "SELECT id FROM clauses WHERE created >= ? ORDER BY accessed DESC LIMIT -1 OFFSET ?",
+            (now - self.ttl_seconds, self.max_entries)
+        )]
+        if stale:
+            self._db.executemany("DELETE FROM bands WHERE clause_id = ?", [(i,) for i in stale])
+            self._db.executemany("DELETE FROM clauses WHERE id = ?", [(i,) for i in stale])
+        self._db.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM clauses").fetchone()[0]
@@ -0,0 +1,177 @@
+import math
+import os
+import re
+from collections import defaultdict
+from .patterns import compile_phrases, phrase_of
+
+# Phrases that signal a clause worth a closer look, weighted by how often they carry risk for an SME.
+# Boilerplate headings weigh negative so they are the first to go when the budget is tight.
+RISK_KEYWORDS = {
+    # Liability and remedies
+    "indemnify": 4, "indemnification": 4, "indemnity": 4, "hold harmless": 4, "unlimited liability": 5,
+    "limitation of liability": 4, "liquidated damages": 4, "consequential damages": 3, "penalty": 3,
+    "liability": 2, "damages": 2, "forfeit": 3, "forfeiture": 3, "set-off": 2, "guarantee": 2,
+    # Termination and lock-in
+    "terminate": 3, "termination": 3, "without notice": 3, "without cause": 3, "lock-in": 3,
+    "automatic renewal": 3, "auto-renewal": 3, "renew automatically": 3, "minimum commitment": 3,
+    # Restrictions and ownership
+    "non-compete": 4, "non-solicitation": 3, "exclusive": 3, "exclusivity": 3, "intellectual property": 3,
+    "assigns all": 3, "work made for hire": 3, "sole discretion": 3, "unilaterally": 3,
+    # Money
+    "interest": 2, "late payment": 2, "security deposit": 2, "escalation": 2, "withhold": 2,
+    "payment": 1, "fees": 1, "invoice": 1,
+    # Disputes and compliance
+    "arbitration": 2, "jurisdiction": 2, "governing law": 2, "breach": 2, "warranty": 2,
+    "warranties": 2, "confidential": 1, "confidentiality": 1, "insurance": 1, "audit": 1,
+    "force majeure": 1, "suspend": 2,
+    # Boilerplate
+    "definitions": -3, "interpretation": -3, "counterparts": -4, "headings": -3, "entire agreement": -2,
+    "severability": -3, "notices": -2, "recitals": -3, "whereas": -2,
+}
+
+# Amounts, percentages, periods and dates: concrete terms that usually deserve review
+ENTITY_PATTERN = re.compile(
+    r'(?:₹|\bRs\.?|\bINR\b|\bUSD\b|\$)\s?\d[\d,]*(?:\.\d+)?'
+    r'|\b\d[\d,]*(?:\.\d+)?\s?(?:%|percent\b|lakhs?\b|crores?\b)'
+    r'|\b\d+\s+(?:business\s+|working\s+|calendar\s+)?(?:days?|weeks?|months?|years?)\b'
+    r'|\b\d{1,2}[/.-]\d{1,2}[/.-]\d{2,4}\b',
+    re.IGNORECASE
+)
+
+
+def _env_limit(name, default="0", cast=int):
+    """A budget limit from the environment; 0 (or unset) means no limit."""
+    value = cast(os.getenv(name, default))
+    return value if value > 0 else None
+
+
+class ClauseBudget:
+    """
+    Per-request limits on clause analysis. Each limit is optional (None = unlimited):
+    `max_clauses` clauses, `max_llm_calls` provider calls, `max_tokens` tokens (prompt plus
+    expected completion, as the scheduler counts them) and `max_seconds` of estimated wall time.
+    The summary call is not counted; it always runs.
+    """
+    LIMITS = ("max_clauses", "max_llm_calls", "max_tokens", "max_seconds")
+
+    def __init__(self, max_clauses=None, max_llm_calls=None, max_tokens=None, max_seconds=None):
+        self.max_clauses = max_clauses
+        self.max_llm_calls = max_llm_calls
+        self.max_tokens = max_tokens
+        self.max_seconds = max_seconds
+
+    @classmethod
+    def from_env(cls, **overrides):
+        """Defaults from CLAUSE_BUDGET_* (15 clauses, nothing else), with per-request overrides that are not None."""
+        budget = cls(
+            max_clauses=_env_limit("CLAUSE_BUDGET_MAX_CLAUSES", "15"),
+            max_llm_calls=_env_limit("CLAUSE_BUDGET_MAX_LLM_CALLS"),
+            max_tokens=_env_limit("CLAUSE_BUDGET_MAX_TOKENS"),
+            max_seconds=_env_limit("CLAUSE_BUDGET_MAX_SECONDS", cast=float)
+        )
+        for name, value in overrides.items():
+            if name not in cls.LIMITS:
+                raise TypeError(f"Unknown budget limit: {name}")
+            if value is not None:
+                setattr(budget, name, value if value > 0 else None)
+        return budget
+
+    def exceeded(self, clauses, cost):
+        """Name of the first limit that `clauses` clauses costing `cost` ({"llm_calls", "tokens", "seconds"}) break, else None."""
+        if self.max_clauses is not None and clauses > self.max_clauses:
+            return "max_clauses"
+        if self.max_llm_calls is not None and cost["llm_calls"] > self.max_llm_calls:
+            return "max_llm_calls"
+        if self.max_tokens is not None and cost["tokens"] > self.max_tokens:
+            return "max_tokens"
+        if self.max_seconds is not None and cost["seconds"] > self.max_seconds:
+            return "max_seconds"
+        return None
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.LIMITS}
+
+
+class ClauseSelector:
+    """
+    Ranks clauses by likely risk with a fast local pre-score, then fills the request's budget
+    with the highest-scoring clauses first. The pre-score is sum(weight * log(1 + occurrences))
+    over RISK_KEYWORDS, where occurrences in the clause heading (its first line, up to
+    `heading_chars`) count `heading_boost` times, plus `entity_weight` per concrete term
+    (amount, percentage, period, date) per 100 words, capped at `max_entity_density`.
+    """
+    def __init__(self, keywords=None, heading_chars=80, heading_boost=3.0, entity_weight=0.5, max_entity_density=6.0):
+        self.keywords = keywords or RISK_KEYWORDS
+        self.heading_chars = heading_chars
+        self.heading_boost = heading_boost
+        self.entity_weight = entity_weight
+        self.max_entity_density = max_entity_density
+        self._matcher = compile_phrases(self.keywords)
+
+    def _heading_end(self, clause):
+        newline = clause.find("\n")
+        return min(self.heading_chars, newline if newline > 0 else len(clause))
+
+    def score(self, clause: str) -> float:
+        heading_end = self._heading_end(clause)
+        counts = defaultdict(float)
+        for m in self._matcher.finditer(clause):
+            counts[phrase_of(m)] += self.heading_boost if m.start() < heading_end else 1.0
+        keyword_score = sum(self.keywords.get(phrase, 0) * math.log1p(count) for phrase, count in counts.items())
+
+        words = max(1, len(clause.split()))
+        density = min(self.max_entity_density, 100.0 * len(ENTITY_PATTERN.findall(clause)) / words)
+        return round(keyword_score + self.entity_weight * density, 3)
+
+    def select(self, clauses, budget, cost, keep=()):
+        """
+        Picks clauses greedily by descending score, keeping each one only if the selection
+        still fits the budget. `cost(indices)` estimates {"llm_calls", "tokens", "seconds"} for
+        analyzing those clauses (in document order). Clauses in `keep` (e.g. analyses carried
+        over from a previous revision) are always selected and do not count towards
+        max_clauses. Returns (selected indices in document order, skipped [(index, score,
+        reason)] in document order, scores, estimated cost).
+
+        The estimate must not shrink when a clause is added or replaced by a longer one (true
+        of token-based estimates). Runs of clauses that fit together are then picked in one
+        step, doubling the run while they fit, and a clause at least as long as one that did
+        not fit since the last pick is skipped without an estimate, so a long document costs
+        O(log n) estimates per run of picks rather than one per clause. Without call, token or
+        time limits only max_clauses applies and the cost is estimated once.
+        """
+        scores = [self.score(clause) for clause in clauses]
+        keep = set(keep)
+        ranked = sorted((i for i in range(len(clauses)) if i not in keep), key=lambda i: (-scores[i], i))
+        room = len(ranked) if budget.max_clauses is None else budget.max_clauses
+        if not any(getattr(budget, name) is not None for name in ("max_llm_calls", "max_tokens", "max_seconds")):
+            selected = sorted(list(keep) + ranked[:room])
+            skipped = sorted((i, scores[i], "max_clauses") for i in ranked[room:])
+            return selected, skipped, scores, cost(selected)
+
+        selected, reasons = sorted(keep), {}
+        estimate = cost(selected)
+        pos, run = 0, 1
+        misfit = None  # (length, reason) of the shortest clause that did not fit since the last pick
+        while pos < len(ranked) and room > 0:
+            i = ranked[pos]
+            if misfit is not None and len(clauses[i]) >= misfit[0]:
+                reasons[i] = misfit[1]
+                pos += 1
+                continue
+            take = ranked[pos:pos + min(run, room)]
+            trial = sorted(selected + take)
+            trial_cost = cost(trial)
+            reason = budget.exceeded(len(trial) - len(keep), trial_cost)
+            if reason is None:
+                selected, estimate = trial, trial_cost
+                pos, room, run, misfit = pos + len(take), room - len(take), run * 2, None
+            elif len(take) > 1:
+                run = len(take) // 2  # Find where the run stops fitting
+            else:
+                reasons[i] = reason  # A cheaper, lower-scoring clause may still fit
+                pos, run = pos + 1, 1
+                if misfit is None or len(clauses[i]) < misfit[0]:
+                    misfit = (len(clauses[i]), reason)
+        reasons.update((i, "max_clauses") for i in ranked[pos:])
+        skipped = [(i, scores[i], reasons[i]) for i in sorted(reasons)]
+        return selected, skipped, scores, estimate
@@ -0,0 +1,407 @@
+import bisect
+import re
+from datetime import date
+from .patterns import compile_phrases, phrase_of
+
+# Canonical state / union territory -> spellings found in contracts
+STATES = {
+    "Andhra Pradesh": [], "Arunachal Pradesh": [], "Assam": [], "Bihar": [], "Chhattisgarh": [], "Goa": [],
+    "Gujarat": [], "Haryana": [], "Himachal Pradesh": [], "Jharkhand": [], "Karnataka": [], "Kerala": [],
+    "Madhya Pradesh": [], "Maharashtra": [], "Manipur": [], "Meghalaya": [], "Mizoram": [], "Nagaland": [],
+    "Odisha": ["Orissa"], "Punjab": [], "Rajasthan": [], "Sikkim": [], "Tamil Nadu": [], "Telangana": [],
+    "Tripura": [], "Uttar Pradesh": [], "Uttarakhand": ["Uttaranchal"], "West Bengal": [],
+    "Andaman and Nicobar Islands": [], "Chandigarh": [], "Dadra and Nagar Haveli and Daman and Diu": [],
+    "Delhi": ["NCT of Delhi", "National Capital Territory of Delhi"], "Jammu and Kashmir": ["Jammu & Kashmir"],
+    "Ladakh": [], "Lakshadweep": [], "Puducherry": ["Pondicherry"],
+}
+
+# Canonical city -> (state, spellings); only names that are not also common English words
+CITIES = {
+    "Mumbai": ("Maharashtra", ["Bombay", "Navi Mumbai"]), "Pune": ("Maharashtra", ["Poona"]),
+    "Nagpur": ("Maharashtra", []), "Nashik": ("Maharashtra", []), "Thane": ("Maharashtra", []),
+    "New Delhi": ("Delhi", []), "Noida": ("Uttar Pradesh", ["Greater Noida"]), "Gurugram": ("Haryana", ["Gurgaon"]),
+    "Faridabad": ("Haryana", []), "Ghaziabad": ("Uttar Pradesh", []), "Lucknow": ("Uttar Pradesh", []),
+    "Kanpur": ("Uttar Pradesh", []), "Varanasi": ("Uttar Pradesh", []), "Bengaluru": ("Karnataka", ["Bangalore"]),
+    "Mysuru": ("Karnataka", ["Mysore"]), "Mangaluru": ("Karnataka", ["Mangalore"]), "Chennai": ("Tamil Nadu", ["Madras"]),
+    "Coimbatore": ("Tamil Nadu", []), "Madurai": ("Tamil Nadu", []), "Hyderabad": ("Telangana", ["Secunderabad"]),
+    "Visakhapatnam": ("Andhra Pradesh", ["Vizag"]), "Vijayawada": ("Andhra Pradesh", []),
+    "Kolkata": ("West Bengal", ["Calcutta"]), "Ahmedabad": ("Gujarat", []), "Surat": ("Gujarat", []),
+    "Vadodara": ("Gujarat", ["Baroda"]), "Rajkot": ("Gujarat", []), "Gandhinagar": ("Gujarat", []),
+    "Jaipur": ("Rajasthan", []), "Jodhpur": ("Rajasthan", []), "Udaipur": ("Rajasthan", []),
+    "Indore": ("Madhya Pradesh", []), "Bhopal": ("Madhya Pradesh", []), "Patna": ("Bihar", []),
+    "Ranchi": ("Jharkhand", []), "Bhubaneswar": ("Odisha", []), "Guwahati": ("Assam", []),
+    "Kochi": ("Kerala", ["Cochin", "Ernakulam"]), "Thiruvananthapuram": ("Kerala", ["Trivandrum"]),
+    "Ludhiana": ("Punjab", []), "Amritsar": ("Punjab", []), "Dehradun": ("Uttarakhand", []),
+    "Raipur": ("Chhattisgarh", []), "Srinagar": ("Jammu and Kashmir", []), "Panaji": ("Goa", ["Panjim"]),
+}
+
+MONTHS = {m: i for i, m in enumerate(
+    ["january", "february", "march", "april", "may", "june", "july", "august", "september", "october", "november", "december"], 1)}
+MONTHS.update({name[:3]: i for name, i in list(MONTHS.items())})
+MONTHS["sept"] = 9
+_MONTH = r"(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|June?|July?|Aug(?:ust)?|Sept?(?:ember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)"
+
+DATE_PATTERNS = [
+    # 2024-03-15
+    re.compile(r"\b(?P<y>\d{4})-(?P<m>\d{2})-(?P<d>\d{2})\b"),
+    # 15/03/2024, 15-03-24 (day first, as written in India); not part of a longer number like 1.15/03/24
+    re.compile(r"(?<![\d./-])(?P<d>\d{1,2})(?P<sep>[/-])(?P<m>\d{1,2})(?P=sep)(?P<y>\d{4}|\d{2})(?![./-]?\d)"),
+    # 15.03.2024; dotted dates need a four-digit year, "4.2.10" is a clause number
+    re.compile(r"(?<![\d./-])(?P<d>\d{1,2})\.(?P<m>\d{1,2})\.(?P<y>\d{4})(?!\.?\d)"),
+    # 15th March, 2024 / 1st day of April 2024 / 15-Mar-2024
+    re.compile(rf"\b(?P<d>\d{{1,2}})(?:st|nd|rd|th)?(?:\s+day\s+of)?[\s-]+(?P<mon>{_MONTH})\.?[\s,-]+(?P<y>\d{{4}})\b", re.I),
+    # March 15, 2024
+    re.compile(rf"\b(?P<mon>{_MONTH})\.?\s+(?P<d>\d{{1,2}})(?:st|nd|rd|th)?,?\s+(?P<y>\d{{4}})\b", re.I),
+    # March 2024 (month precision; the month must be capitalized, "you may 2024" is no date)
+    re.compile(rf"\b(?P<mon>{_MONTH})\.?,?\s+(?P<y>\d{{4}})\b", re.I),
+]
+
+_NUMBER = r"\d{1,3}(?:,\d{2,3})+(?:\.\d+)?|\d+(?:\.\d+)?"
+SCALES = {"thousand": 10 ** 3, "lakh": 10 ** 5, "lakhs": 10 ** 5, "lac": 10 ** 5, "lacs": 10 ** 5,
+          "crore": 10 ** 7, "crores": 10 ** 7, "cr": 10 ** 7, "million": 10 ** 6, "mn": 10 ** 6,
+          "billion": 10 ** 9, "bn": 10 ** 9}
+CURRENCIES = {"₹": "INR", "rs": "INR", "inr": "INR", "rupees": "INR", "$": "USD", "us$": "USD", "usd": "USD",
+              "€": "EUR", "eur": "EUR", "£": "GBP", "gbp": "GBP"}
+AMOUNT_PATTERNS = [
+    # ₹5,00,000/-, Rs. 2.5 lakh, INR 10 crores, USD 10,000
+    re.compile(r"(?<![A-Za-z])(?P<cur>₹|Rs\.?|INR|Rupees|US\$|\$|USD|€|EUR|£|GBP)\s?(?P<num>" + _NUMBER + r")"
+               r"(?:\s?(?P<scale>thousand|lakhs?|lacs?|crores?|cr|million|mn|billion|bn)\b\.?)?(?:\s?/-)?", re.I),
+    # 5 lakh, 2 crore rupees
+    re.compile(r"\b(?P<num>" + _NUMBER + r")\s?(?P<scale>lakhs?|lacs?|crores?)\b(?:\s+(?P<cur>rupees|INR)\b)?", re.I),
+]
+# "(Rupees Five Lakh Twenty Thousand only)"
+AMOUNT_IN_WORDS = re.compile(r"\b(?:Rupees|Rs\.?|INR)\s+(?P<words>(?:[A-Za-z]+[\s-]+){1,16}?)only\b", re.I)
+_UNITS = {w: i for i, w in enumerate(
+    "zero one two three four five six seven eight nine ten eleven twelve thirteen fourteen fifteen sixteen "
+    "seventeen eighteen nineteen".split())}
+_UNITS.update({w: 10 * i for i, w in enumerate("twenty thirty forty fifty sixty seventy eighty ninety".split(), 2)})
+PERCENT_PATTERN = re.compile(r"\b(?P<num>\d+(?:\.\d+)?)\s?(?:%|per\s?cent\b)", re.I)
+
+_NUMBER_WORDS = {"one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8, "nine": 9,
+                 "ten": 10, "eleven": 11, "twelve": 12, "fifteen": 15, "twenty": 20, "thirty": 30, "forty-five": 45,
+                 "forty five": 45, "sixty": 60, "ninety": 90}
+DURATION_PATTERN = re.compile(
+    r"(?:\b(?:" + "|".join(sorted(_NUMBER_WORDS, key=len, reverse=True)) + r")\s+\((?P<pnum>\d+)\)|\b(?P<num>\d+))"
+    r"\s+(?P<kind>business\s+|working\s+|calendar\s+)?(?P<unit>days?|weeks?|months?|years?)\b", re.I)
+_DURATION_UNITS = {"day": "D", "week": "W", "month": "M", "year": "Y"}
+
+# "Acme Technologies Pvt. Ltd.", "Sharma & Sons LLP"; the suffix is matched case-insensitively.
+# Name words end in a period only as initials or "Co."/"Bros.", so a name never spans sentences
+COMPANY_PATTERN = re.compile(
+    r"(?P<name>(?:(?:Co\.|Bros\.|[A-Z]\.|[A-Z][A-Za-z0-9'-]*)[ \t]+(?:(?:&|and|of)[ \t]+)?){1,6}?)"
+    r"(?P<suffix>(?i:private\s+limited|pvt\.?\s*ltd\.?|pvt\.?\s+limited|limited|ltd\.?|l\.?l\.?p\.?|llc|inc\.?))(?![A-Za-z])")
+COMPANY_SUFFIXES = [(re.compile(p, re.I), canonical) for p, canonical in (
+    (r"private\s+limited|pvt\.?\s*ltd\.?|pvt\.?\s+limited", "Private Limited"), (r"limited|ltd\.?", "Limited"),
+    (r"l\.?l\.?p\.?", "LLP"), (r"llc", "LLC"), (r"inc\.?", "Inc."))]
+# Capitalized words that open a sentence or recital rather than a company name
+_NAME_STOPWORDS = {"this", "the", "whereas", "between", "and", "by", "with", "said", "agreement", "party", "now", "therefore"}
+# Roles that come before a company name ("Director of Gupta Steel Pvt Ltd") but are not part of it
+_ROLE_WORDS = {"director", "directors", "partner", "partners", "proprietor", "managing", "designated", "chairman",
+               "chairperson", "chief", "executive", "officer", "ceo", "cfo", "secretary", "manager", "authorised",
+               "authorized", "signatory", "representative", "trustee", "employee", "employees", "shareholder"}
+# Suffix words written out in full, after which a period ends the sentence rather than an abbreviation
+_FULL_SUFFIXES = {"limited", "llp", "llc"}
+
+# Capitalized words that are defined terms or legal vocabulary, not names NER could resolve
+COMMON_CAPS = {
+    "agreement", "party", "parties", "company", "client", "customer", "vendor", "supplier", "service", "services",
+    "provider", "contractor", "consultant", "employee", "employer", "lessor", "lessee", "tenant", "landlord",
+    "licensor", "licensee", "buyer", "seller", "purchaser", "partner", "partners", "firm", "schedule", "annexure",
+    "appendix", "exhibit", "clause", "section", "article", "act", "rules", "effective", "date", "term", "terms",
+    "confidential", "information", "whereas", "now", "therefore", "this", "the", "that", "these", "in", "witness",
+    "whereof", "notwithstanding", "any", "all", "each", "either", "neither", "such", "provided", "subject", "and",
+    "or", "of", "to", "by", "for", "with", "on", "at", "as", "if", "upon", "hereby", "herein", "goods",
+    "deliverables", "fees", "payment", "invoice", "force", "majeure", "intellectual", "property", "premises",
+    "rent", "deposit", "security", "notice", "notices", "law", "laws", "governing", "jurisdiction", "arbitration",
+    "dispute", "disputes", "termination", "indemnity", "indemnification", "liability", "warranty", "warranties",
+    "definitions", "interpretation", "general", "miscellaneous", "scope", "work", "statement", "order", "purchase",
+    "salary", "probation", "designation", "duties", "leave", "benefits", "gratuity", "non-compete", "confidentiality",
+    "signed", "signature", "name", "place", "witnesses", "authorized", "signatory", "director", "managing",
+    "gst", "gstin", "igst", "cgst", "sgst", "tds", "pan", "cin", "msme", "nda", "sow", "sla", "ip", "it", "hr",
+}
+# spaCy labels the pre-pass leaves to NER, and the mention type each becomes
+NER_TYPES = {"ORG": "PARTY", "PERSON": "PARTY", "DATE": "DATE", "MONEY": "AMOUNT", "GPE": "LOCATION"}
+_ROMAN = re.compile(r"^[IVXLCDM]+$")
+# Cross-references ("Clause 4.2.10", "Section 12(b)"); no date or amount is read inside them
+_CROSS_REFERENCE = (r"\b(?:clause|section|article|schedule|annexure|appendix|exhibit|paragraph|sub-clause|rule)s?"
+                    r"\s+(?:\d|\(|[ivx]+\b|[a-z]\b)[0-9.()a-z]*")
+CROSS_REFERENCE = re.compile(_CROSS_REFERENCE, re.I)
+# Clause numbering and cross-references carry digits that are not entities
+_REFERENCE = re.compile(
+    r"^\s*(?:\(?[A-Za-z0-9]{1,4}\)|\d+(?:\.\d+)*\.?|[A-Z]\.)\s"
+    rf"|{_CROSS_REFERENCE}"
+    r"|\b(?:[A-Z][a-z]+\s+(?:(?:and|of|&)\s+)?){1,6}Act,?\s+\d{4}\b", re.I)  # Statute citations
+_CAP_WORD = re.compile(r"\b[A-Z][A-Za-z'-]+")
+_DIGIT = re.compile(r"\d")
+
+# Sentence ends: terminal punctuation before a capital, digit or bracket, or a blank line / new line
+_SENTENCE_END = re.compile(r"(?<=[.;!?])\s+(?=[\"'(A-Z0-9])|\n")
+_ABBREVIATIONS = {"rs.", "pvt.", "ltd.", "no.", "co.", "mr.", "mrs.", "ms.", "dr.", "st.", "m/s.", "i.e.", "e.g.",
+                  "viz.", "sr.", "jr.", "inc.", "corp.", "vs.", "u/s.", "cl.", "sec.", "art."}
+# A clause number on its own ("12.", "4.2.", "A.", "iv.") does not end a sentence
+_NUMBERING = re.compile(r"^\s*(?:\d+(?:\.\d+)*|[A-Za-z]|[ivxIVX]+)\.$")
+
+
+def _place_phrases():
+    """Spelling -> (type kind, canonical name, state) for the gazetteer matcher."""
+    places = {}
+    for state, aliases in STATES.items():
+        for name in [state] + aliases:
+            places[name.lower()] = ("state", state, state)
+    for city, (state, aliases) in CITIES.items():
+        for name in [city] + aliases:
+            places[name.lower()] = ("city", city, state)
+    places["india"] = ("country", "India", None)
+    return places
+
+
+def normalize_amount(text):
+    """(integer amount, ISO currency) for an amount such as "₹5,00,000/-" or "2.5 crore", else None."""
+    for pattern in AMOUNT_PATTERNS:
+        m = pattern.search(text)
+        if m:
+            return _amount_value(m)
+    return None
+
+
+def _amount_value(m):
+    number = float(m.group("num").replace(",", ""))
+    scale = (m.group("scale") or "").lower().rstrip(".")
+    currency = CURRENCIES.get((m.group("cur") or "").lower().rstrip("."), "INR")  # Lakh/crore imply rupees
+    return int(round(number * SCALES.get(scale, 1))), currency
+
+
+def words_to_number(words):
+    """Integer for Indian-system number words ("five lakh twenty thousand"), else None."""
+    total, current = 0, 0
+    for word in re.split(r"[\s-]+", words.lower().strip()):
+        if word in ("and", ""):
+            continue
+        if word in _UNITS:
+            current += _UNITS[word]
+        elif word == "hundred":
+            current = max(current, 1) * 100
+        elif word in SCALES:
+            total += max(current, 1) * SCALES[word]
+            current = 0
+        else:
+            return None
+    return total + current or None
+
+
+def normalize_date(text):
+    """ISO date ("2024-03-15", or "2024-03" for a month) for an Indian-format date string, else None."""
+    for pattern in DATE_PATTERNS:
+        m = pattern.search(text)
+        if m:
+            return _date_value(m)
+    return None
+
+
+def _date_value(m):
+    groups = m.groupdict()
+    year = int(groups["y"])
+    if year < 100:
+        year += 2000 if year < 70 else 1900
+    month = int(groups["m"]) if groups.get("m") else MONTHS.get(groups["mon"].lower().rstrip("."))
+    if not month:
+        return None
+    if not groups.get("d"):
+        if groups.get("mon") and not groups["mon"][0].isupper():
+            return None
+        return f"{year:04d}-{month:02d}" if 1 <= month <= 12 else None
+    try:
+        return date(year, month, int(groups["d"])).isoformat()
+    except ValueError:
+        return None
+
+
+def split_sentences(text):
+    """(start, end) of each sentence or line, without breaking after abbreviations such as "Pvt." or "Rs."."""
+    spans, start = [], 0
+    for m in _SENTENCE_END.finditer(text):
+        if m.group(0) != "\n":
+            head = text[start:m.start()]
+            last = head[-12:].split()[-1:]
+            if _NUMBERING.match(head) or (last and last[0].lstrip("(\"'").lower() in _ABBREVIATIONS):
+                continue
+        if text[start:m.start()].strip():
+            spans.append((start, m.start()))
+        start = m.end()
+    if text[start:].strip():
+        spans.append((start, len(text)))
+    return spans
+
+
+def _mention(entity_type, text, start, end, value, source="rules", **extra):
+    mention = {"type": entity_type, "text": text, "start": start, "end": end, "value": value, "source": source}
+    mention.update(extra)
+    return mention
+
+
+class EntityPrepass:
+    """
+    Rule-based entity pass tuned for Indian contracts: rupee amounts (₹, Rs., INR, lakh,
+    crore), day-first and written dates, percentages, durations, states and cities (one
+    compiled gazetteer matcher) and company names with suffixes such as "Pvt. Ltd." or LLP.
+    Every mention has character offsets and a normalized value (INR integers, ISO dates,
+    ISO 8601 durations, canonical place and company names). unresolved() picks the sentences
+    that still hold candidates only statistical NER can resolve.
+    """
+    def __init__(self):
+        self._places = _place_phrases()
+        self._place_matcher = compile_phrases(self._places)
+
+    def find(self, text):
+        """Non-overlapping mentions in document order; on overlap the longer (then earlier) match wins."""
+        # Cross-references go in first: they overlap the numbers they hold and are dropped after merging
+        references = [_mention("REFERENCE", m.group(0), m.start(), m.end(), None) for m in CROSS_REFERENCE.finditer(text)]
+        candidates = []
+        for pattern in DATE_PATTERNS:
+            for m in pattern.finditer(text):
+                value = _date_value(m)
+                if value:
+                    candidates.append(_mention("DATE", m.group(0), m.start(), m.end(), value))
+        for pattern in AMOUNT_PATTERNS:
+            for m in pattern.finditer(text):
+                value, currency = _amount_value(m)
+                candidates.append(_mention("AMOUNT", m.group(0), m.start(), m.end(), value, currency=currency))
+        for m in AMOUNT_IN_WORDS.finditer(text):
+            value = words_to_number(m.group("words"))
+            if value:
+                candidates.append(_mention("AMOUNT", m.group(0), m.start(), m.end(), value, currency="INR"))
+        for m in PERCENT_PATTERN.finditer(text):
+            candidates.append(_mention("PERCENT", m.group(0), m.start(), m.end(), float(m.group("num"))))
+        for m in DURATION_PATTERN.finditer(text):
+            candidates.append(self._duration(m))
+        for m in self._place_matcher.finditer(text):
+            if m.group(0)[0].isupper():  # "goa" inside a sentence is not a place name
+                kind, canonical, state = self._places[phrase_of(m)]
+                candidates.append(_mention("LOCATION", m.group(0), m.start(), m.end(), canonical, kind=kind, state=state))
+        for m in COMPANY_PATTERN.finditer(text):
+            mention = self._company(text, m)
+            if mention:
+                candidates.append(mention)
+
+        mentions = merge_mentions(merge_mentions([], references), candidates)
+        return [m for m in mentions if m["type"] != "REFERENCE"]
+
+    def from_ner(self, label, text, start, end):
+        """Typed mention for a spaCy entity (ORG/PERSON, DATE, MONEY, GPE), normalized where possible; else None."""
+        entity_type = NER_TYPES.get(label)
+        if entity_type is None:
+            return None
+        if entity_type == "AMOUNT":
+            amount = normalize_amount(text)
+            return _mention("AMOUNT", text, start, end, amount[0] if amount else None, source="ner",
+                            currency=amount[1] if amount else None)
+        if entity_type == "DATE":
+            return _mention("DATE", text, start, end, normalize_date(text), source="ner")
+        if entity_type == "LOCATION":
+            kind, canonical, state = self._places.get(" ".join(text.lower().split()), (None, " ".join(text.split()), None))
+            return _mention("LOCATION", text, start, end, canonical, source="ner", kind=kind, state=state)
+        return _mention("PARTY", text, start, end, " ".join(text.split()), source="ner",
+                        kind="person" if label == "PERSON" else "organization")
+
+    @staticmethod
+    def propagate(text, names, sentences):
+        """
+        Mentions of already identified names (e.g. a party NER found in the recitals) inside
+        `sentences`, so those sentences need not go through NER again.
+        """
+        by_phrase = {" ".join(m["text"].lower().split()): m for m in names}
+        matcher = compile_phrases(by_phrase)
+        found = []
+        for start, end in sentences:
+            for m in matcher.finditer(text, start, end):
+                source = by_phrase[phrase_of(m)]
+                extra = {k: v for k, v in source.items() if k not in ("type", "text", "start", "end", "value", "source")}
+                found.append(_mention(source["type"], m.group(0), m.start(), m.end(), source["value"], source="ner", **extra))
+        return found
+
+    @staticmethod
+    def _duration(m):
+        count = int(m.group("pnum") or m.group("num"))
+        unit = _DURATION_UNITS[m.group("unit").lower().rstrip("s")]
+        extra = {"business_days": True} if (m.group("kind") or "").strip().lower() in ("business", "working") else {}
+        return _mention("DURATION", m.group(0), m.start(), m.end(), f"P{count}{unit}", **extra)
+
+    def _company(self, text, m):
+        """
+        PARTY mention for a COMPANY_PATTERN match, without the words the pattern took in
+        before the name: opening words (_NAME_STOPWORDS), roles (_ROLE_WORDS, with their
+        "of"/"for"), and anything before an "and" or "of" that links the name to the text in
+        front of it. "and"/"of" stay inside a name only as in "Larsen and Toubro" or
+        "Bank of Baroda": one word after "and", and no place or role before either.
+        """
+        words = [(w.start(), w.group(0)) for w in re.finditer(r"\S+", m.group("name"))]
+        first = 0
+        for i, (_, word) in enumerate(words):
+            key = word.lower().strip(".,")
+            if key in ("and", "of"):
+                before = [w.lower().strip(".,") for _, w in words[first:i]]
+                if (key == "and" and len(words) - i - 1 > 1) or any(w in self._places or w in _ROLE_WORDS for w in before):
+                    first = i + 1
+        while first < len(words) and words[first][1].lower().strip(".,") in _NAME_STOPWORDS | _ROLE_WORDS | {"of", "for"}:
+            first += 1
+        words = words[first:]
+        if not words:
+            return None
+        suffix, end = m.group("suffix"), m.end()
+        if suffix.endswith(".") and suffix[:-1].split()[-1].lower() in _FULL_SUFFIXES:
+            suffix, end = suffix[:-1], end - 1  # "Beta LLP." ends the sentence
+        canonical = next((name for pattern, name in COMPANY_SUFFIXES if pattern.fullmatch(suffix)), suffix)
+        start = m.start("name") + words[0][0]
+        return _mention("PARTY", text[start:end], start, end, f"{' '.join(w for _, w in words)} {canonical}", kind="company")
+
+    @staticmethod
+    def unresolved(text, mentions, sentences=None):
+        """
+        (start, end) of the sentences NER still has to read: those with a digit or a
+        capitalized word (other than the first word, defined terms and roman numerals) that
+        no rule-based mention covers. Clause numbers and cross-references do not count.
+        """
+        starts = [m["start"] for m in mentions]
+        pending = []
+        for start, end in sentences if sentences is not None else split_sentences(text):
+            # Blank out what the rules already resolved
+            chars = list(text[start:end])
+            for i in range(max(bisect.bisect_left(starts, start) - 1, 0), bisect.bisect_left(starts, end)):
+                m = mentions[i]
+                for pos in range(max(m["start"], start), min(m["end"], end)):
+                    chars[pos - start] = " "
+            residual = _REFERENCE.sub(" ", "".join(chars))
+            if _DIGIT.search(residual):
+                pending.append((start, end))
+                continue
+            first = len(residual) - len(residual.lstrip())
+            if any(m.start() != first and m.group(0).lower() not in COMMON_CAPS and not _ROMAN.match(m.group(0))
+                   for m in _CAP_WORD.finditer(residual)):
+                pending.append((start, end))
+        return pending
+
+
+def merge_mentions(mentions, candidates):
+    """
+    Adds candidates to sorted, non-overlapping `mentions` (returns a new list). Longer
+    candidates win; one overlapping an accepted mention is dropped.
+    """
+    mentions = list(mentions)
+    starts = [m["start"] for m in mentions]
+    for c in sorted(candidates, key=lambda c: (c["start"] - c["end"], c["start"])):
+        i = bisect.bisect_right(starts, c["start"])
+        if (i and mentions[i - 1]["end"] > c["start"]) or (i < len(mentions) and mentions[i]["start"] < c["end"]):
+            continue
+        starts.insert(i, c["start"])
+        mentions.insert(i, c)
+    return mentions
+
+
+def group_entities(mentions):
+    """The report's grouped view: {"Parties", "Dates", "Amounts", "Jurisdiction"} of distinct mention texts, in order."""
+    groups = {"PARTY": "Parties", "DATE": "Dates", "AMOUNT": "Amounts", "LOCATION": "Jurisdiction"}
+    entities = {name: [] for name in groups.values()}
+    for mention in mentions:
+        if mention["type"] in groups:
+            entities[groups[mention["type"]]].append(mention["text"])
+    return {key: list(dict.fromkeys(values)) for key, values in entities.items()}
@@ -0,0 +1,50 @@
+import asyncio
+import importlib.util
+import os
+import threading
+import weakref
+
+_lock = threading.Lock()
+_sync_client = None
+_async_clients = weakref.WeakKeyDictionary()  # event loop -> httpx.AsyncClient
+
+
+def _settings():
+    import httpx
+    http2 = os.getenv("LLM_HTTP2", "1") != "0" and importlib.util.find_spec("h2") is not None
+    limits = httpx.Limits(
+        max_connections=int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "200")),
+        max_keepalive_connections=int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "50")),
+        keepalive_expiry=float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "30")),
+    )
+    timeout = httpx.Timeout(float(os.getenv("LLM_HTTP_TIMEOUT", "120")), connect=10.0)
+    return {"http2": http2, "limits": limits, "timeout": timeout}
+
+
+def sync_client():
+    """
+    The process-wide pooled httpx.Client shared by every synchronous provider SDK client, so
+    connections (and TLS sessions) are kept alive and reused across calls and engines.
+    HTTP/2 is used when `h2` is importable (requirements.txt installs httpx[http2]); disable it
+    with LLM_HTTP2=0. Without h2 the pool falls back to HTTP/1.1 keep-alive.
+    """
+    global _sync_client
+    with _lock:
+        if _sync_client is None:
+            import httpx
+            _sync_client = httpx.Client(**_settings())
+        return _sync_client
+
+
+def async_client():
+    """
+    The pooled httpx.AsyncClient for the running event loop. An async connection pool must
+    not be shared between loops, so each loop gets its own (normally there is just one).
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            import httpx
+            client = _async_clients[loop] = httpx.AsyncClient(**_settings())
+        return client
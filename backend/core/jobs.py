@@ -0,0 +1,131 @@
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue is at capacity."""
+
+
+class Job:
+    """
+    A single queued pipeline run and its observable progress.
+    """
+    def __init__(self, func, args, kwargs):
+        self.id = uuid.uuid4().hex
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.status = "queued"
+        self.progress = {"stage": "queued"}
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    def update_progress(self, stage: str, **details):
+        """Progress callback handed to the pipeline (e.g. stage="analyzing", clauses_done=3, clauses_total=15)."""
+        with self._lock:
+            self.progress = {"stage": stage, **details}
+
+    def to_dict(self):
+        with self._lock:
+            data = {
+                "job_id": self.id,
+                "status": self.status,
+                "progress": dict(self.progress),
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+            }
+            if self.status == "completed":
+                data["report"] = self.result
+            elif self.status == "failed":
+                data["error"] = self.error
+            return data
+
+
+class JobManager:
+    """
+    Bounded queue plus a fixed pool of worker threads that run pipeline jobs off the request path.
+    """
+    def __init__(self, workers=None, queue_depth=None, max_retained=None):
+        self.workers = workers or int(os.getenv("JOB_WORKERS", "2"))
+        self.queue_depth = queue_depth or int(os.getenv("JOB_QUEUE_DEPTH", "20"))
+        self.max_retained = max_retained or int(os.getenv("JOB_MAX_RETAINED", "500"))
+
+        self._queue = queue.Queue(maxsize=self.queue_depth)
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._threads = []
+        for i in range(self.workers):
+            t = threading.Thread(target=self._worker, name=f"job-worker-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def submit(self, func, *args, **kwargs) -> Job:
+        """
+        Queues func(*args, progress=job.update_progress, **kwargs).
+        Raises QueueFullError instead of blocking when the queue is full.
+        """
+        job = Job(func, args, kwargs)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._evict_finished()
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._lock:
+                self._jobs.pop(job.id, None)
+            raise QueueFullError(f"Job queue is full ({self.queue_depth} pending)")
+        return job
+
+    def get(self, job_id: str):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self):
+        with self._lock:
+            statuses = [j.status for j in self._jobs.values()]
+        return {
+            "workers": self.workers,
+            "queue_depth": self.queue_depth,
+            "queued": statuses.count("queued"),
+            "running": statuses.count("running"),
+        }
+
+    def _evict_finished(self):
+        """Keeps memory bounded by forgetting the oldest finished jobs."""
+        excess = len(self._jobs) - self.max_retained
+        if excess <= 0:
+            return
+        for job_id in [jid for jid, j in self._jobs.items() if j.finished_at is not None][:excess]:
+            del self._jobs[job_id]
+
+    def _worker(self):
+        while True:
+            job = self._queue.get()
+            job.status = "running"
+            job.started_at = time.time()
+            job.update_progress("starting")
+            try:
+                job.result = job.func(*job.args, progress=job.update_progress, **job.kwargs)
+                if isinstance(job.result, dict) and "error" in job.result:
+                    job.error = job.result["error"]
+                    job.status = "failed"
+                else:
+                    job.status = "completed"
+            except Exception as e:
+                print(f"Job Error ({job.id}): {str(e)}")
+                job.error = str(e)
+                job.status = "failed"
+            finally:
+                job.finished_at = time.time()
+                with job._lock:
+                    job.progress["stage"] = "done" if job.status == "completed" else "failed"
+                self._queue.task_done()
@@ -0,0 +1,108 @@
+import re
+from collections import namedtuple
+
+# Runs of Devanagari / Latin letters; counting run lengths is much cheaper than a per-char Python loop
+DEVANAGARI_RUN = re.compile(r'[\u0900-\u097F]+')
+LATIN_RUN = re.compile(r'[A-Za-z]+')
+PARAGRAPH_BREAK = re.compile(r'\n\s*\n|\n(?=\s*(?:\d+\.|[A-Z]\.|Article\s|Section\s))')
+
+# A span of the source text and its script-based language tag ("en", "hi" or "mixed")
+LanguageSegment = namedtuple("LanguageSegment", ["start", "end", "language", "hindi_ratio"])
+
+
+def contains_devanagari(text: str) -> bool:
+    """C-level scan that stops at the first Devanagari character."""
+    return DEVANAGARI_RUN.search(text) is not None
+
+
+def hindi_ratio(text: str, start: int = 0, end: int = None) -> float:
+    """Share of letters in text[start:end] that are Devanagari (0.0 when there are no letters)."""
+    end = len(text) if end is None else end
+    hindi = sum(m.end() - m.start() for m in DEVANAGARI_RUN.finditer(text, start, end))
+    if not hindi:
+        return 0.0
+    latin = sum(m.end() - m.start() for m in LATIN_RUN.finditer(text, start, end))
+    return hindi / (hindi + latin)
+
+
+def tag(ratio: float, hindi_threshold: float = 0.8, english_threshold: float = 0.05) -> str:
+    if ratio >= hindi_threshold:
+        return "hi"
+    if ratio <= english_threshold:
+        return "en"
+    return "mixed"
+
+
+def detect_segments(text: str):
+    """Splits text at paragraph/clause boundaries and tags each piece by script ratio."""
+    segments = []
+    start = 0
+    for m in PARAGRAPH_BREAK.finditer(text):
+        if m.start() > start:
+            ratio = hindi_ratio(text, start, m.start())
+            segments.append(LanguageSegment(start, m.start(), tag(ratio), ratio))
+        start = m.end()
+    if start < len(text):
+        ratio = hindi_ratio(text, start)
+        segments.append(LanguageSegment(start, len(text), tag(ratio), ratio))
+    return segments
+
+
+# Where an over-long segment may be cut: after a danda or full stop, else at any whitespace
+SENTENCE_BREAK = re.compile(r'(?<=[\u0964\u0965.;!?])\s+')
+WHITESPACE = re.compile(r'\s+')
+
+
+def translation_chunks(segments, max_chars: int = 2000, text: str = None):
+    """
+    Groups consecutive non-English segments into (start, end) spans of at most max_chars,
+    so translation requests stay small and English text is never sent. A single segment
+    longer than max_chars is cut at sentence ends (or whitespace) when `text` is given,
+    else at max_chars.
+    """
+    chunks = []
+    current = None
+    for seg in segments:
+        if seg.language == "en":
+            if current:
+                chunks.append(current)
+            current = None
+            continue
+        if current and seg.end - current[0] <= max_chars:
+            current = (current[0], seg.end)
+            continue
+        if current:
+            chunks.append(current)
+        pieces = split_span(text, seg.start, seg.end, max_chars)
+        chunks.extend(pieces[:-1])
+        current = pieces[-1]
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def split_span(text, start: int, end: int, max_chars: int):
+    """Cuts text[start:end] into (start, end) pieces of at most max_chars, preferring sentence ends."""
+    pieces = []
+    while end - start > max_chars:
+        cut = None
+        if text is not None:
+            for pattern in (SENTENCE_BREAK, WHITESPACE):
+                breaks = [m.end() for m in pattern.finditer(text, start + 1, start + max_chars)]
+                if breaks:
+                    cut = breaks[-1]
+                    break
+        cut = cut or start + max_chars
+        pieces.append((start, cut))
+        start = cut
+    pieces.append((start, end))
+    return pieces
+
+
+def document_language(segments) -> str:
+    languages = {seg.language for seg in segments}
+    if languages <= {"en"}:
+        return "en"
+    if languages == {"hi"}:
+        return "hi"
+    return "mixed"
@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from . import metrics
+
+
+def normalize_text(text: str) -> str:
+    """Collapses whitespace and case so trivially different copies of a clause share a key."""
+    return re.sub(r"\s+", " ", text or "").strip().lower()
+
+
+class LLMCache:
+    """
+    Two-tier, content-addressed cache for LLM responses.
+    Tier 1 is an in-memory LRU; tier 2 is a SQLite file that survives restarts.
+    Both tiers honour a TTL, and the disk tier is trimmed to a maximum number of entries
+    when it is opened and then every `trim_every` writes.
+    """
+    def __init__(self, path=None, memory_entries=None, max_entries=None, ttl_seconds=None, name="llm", trim_every=100):
+        self.name = name  # Label for the cache_lookups_total metric
+        self.trim_every = trim_every
+        self.memory_entries = memory_entries or int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "1024"))
+        self.max_entries = max_entries or int(os.getenv("LLM_CACHE_MAX_ENTRIES", "50000"))
+        self.ttl_seconds = ttl_seconds or float(os.getenv("LLM_CACHE_TTL", str(30 * 24 * 3600)))
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        # An empty path disables the disk tier (memory-only cache)
+        self.path = path if path is not None else os.getenv("LLM_CACHE_PATH", self._default_path())
+        self._db = None
+        if self.path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache (accessed)")
+            self._db.commit()
+            self._trim(time.time())  # Entries that expired while no process had the cache open
+        self._writes_since_trim = 0
+
+    @staticmethod
+    def _default_path():
+        root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        return os.path.join(root_dir, "data", "cache", "llm_cache.sqlite3")
+
+    @staticmethod
+    def make_key(provider: str, model: str, template_version: str, *parts) -> str:
+        """SHA-256 over provider, model, prompt template version and the normalized inputs."""
+        digest = hashlib.sha256()
+        for part in (provider, model, template_version) + tuple(normalize_text(str(p)) for p in parts):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x1f")
+        return digest.hexdigest()
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created, value = entry
+                if now - created <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    self.memory_hits += 1
+                    metrics.CACHE_LOOKUPS.inc(cache=self.name, result="memory_hit")
+                    return json.loads(value)
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute("SELECT value, created FROM llm_cache WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    value, created = row
+                    if now - created <= self.ttl_seconds:
+                        self._db.execute("UPDATE llm_cache SET accessed = ? WHERE key = ?", (now, key))
+                        self._db.commit()
+                        self._remember(key, created, value)
+                        self.hits += 1
+                        self.disk_hits += 1
+                        metrics.CACHE_LOOKUPS.inc(cache=self.name, result="disk_hit")
+                        return json.loads(value)
+                    self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._db.commit()
+
+            self.misses += 1
+            metrics.CACHE_LOOKUPS.inc(cache=self.name, result="miss")
+            return None
+
+    def set(self, key: str, value):
+        now = time.time()
+        serialized = json.dumps(value)
+        with self._lock:
+            self._remember(key, now, serialized)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                    (key, serialized, now, now)
+                )
+                self._db.commit()
+                self._writes_since_trim += 1
+                if self._writes_since_trim >= self.trim_every:
+                    self._trim(now)
+
+    def _remember(self, key, created, value):
+        self._memory[key] = (created, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _trim(self, now):
+        """Drops expired rows, then the least recently used rows above max_entries."""
+        self._writes_since_trim = 0
+        self._db.execute("DELETE FROM llm_cache WHERE created < ?", (now - self.ttl_seconds,))
+        self._db.execute(
+            "DELETE FROM llm_cache WHERE key IN ("
+            "SELECT key FROM llm_cache ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+        self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM llm_cache")
+                self._db.commit()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+            }
@@ -1,39 +1,140 @@
 import os
+import contextvars
 import json
-from openai import OpenAI
-from anthropic import Anthropic
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dotenv import load_dotenv
+from . import metrics
+from .llm_cache import LLMCache
+from .scheduler import get_scheduler, SchedulerBusyError
 
 load_dotenv()
 
+CLAUSE_ANALYSIS_KEYS = ("explanation", "risk_level", "risk_reason", "suggestion", "category")
+RISK_LEVELS = {"low": "Low", "medium": "Medium", "high": "High"}
+
+# Bump when a prompt template changes so cached answers for the old wording are not reused
+PROMPT_VERSIONS = {
+    "analyze_clause": "v1",
+    "analyze_clause_batch": "v1",
+    "summarize_contract": "v2",
+    "summarize_section": "v1",
+    "reduce_summary": "v1",
+    "merge_summary_parts": "v1",
+    "detect_hindi_and_translate": "v1",
+}
+
+# Clause analyses from either template share one cache entry, so it is keyed by both versions
+_CLAUSE_TEMPLATES = ("analyze_clause", "analyze_clause_batch")
+
+# Environment variable holding each provider's API key
+PROVIDER_KEY_ENV = {"openai": "OPENAI_API_KEY", "anthropic": "ANTHROPIC_API_KEY"}
+
+# USD per million (prompt, completion) tokens, for cost estimates; keep in line with provider pricing
+MODEL_PRICES = {
+    "gpt-4-turbo": (10.00, 30.00),
+    "claude-3-opus-20240229": (15.00, 75.00),
+}
+
+# Rough size of the fixed instruction block wrapped around a single clause / a packed clause batch
+_CLAUSE_OVERHEAD_TOKENS = 150
+_BATCH_OVERHEAD_TOKENS = 250
+
+def _estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English legal text)."""
+    return len(text) // 4 + 1
+
+# Monotonic time by which the LLM calls of the current task must finish (see call_deadline)
+_deadline = contextvars.ContextVar("llm_deadline", default=None)
+
+@contextmanager
+def call_deadline(seconds):
+    """
+    LLM calls made inside give up once `seconds` have passed: each provider request is sent
+    with the remaining time as its timeout, so a slow call frees its thread instead of running on.
+    """
+    token = _deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+def _time_left():
+    """Seconds until the current call_deadline, or None without one."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+def _usable_key(key) -> bool:
+    return bool(key and "your_" not in key)
+
+class LLMRequestError(Exception):
+    """A live provider call failed for good (after the scheduler's retries)."""
+
+class LLMBusyError(LLMRequestError):
+    """The scheduler turned the call away (queue full or waited too long); it may succeed later."""
+
+def _retry_after(error, default=5.0):
+    """Seconds from a provider error's retry-after header, if any."""
+    response = getattr(error, "response", None)
+    try:
+        return float(response.headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return default
+
 class LLMEngine:
     """
     Handles deep legal reasoning using GPT-4 or Claude 3.
     """
-    def __init__(self, provider="openai"):
+    def __init__(self, provider="openai", cache=None):
         self.provider = provider
-        api_key = os.getenv("OPENAI_API_KEY")
-        
-        if provider == "openai":
-            self.model = "gpt-4-turbo"
-            # Only initialize client if key is valid/present
-            if api_key and "your_" not in api_key:
-                self.client = OpenAI(api_key=api_key)
-            else:
-                self.client = None
-                
-        elif provider == "anthropic":
-            anthropic_key = os.getenv("ANTHROPIC_API_KEY")
-            self.model = "claude-3-opus-20240229"
-            if anthropic_key and "your_" not in anthropic_key:
-                self.client = Anthropic(api_key=anthropic_key)
-            else:
-                self.client = None
+        # Set LLM_CACHE_ENABLED=0 to send every prompt to the provider
+        if cache is None and os.getenv("LLM_CACHE_ENABLED", "1") != "0":
+            cache = LLMCache()
+        self.cache = cache
+        # Every live call is admitted by the process-wide rate-limit scheduler for this provider
+        self.scheduler = get_scheduler(provider)
+        self.max_retries = int(os.getenv("LLM_MAX_RETRIES", "3"))
+        self.expected_completion_tokens = int(os.getenv("LLM_EXPECTED_COMPLETION_TOKENS", "600"))
+        # Longer contracts are summarized map-reduce over section chunks (see summarize_contract)
+        self.summary_single_max_tokens = int(os.getenv("SUMMARY_SINGLE_MAX_TOKENS", "6000"))
+        self.summary_chunk_tokens = int(os.getenv("SUMMARY_CHUNK_TOKENS", "3000"))
+        self.summary_map_concurrency = int(os.getenv("SUMMARY_MAP_CONCURRENCY", "8"))
+
+        # Keys are read once here rather than on every call; only the provider's own key makes it live
+        self.key_env = PROVIDER_KEY_ENV.get(provider)
+        api_key = os.getenv(self.key_env) if self.key_env else None
+        self._key = api_key if _usable_key(api_key) else None
+        self._live = self._key is not None
+        self.model = {"openai": "gpt-4-turbo", "anthropic": "claude-3-opus-20240229"}.get(provider, provider)
+        # Only initialize client if key is valid/present
+        self.client = self._make_client() if self._key else None
+
+    def _make_client(self):
+        """SDK client on the shared keep-alive connection pool; retries go through the scheduler."""
+        from .http_pool import sync_client
+        if self.provider == "openai":
+            from openai import OpenAI  # Imported here so the SDK only loads when it is used
+            return OpenAI(api_key=self._key, max_retries=0, http_client=sync_client())
+        from anthropic import Anthropic
+        return Anthropic(api_key=self._key, max_retries=0, http_client=sync_client())
 
     def analyze_clause(self, clause_text: str, contract_type: str):
         """
         Analyzes a single clause for risk and provides a plain language explanation.
+        Without an API key the local rule packs answer instead (see RuleEngine).
         """
+        if not self.is_live():
+            return self._offline_clause_analysis(clause_text, contract_type)
+        return self._get_completion(*self._clause_request(clause_text, contract_type))
+
+    def _offline_clause_analysis(self, clause_text, contract_type):
+        from .rule_engine import get_rule_engine
+        metrics.LLM_REQUESTS.inc(provider=self.provider, model=self.model, outcome="simulated")
+        return get_rule_engine().answer(clause_text, contract_type)
+
+    def _clause_request(self, clause_text, contract_type):
         prompt = f"""
         You are a legal expert for Indian SMEs. Analyze the following clause from a {contract_type}.
         
@@ -47,16 +148,167 @@ class LLMEngine:
         - "category": (e.g., Liability, Termination, Payment, IP, etc.)
         """
         
-        return self._get_completion(prompt)
+        return prompt, self._clause_cache_key(contract_type, clause_text)
 
-    def summarize_contract(self, full_text: str, contract_type: str):
+    def plan_clause_batches(self, clauses, max_prompt_tokens=None, max_clauses=None):
         """
-        Generates a high-level summary and composite risk score.
+        Groups clause indices into batches whose packed prompt stays under the token budget.
+        A clause that alone exceeds the budget gets a batch of its own.
         """
+        max_prompt_tokens = max_prompt_tokens or int(os.getenv("LLM_BATCH_MAX_TOKENS", "6000"))
+        max_clauses = max_clauses or int(os.getenv("LLM_BATCH_MAX_CLAUSES", "8"))
+        budget = max_prompt_tokens - _BATCH_OVERHEAD_TOKENS
+
+        batches, current, used = [], [], 0
+        for idx, clause in enumerate(clauses):
+            cost = _estimate_tokens(clause) + 10  # Per-clause framing
+            if current and (used + cost > budget or len(current) >= max_clauses):
+                batches.append(current)
+                current, used = [], 0
+            current.append(idx)
+            used += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    def estimate_clause_usage(self, clauses, batches):
+        """
+        (calls, tokens) the scheduler will admit for analyzing `clauses` grouped into `batches`
+        of indices, without building the prompts. Tokens include the expected completion.
+        """
+        tokens = 0
+        for batch in batches:
+            framing = _CLAUSE_OVERHEAD_TOKENS if len(batch) == 1 else _BATCH_OVERHEAD_TOKENS + 10 * len(batch)
+            tokens += sum(_estimate_tokens(clauses[i]) for i in batch) + framing + self.expected_completion_tokens
+        return len(batches), tokens
+
+    def expected_call_seconds(self):
+        """Mean observed provider latency for this model, or LLM_EXPECTED_CALL_SECONDS before the first call."""
+        observed = metrics.LLM_SECONDS.mean(provider=self.provider, model=self.model)
+        return observed if observed is not None else float(os.getenv("LLM_EXPECTED_CALL_SECONDS", "10"))
+
+    def analyze_clause_batch(self, clauses, contract_type: str):
+        """
+        Analyzes several clauses in a single request and returns one analysis per clause, in order.
+        Entries the model drops or garbles are retried one by one through analyze_clause.
+        """
+        results, keys = self._cached_batch(clauses, contract_type)
+        todo = [i for i, r in enumerate(results) if r is None]
+        if len(todo) > 1 and self.is_live():
+            response = self._get_completion(self._batch_prompt(clauses, todo, contract_type))
+            self._store_batch(response, todo, keys, results)
+
+        # Retry only the clauses the batch did not answer
+        for i, r in enumerate(results):
+            if r is None:
+                results[i] = self.analyze_clause(clauses[i], contract_type)
+        return results
+
+    def _cached_batch(self, clauses, contract_type):
+        """
+        Serve what we can from the cache before building the packed prompt. Each clause is
+        cached under the same key as a single-clause analysis, so an analysis made in either
+        mode is reused by the other and only the misses are batched.
+        """
+        results = [None] * len(clauses)
+        keys = [self._clause_cache_key(contract_type, c) for c in clauses]
+        if self.cache is not None and self.is_live():
+            for i, key in enumerate(keys):
+                results[i] = self.cache.get(key)
+                if results[i] is not None:
+                    metrics.LLM_REQUESTS.inc(provider=self.provider, model=self.model, outcome="cache_hit")
+                    self._charge(cache_hit=True)
+        return results, keys
+
+    @staticmethod
+    def _batch_prompt(clauses, todo, contract_type):
+        packed = "\n\n".join(f'[{n}] "{clauses[i]}"' for n, i in enumerate(todo))
+        return f"""
+        You are a legal expert for Indian SMEs. Analyze each of the following numbered clauses from a {contract_type}.
+
+        {packed}
+
+        Provide the output in valid JSON format as {{"analyses": [...]}} with exactly one object per clause, each with the keys:
+        - "index": The clause number shown in square brackets.
+        - "explanation": A plain-language explanation of what this clause means for a business owner.
+        - "risk_level": "Low", "Medium", or "High".
+        - "risk_reason": Why is this risky (or not)?
+        - "suggestion": How can this be renegotiated to be more SME-friendly?
+        - "category": (e.g., Liability, Termination, Payment, IP, etc.)
+        """
+
+    def _store_batch(self, response, todo, keys, results):
+        for n, analysis in self._parse_batch_response(response, len(todo)).items():
+            i = todo[n]
+            results[i] = analysis
+            if self.cache is not None and self.is_live():
+                self.cache.set(keys[i], analysis)
+
+    @staticmethod
+    def _parse_batch_response(response, expected: int):
+        """Returns {index: analysis} for the entries that match the clause-analysis schema."""
+        entries = response.get("analyses") if isinstance(response, dict) else response
+        if not isinstance(entries, list):
+            return {}
+        valid = {}
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            try:
+                index = int(entry.get("index"))
+            except (TypeError, ValueError):
+                continue
+            if not 0 <= index < expected or index in valid:
+                continue
+            if not all(isinstance(entry.get(k), str) and entry.get(k).strip() for k in CLAUSE_ANALYSIS_KEYS):
+                continue
+            level = RISK_LEVELS.get(entry["risk_level"].strip().lower())
+            if level is None:
+                continue
+            analysis = {k: entry[k] for k in CLAUSE_ANALYSIS_KEYS}
+            analysis["risk_level"] = level
+            valid[index] = analysis
+        return valid
+
+    def summarize_contract(self, full_text: str, contract_type: str, sections=None):
+        """
+        Generates a high-level summary and composite risk score over the whole contract.
+        Text longer than summary_single_max_tokens is summarized map-reduce: `sections` (e.g.
+        NLPEngine.segment_sections) are packed into chunks summarized in parallel (each cached
+        on its own), then the partial results are merged. While they do not fit one reduce
+        prompt of summary_single_max_tokens, groups of them are merged first, level by level.
+        """
+        chunks = self._summary_chunks(full_text, sections)
+        if len(chunks) == 1:
+            return self._get_completion(*self._summary_request(full_text, contract_type))
+
+        partials = self._map_completions([self._section_request(chunk, contract_type) for chunk in chunks])
+        parts, covered = self._summary_parts(partials), None
+        if not parts:
+            return partials[0]
+        while True:
+            groups = self._reduce_groups(parts, contract_type)
+            if groups is None:
+                break
+            merged = self._map_completions([self._merge_request(group, contract_type) for group in groups])
+            parts, covered = self._merged_parts(groups, merged, covered)
+            if not parts:
+                return merged[0]
+        summary = self._get_completion(*self._reduce_request(parts, contract_type))
+        return self._with_coverage(summary, chunks, sum(covered) if covered else len(parts))
+
+    def _map_completions(self, requests):
+        """(prompt, cache key) requests sent in parallel; answers in request order."""
+        # Each task runs in a copy of this context so its usage is charged to the current contract
+        with ThreadPoolExecutor(max_workers=min(len(requests), self.summary_map_concurrency)) as pool:
+            futures = [pool.submit(contextvars.copy_context().run, self._get_completion, *request) for request in requests]
+            return [f.result() for f in futures]
+
+    def _summary_request(self, full_text, contract_type):
         prompt = f"""
         Analyze this {contract_type} and provide a summary for a business owner.
         
-        Contract Text: {full_text[:5000]}... (truncated)
+        Contract Text: {full_text}
         
         Provide the output in valid JSON format with the following keys:
         - "summary": A brief (3-4 bullet points) summary of the key obligations.
@@ -64,12 +316,157 @@ class LLMEngine:
         - "top_risks": List of top 3 risky areas identified.
         - "missing_clauses": Any standard clauses missing that should be there for Indian SMEs.
         """
-        return self._get_completion(prompt)
+        return prompt, self._cache_key("summarize_contract", contract_type, full_text)
+
+    def _summary_chunks(self, full_text, sections):
+        """The whole text as one chunk when it fits a single summary prompt (or in demo mode)."""
+        if not self.is_live() or _estimate_tokens(full_text) <= self.summary_single_max_tokens:
+            return [full_text]
+        return self.plan_summary_chunks(sections or [full_text])
+
+    def plan_summary_chunks(self, sections, max_tokens=None):
+        """
+        Packs sections, in order, into chunks of at most max_tokens (oversized sections are
+        split at line or word breaks). Besides the size limit, a chunk that is at least half
+        full also ends after any section whose checksum is divisible by 4. These content-defined
+        boundaries keep an edit from shifting every later chunk, so a revision mostly hits
+        cached chunk summaries.
+        """
+        max_chars = (max_tokens or self.summary_chunk_tokens) * 4
+        pieces = []
+        for section in sections:
+            while len(section) > max_chars:
+                cut = section.rfind("\n", max_chars // 2, max_chars)
+                if cut <= 0:
+                    cut = section.rfind(" ", max_chars // 2, max_chars)
+                cut = cut if cut > 0 else max_chars
+                pieces.append(section[:cut])
+                section = section[cut:]
+            if section.strip():
+                pieces.append(section)
+
+        chunks, current, size = [], [], 0
+        for piece in pieces:
+            if current and size + len(piece) > max_chars:
+                chunks.append("".join(current))
+                current, size = [], 0
+            current.append(piece)
+            size += len(piece)
+            if size >= max_chars // 2 and zlib.crc32(piece.encode("utf-8")) % 4 == 0:
+                chunks.append("".join(current))
+                current, size = [], 0
+        if current:
+            chunks.append("".join(current))
+        return chunks
+
+    def _section_request(self, chunk, contract_type):
+        prompt = f"""
+        You are a legal expert for Indian SMEs. Below is one part of a longer {contract_type}.
+
+        Contract Section: {chunk}
+
+        Provide the output in valid JSON format with the following keys:
+        - "key_points": Up to 4 short points on the obligations in this part.
+        - "risks": Terms in this part that are risky for an SME (short phrases).
+        - "risk_score": An integer from 1-10 (10 being highest risk) for this part.
+        - "clauses_present": Standard clause types this part contains (e.g., Payment, Termination, Liability, Force Majeure, Arbitration).
+        """
+        return prompt, self._cache_key("summarize_section", contract_type, chunk)
+
+    @staticmethod
+    def _summary_parts(partials):
+        """The usable partial results, numbered in document order (failed chunks are left out)."""
+        keys = ("key_points", "risks", "risk_score", "clauses_present")
+        return [dict({k: p.get(k) for k in keys}, part=n + 1)
+                for n, p in enumerate(partials) if isinstance(p, dict) and "error" not in p]
+
+    def _reduce_groups(self, parts, contract_type):
+        """
+        None if the parts fit one reduce prompt; else the parts packed, in order, into groups
+        that each fit one, for a merge level. A group has at least two parts so every level shrinks.
+        """
+        # The instructions around the findings count against the budget too
+        overhead = max(_estimate_tokens(self._reduce_request([], contract_type)[0]),
+                       _estimate_tokens(self._merge_request([], contract_type)[0]))
+        budget = self.summary_single_max_tokens - overhead
+        if _estimate_tokens(json.dumps(parts, ensure_ascii=False)) <= budget or len(parts) < 2:
+            return None
+        groups, current, used = [], [], 0
+        for part in parts:
+            cost = _estimate_tokens(json.dumps(part, ensure_ascii=False)) + 1
+            if len(current) >= 2 and used + cost > budget:
+                groups.append(current)
+                current, used = [], 0
+            current.append(part)
+            used += cost
+        if len(current) == 1 and groups:
+            groups[-1].append(current[0])
+        elif current:
+            groups.append(current)
+        return groups
+
+    @staticmethod
+    def _merged_parts(groups, merged, covered=None):
+        """
+        The next level's parts from the merge answers (failed merges are left out), and how
+        many of the original parts each one covers.
+        """
+        covered = covered or [1] * sum(len(group) for group in groups)
+        counts, parts, position = [], [], 0
+        for group, result in zip(groups, merged):
+            count = sum(covered[position:position + len(group)])
+            position += len(group)
+            if isinstance(result, dict) and "error" not in result:
+                parts.append(dict({k: result.get(k) for k in ("key_points", "risks", "risk_score", "clauses_present")},
+                                  part=len(parts) + 1))
+                counts.append(count)
+        return parts, counts
+
+    def _merge_request(self, parts, contract_type):
+        findings = json.dumps(parts, ensure_ascii=False, sort_keys=True)
+        prompt = f"""
+        You are a legal expert for Indian SMEs. Below are the findings for consecutive parts of a longer {contract_type}, in order:
+
+        {findings}
+
+        Merge them into the findings for this whole stretch of the contract, in valid JSON format with the following keys:
+        - "key_points": Up to 4 short points on the most important obligations.
+        - "risks": The terms that are most risky for an SME (short phrases).
+        - "risk_score": An integer from 1-10 (10 being highest risk) for this stretch.
+        - "clauses_present": Every standard clause type found in any of the parts.
+        """
+        return prompt, self._cache_key("merge_summary_parts", contract_type, findings)
+
+    def _reduce_request(self, parts, contract_type):
+        findings = json.dumps(parts, ensure_ascii=False, sort_keys=True)
+        prompt = f"""
+        Analyze this {contract_type} and provide a summary for a business owner.
+        The contract was read in {len(parts)} parts; these are the findings for each part, in order:
+
+        {findings}
+
+        Provide the output in valid JSON format with the following keys:
+        - "summary": A brief (3-4 bullet points) summary of the key obligations of the whole contract.
+        - "composite_risk_score": An integer from 1-10 (10 being highest risk) for the whole contract.
+        - "top_risks": List of top 3 risky areas identified.
+        - "missing_clauses": Standard clauses that should be there for Indian SMEs but appear in no part's clauses_present.
+        """
+        return prompt, self._cache_key("reduce_summary", contract_type, findings)
+
+    @staticmethod
+    def _with_coverage(summary, chunks, summarized):
+        """Records how much of the contract (`summarized` of the chunks) the map-reduce summary is based on."""
+        if isinstance(summary, dict) and "error" not in summary:
+            summary = dict(summary, coverage={"chunks": len(chunks), "summarized": summarized})
+        return summary
 
     def detect_hindi_and_translate(self, text: str):
         """
         Detects if text is in Hindi and provides a semantic English translation.
         """
+        return self._get_completion(*self._translate_request(text))
+
+    def _translate_request(self, text):
         prompt = f"""
         The following text might be in Hindi or a mix of English and Hindi.
         1. Detect the language.
@@ -79,85 +476,195 @@ class LLMEngine:
         
         Output format: JSON with "language" and "translated_text".
         """
-        return self._get_completion(prompt)
+        return prompt, self._cache_key("detect_hindi_and_translate", text)
+
+    def _cache_key(self, template: str, *parts):
+        if self.cache is None:
+            return None
+        return self.cache.make_key(self.provider, self.model, f"{template}:{PROMPT_VERSIONS[template]}", *parts)
+
+    def _clause_cache_key(self, contract_type, clause_text):
+        """Key of one clause's analysis, whether a single or a batch prompt produced it."""
+        if self.cache is None:
+            return None
+        versions = ",".join(f"{t}:{PROMPT_VERSIONS[t]}" for t in _CLAUSE_TEMPLATES)
+        return self.cache.make_key(self.provider, self.model, versions, contract_type, clause_text)
+
+    def analysis_scope(self):
+        """Provider, model and clause prompt versions: stored clause analyses are reused only within one scope."""
+        versions = ",".join(f"{t}:{PROMPT_VERSIONS[t]}" for t in _CLAUSE_TEMPLATES)
+        return f"{self.provider}/{self.model}/{versions}"
 
-    def _get_completion(self, prompt: str):
+    def cache_stats(self):
+        """Hit/miss counters for the response cache (None when caching is disabled)."""
+        return self.cache.stats() if self.cache is not None else None
+
+    def is_live(self):
+        """True when a real provider key is configured (otherwise answers are simulated)."""
+        return self._live
+
+    def estimate_cost(self, prompt_tokens: int, completion_tokens: int) -> float:
+        prompt_price, completion_price = MODEL_PRICES.get(self.model, (0.0, 0.0))
+        return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+    def _get_completion(self, prompt: str, cache_key: str = None):
         # Check for placeholder or missing keys
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key or "your_" in api_key:
-            return self._get_simulated_response(prompt)
-            
+        if not self.is_live():
+            return self._simulated(prompt)
+        cached = self._cached(cache_key)
+        if cached is not None:
+            return cached
+
+        # Live mode never falls back to demo answers: a failed call is reported as an error
+        try:
+            result = self._request_completion(prompt)
+        except LLMRequestError as e:
+            return self._request_error(e)
+
+        # Only real provider answers are cached; demo/fallback output never is
+        if cache_key is not None:
+            self.cache.set(cache_key, result)
+        return result
+
+    @staticmethod
+    def _request_error(error):
+        """Error answer for a failed call; "retryable" marks calls the scheduler turned away."""
+        result = {"error": f"LLM request failed: {str(error)}"}
+        if isinstance(error, LLMBusyError):
+            result["retryable"] = True
+        return result
+
+    def _simulated(self, prompt):
+        metrics.LLM_REQUESTS.inc(provider=self.provider, model=self.model, outcome="simulated")
+        return self._get_simulated_response(prompt)
+
+    def _cached(self, cache_key):
+        if cache_key is None:
+            return None
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            metrics.LLM_REQUESTS.inc(provider=self.provider, model=self.model, outcome="cache_hit")
+            self._charge(cache_hit=True)
+        return cached
+
+    def _charge(self, prompt_tokens=0, completion_tokens=0, cache_hit=False):
+        """Adds token usage and cost to the process metrics and to the contract being processed."""
+        cost = 0.0
+        if not cache_hit:
+            labels = {"provider": self.provider, "model": self.model}
+            cost = self.estimate_cost(prompt_tokens, completion_tokens)
+            metrics.LLM_TOKENS.inc(prompt_tokens, kind="prompt", **labels)
+            metrics.LLM_TOKENS.inc(completion_tokens, kind="completion", **labels)
+            metrics.LLM_COST.inc(cost, **labels)
+        request = metrics.current_request.get()
+        if request is not None:
+            request.add_llm_usage(prompt_tokens, completion_tokens, cost, cache_hit=cache_hit)
+
+    def _request_completion(self, prompt: str):
+        """
+        Sends the prompt once the scheduler admits it, retrying rate limits (429), server
+        errors and connection failures with backoff. Raises LLMRequestError when it gives up.
+        """
+        request = metrics.current_request.get()
+        priority = getattr(request, "priority", "interactive")
+        estimate = self._estimate(prompt)
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.scheduler.acquire(estimate, priority=priority, job=request)
+            except SchedulerBusyError as e:
+                metrics.LLM_REQUESTS.inc(provider=self.provider, model=self.model, outcome="rejected")
+                raise LLMBusyError(str(e))
+            options = self._request_options(estimate, last_error)
+            start = time.perf_counter()
+            try:
+                with metrics.LLM_IN_FLIGHT.track_inprogress(provider=self.provider):
+                    response = self._send(prompt, **options)
+            except LLMRequestError:
+                raise
+            except Exception as e:
+                last_error = e
+                backoff = self._on_failure(e, estimate, attempt)
+                if backoff is None:
+                    break
+                time.sleep(self._backoff_within_deadline(backoff))
+                continue
+            return self._on_response(response, estimate, start)
+        raise LLMRequestError(str(last_error))
+
+    def _request_options(self, estimate, last_error=None):
+        """Per-request SDK options: the time left before the call_deadline as the timeout."""
+        remaining = _time_left()
+        if remaining is None:
+            return {}
+        if remaining <= 0:
+            self.scheduler.settle(estimate, 0)
+            raise LLMRequestError(f"Deadline passed ({str(last_error) if last_error else 'before the first attempt'})")
+        return {"timeout": remaining}
+
+    @staticmethod
+    def _backoff_within_deadline(backoff):
+        """Backoff cut short at the call_deadline (the next attempt then gives up right away)."""
+        remaining = _time_left()
+        return backoff if remaining is None else max(min(backoff, remaining), 0.0)
+
+    def _estimate(self, prompt):
+        """Tokens reserved with the scheduler before a call: prompt estimate plus expected answer."""
+        return _estimate_tokens(prompt) + self.expected_completion_tokens
+
+    def _send(self, prompt: str, **options):
+        if self.client is None:
+            raise LLMRequestError(f"No API key configured for {self.provider}")
+        if self.provider == "openai":
+            return self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                response_format={"type": "json_object"},
+                **options
+            )
+        return self.client.messages.create(
+            model=self.model,
+            max_tokens=2000,
+            messages=[{"role": "user", "content": prompt}],
+            **options
+        )
+
+    def _on_failure(self, error, estimate, attempt):
+        """Records a failed call; returns seconds to back off before retrying, or None to give up."""
+        metrics.LLM_REQUESTS.inc(provider=self.provider, model=self.model, outcome="error")
+        self.scheduler.settle(estimate, 0)
+        print(f"LLM Error (attempt {attempt + 1}): {str(error)}")
+        status = getattr(error, "status_code", None)
+        if status == 429:
+            self.scheduler.pause(_retry_after(error))
+            return 0.0  # The scheduler holds the retry until the pause is over
+        if status is not None and status < 500:
+            return None  # Bad request, auth error etc.: retrying will not help
+        return min(2 ** attempt, 30)
+
+    def _on_response(self, response, estimate, start):
+        """Settles budgets, records usage/cost and parses the JSON answer of a successful call."""
+        labels = {"provider": self.provider, "model": self.model}
+        if self.provider == "openai":
+            prompt_tokens, completion_tokens = response.usage.prompt_tokens, response.usage.completion_tokens
+            content = response.choices[0].message.content
+        else:
+            prompt_tokens, completion_tokens = response.usage.input_tokens, response.usage.output_tokens
+            content = response.content[0].text
+        self.scheduler.settle(estimate, prompt_tokens + completion_tokens)
+        self._charge(prompt_tokens, completion_tokens)
+        metrics.LLM_SECONDS.observe(time.perf_counter() - start, **labels)
         try:
-            if self.provider == "openai":
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[{"role": "user", "content": prompt}],
-                    response_format={"type": "json_object"}
-                )
-                return json.loads(response.choices[0].message.content)
-            elif self.provider == "anthropic":
-                # Simulated for Anthropic as well if key is missing
-                if not os.getenv("ANTHROPIC_API_KEY") or "your_" in os.getenv("ANTHROPIC_API_KEY"):
-                    return self._get_simulated_response(prompt)
-                
-                response = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=2000,
-                    messages=[{"role": "user", "content": prompt}]
-                )
-                return json.loads(response.content[0].text)
-        except Exception as e:
-            print(f"LLM Error: {str(e)}")
-            return self._get_simulated_response(prompt)
-        return None
+            result = json.loads(content)
+        except ValueError as e:
+            metrics.LLM_REQUESTS.inc(outcome="invalid_json", **labels)
+            raise LLMRequestError(f"Provider returned invalid JSON: {str(e)}")
+        metrics.LLM_REQUESTS.inc(outcome="ok", **labels)
+        return result
 
     def _get_simulated_response(self, prompt: str):
         """Returns a realistic mock response for demo purposes when API keys are missing."""
-        if "analyze the following clause" in prompt.lower():
-            # Extract clause text for basic heuristic simulation
-            clause_text = prompt.split('Clause Text: "')[1].split('"')[0].lower() if 'Clause Text: "' in prompt else ""
-            
-            if "payment" in clause_text or "fee" in clause_text or "price" in clause_text:
-                return {
-                    "explanation": "[DEMO MODE] This clause outlines the payment obligations, including deadlines and potential interest for late payments.",
-                    "risk_level": "Medium",
-                    "risk_reason": "Vague payment timelines can lead to cash flow issues for SMEs.",
-                    "suggestion": "Specify 'Payment within 30 days of invoice date' to ensure predictable cash flow.",
-                    "category": "Payment Terms"
-                }
-            elif "terminate" in clause_text or "cancellation" in clause_text:
-                return {
-                    "explanation": "[DEMO MODE] This section defines how and when the agreement can be ended by either party.",
-                    "risk_level": "High",
-                    "risk_reason": "One-sided termination rights can leave an SME vulnerable after making investments.",
-                    "suggestion": "Negotiate mutual termination for convenience with a 60-day notice period.",
-                    "category": "Termination"
-                }
-            elif "liability" in clause_text or "indemnify" in clause_text:
-                return {
-                    "explanation": "[DEMO MODE] This clause limits or assigns financial responsibility for damages or losses.",
-                    "risk_level": "High",
-                    "risk_reason": "Unlimited liability clauses are high-risk for SMEs and can lead to business failure.",
-                    "suggestion": "Limit total liability to the amount paid under the contract in the last 12 months.",
-                    "category": "Liability & Indemnity"
-                }
-            elif "intellectual property" in clause_text or "ip" in clause_text or "copyright" in clause_text:
-                return {
-                    "explanation": "[DEMO MODE] Defines ownership of work results and pre-existing assets.",
-                    "risk_level": "Medium",
-                    "risk_reason": "Broad IP transfers might strip the SME of its core technology or methodology.",
-                    "suggestion": "Ensure the SME retains ownership of its background IP and only licenses it for the project.",
-                    "category": "Intellectual Property"
-                }
-            else:
-                return {
-                    "explanation": "[DEMO MODE] This clause covers general administrative or standard operating procedures of the agreement.",
-                    "risk_level": "Low",
-                    "risk_reason": "Seems to be standard boilerplate language with minimal commercial risk.",
-                    "suggestion": "Verify that the governing law is set to your local jurisdiction (e.g., Delhi or Mumbai).",
-                    "category": "General Provisions"
-                }
-        elif "analyze this" in prompt.lower() and "summary" in prompt.lower():
+        if "analyze this" in prompt.lower() and "summary" in prompt.lower():
             return {
                 "summary": [
                     "General business obligation to provide services on time.",
@@ -174,4 +681,4 @@ class LLMEngine:
                 "language": "Hindi (Simulated)",
                 "translated_text": "This is a simulated translation of your Hindi contract text for demonstration purposes."
             }
-        return {"error": "Key missing. Please add OPENAI_API_KEY to .env"}
+        return {"error": f"Key missing. Please add {self.key_env or 'OPENAI_API_KEY'} to .env"}
@@ -0,0 +1,247 @@
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+# Seconds; covers everything from a regex pass to a slow multi-clause LLM call
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)] + [f'{n}="{v}"' for n, v in extra]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class Registry:
+    """Holds metrics and renders them in the Prometheus text exposition format."""
+    def __init__(self):
+        self._metrics = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name, help, labelnames=(), registry=REGISTRY):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        registry.register(self)
+
+    def _key(self, labels):
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+    def dec(self, amount=1.0, **labels):
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track_inprogress(self, **labels):
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS, registry=REGISTRY):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, help, labelnames, registry)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][bisect.bisect_left(self.buckets, value)] += 1
+            state[1] += value
+            state[2] += 1
+
+    def mean(self, **labels):
+        """Average observed value, or None before the first observation."""
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state[1] / state[2] if state else None
+
+    def samples(self):
+        with self._lock:
+            items = sorted((k, ([*v[0]], v[1], v[2])) for k, v in self._values.items())
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                labels = _format_labels(self.labelnames, key, [("le", _format_value(bound))])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+# Pipeline
+STAGE_SECONDS = Histogram("contract_stage_seconds", "Time spent in each pipeline stage per contract.", ["stage"])
+CONTRACTS = Counter("contracts_processed_total", "Contracts run through the pipeline.", ["outcome"])
+CONTRACTS_IN_FLIGHT = Gauge("contracts_in_flight", "Contracts currently being processed.")
+PDF_PAGE_SECONDS = Histogram("pdf_page_seconds", "Text extraction time per PDF page.")
+
+# LLM
+LLM_REQUESTS = Counter("llm_requests_total", "LLM completions by outcome (ok, error, invalid_json, rejected, cache_hit, simulated).",
+                       ["provider", "model", "outcome"])
+LLM_TOKENS = Counter("llm_tokens_total", "Tokens reported by the provider.", ["provider", "model", "kind"])
+LLM_COST = Counter("llm_cost_usd_total", "Estimated provider cost in USD.", ["provider", "model"])
+LLM_SECONDS = Histogram("llm_request_seconds", "Latency of provider calls.", ["provider", "model"])
+LLM_IN_FLIGHT = Gauge("llm_requests_in_flight", "Provider calls currently waiting for a response.", ["provider"])
+
+# Tier-1 rule engine (escalated clauses go on to the clause index and the LLM)
+RULE_CLAUSES = Counter("rule_engine_clauses_total", "Analyzed clauses the rule packs answered or escalated.", ["outcome"])
+
+# Caches (hit rate = hits / lookups)
+CACHE_LOOKUPS = Counter("cache_lookups_total", "Cache lookups by cache and result.", ["cache", "result"])
+
+# HTTP
+HTTP_REQUESTS = Counter("http_requests_total", "HTTP requests handled.", ["method", "route", "status"])
+HTTP_SECONDS = Histogram("http_request_seconds", "Time until the response headers are sent.", ["method", "route"])
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being handled.", ["route"])
+JOBS = Gauge("background_jobs", "Background analysis jobs by status.", ["status"])
+
+
+# The contract whose LLM usage and timings are being recorded on this thread (see RequestMetrics.bind)
+current_request = contextvars.ContextVar("current_request", default=None)
+
+
+class RequestMetrics:
+    """
+    Per-contract timing breakdown and LLM usage, attached to the report. Stage durations
+    add up when a stage runs more than once (e.g. one entry per clause batch) and are fed
+    into STAGE_SECONDS when the contract finishes. `priority` ("interactive" or "batch") is
+    the scheduling class of the contract's LLM calls (see LLMScheduler). `parse_stats` holds
+    the parser's page count and per-page seconds for PDFs.
+    """
+    def __init__(self, priority="interactive"):
+        self.priority = priority
+        self.parse_stats = None
+        self.started = time.perf_counter()
+        self.timings = {}
+        self.llm = {"calls": 0, "cache_hits": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0}
+        self._lock = threading.Lock()
+
+    def add_time(self, stage, seconds):
+        with self._lock:
+            self.timings[stage] = self.timings.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def bind(self, fn, *args, stage=None):
+        """
+        Runs fn(*args) with this object as current_request (so LLMEngine charges its usage
+        here), optionally timing it as `stage`. Use it for work submitted to thread pools.
+        """
+        token = current_request.set(self)
+        try:
+            if stage is None:
+                return fn(*args)
+            with self.stage(stage):
+                return fn(*args)
+        finally:
+            current_request.reset(token)
+
+    async def bind_async(self, fn, *args, stage=None):
+        """bind() for coroutine functions; the context variable only lives in the running task."""
+        token = current_request.set(self)
+        try:
+            if stage is None:
+                return await fn(*args)
+            with self.stage(stage):
+                return await fn(*args)
+        finally:
+            current_request.reset(token)
+
+    def add_llm_usage(self, prompt_tokens=0, completion_tokens=0, cost=0.0, cache_hit=False):
+        with self._lock:
+            if cache_hit:
+                self.llm["cache_hits"] += 1
+                return
+            self.llm["calls"] += 1
+            self.llm["prompt_tokens"] += prompt_tokens
+            self.llm["completion_tokens"] += completion_tokens
+            self.llm["cost_usd"] += cost
+
+    def finish(self, outcome="ok"):
+        """Records the total time, feeds the stage histograms and returns (timings, llm usage)."""
+        self.add_time("total", time.perf_counter() - self.started)
+        CONTRACTS.inc(outcome=outcome)
+        with self._lock:
+            timings = {stage: round(seconds, 4) for stage, seconds in self.timings.items()}
+            usage = dict(self.llm, cost_usd=round(self.llm["cost_usd"], 6))
+        for stage, seconds in timings.items():
+            STAGE_SECONDS.observe(seconds, stage=stage)
+        for seconds in (self.parse_stats or {}).get("page_seconds", ()):
+            PDF_PAGE_SECONDS.observe(seconds)
+        return timings, usage
@@ -1,82 +1,168 @@
-import spacy
-import re
+import os
+import threading
+from collections import deque
 from typing import Dict, List
+from .classifier import ContractClassifier
+from .entities import EntityPrepass, group_entities, merge_mentions
+from .segmenter import ClauseSegmenter, ClauseSpan
+
+# Components extract_entities never reads; skipping them makes loading and NER much cheaper
+UNUSED_FOR_NER = ["tagger", "parser", "attribute_ruler", "lemmatizer", "senter", "morphologizer", "trainable_lemmatizer"]
 
 class NLPEngine:
     """
     Handles basic NLP tasks like NER, Classification, and Segmentation.
     """
-    def __init__(self, model: str = "en_core_web_sm"):
-        try:
-            self.nlp = spacy.load(model)
-        except OSError:
-            # Fallback or download command could be triggered here
-            import os
-            os.system(f"python -m spacy download {model}")
-            self.nlp = spacy.load(model)
+    def __init__(self, model: str = "en_core_web_sm", ner_only=None, chunk_chars=None, batch_size=None, n_process=None):
+        # NER-only mode loads just tok2vec + ner; NER reads sentence pieces of at most chunk_chars through nlp.pipe
+        self.ner_only = ner_only if ner_only is not None else os.getenv("NLP_NER_ONLY", "1") != "0"
+        self.chunk_chars = chunk_chars or int(os.getenv("NLP_CHUNK_CHARS", "5000"))
+        self.batch_size = batch_size or int(os.getenv("NLP_BATCH_SIZE", "32"))
+        self.n_process = n_process or int(os.getenv("NLP_N_PROCESS", "1"))
+
+        self.segmenter = ClauseSegmenter(fold_items=True)
+        self.classifier = ContractClassifier()
+        self.prepass = EntityPrepass()
+
+        # spaCy and the model are only loaded when NER first runs (see load_model)
+        self.model = model
+        self._nlp = None
+        self._load_lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._nlp is not None
+
+    @property
+    def nlp(self):
+        if self._nlp is None:
+            self.load_model()
+        return self._nlp
+
+    def load_model(self):
+        """
+        Imports spaCy and loads the model; called lazily, or eagerly by a warm-up. The lock
+        makes a request that arrives during the warm-up wait for it instead of loading again.
+        """
+        if self._nlp is not None:
+            return self._nlp
+        with self._load_lock:
+            if self._nlp is not None:
+                return self._nlp
+            import spacy
+            exclude = UNUSED_FOR_NER if self.ner_only else []
+            try:
+                nlp = spacy.load(self.model, exclude=exclude)
+            except OSError:
+                # Fallback or download command could be triggered here
+                os.system(f"python -m spacy download {self.model}")
+                nlp = spacy.load(self.model, exclude=exclude)
+            self._nlp = nlp
+            return nlp
 
     def classify_contract(self, text: str) -> str:
         """
-        Heuristic-based classification of contract type.
+        Weighted keyword classification of contract type (see ContractClassifier).
         Can be improved with LLM later.
         """
-        text_lower = text.lower()
-        if "employment" in text_lower or "employee" in text_lower:
-            return "Employment Agreement"
-        elif "lease" in text_lower or "tenant" in text_lower:
-            return "Lease Agreement"
-        elif "vendor" in text_lower or "supplier" in text_lower:
-            return "Vendor Contract"
-        elif "partnership" in text_lower:
-            return "Partnership Deed"
-        elif "service" in text_lower or "master service" in text_lower:
-            return "Service Contract"
-        return "General Agreement"
+        return self.classifier.classify(text)
+
+    def rank_contract_types(self, text: str, top_k: int = 3) -> List[Dict]:
+        """Top candidate contract types with scores and confidences, best first."""
+        return self.classifier.rank(text)[:top_k]
 
     def extract_entities(self, text: str) -> Dict[str, List[str]]:
         """
-        Extracts entities like ORG, DATE, MONEY, GPE.
-        """
-        doc = self.nlp(text[:1000000]) # Limit to 1M chars for spacy
-        entities = {
-            "Parties": [],
-            "Dates": [],
-            "Amounts": [],
-            "Jurisdiction": []
-        }
-        
-        for ent in doc.ents:
-            if ent.label_ == "ORG" or ent.label_ == "PERSON":
-                entities["Parties"].append(ent.text)
-            elif ent.label_ == "DATE":
-                entities["Dates"].append(ent.text)
-            elif ent.label_ == "MONEY":
-                entities["Amounts"].append(ent.text)
-            elif ent.label_ == "GPE":
-                entities["Jurisdiction"].append(ent.text)
-        
-        # Deduplicate
-        for key in entities:
-            entities[key] = list(set(entities[key]))
-            
-        return entities
+        Extracts entities like ORG, DATE, MONEY, GPE, grouped as the report shows them:
+        {"Parties", "Dates", "Amounts", "Jurisdiction"} (see extract_entity_mentions).
+        """
+        return group_entities(self.extract_entity_mentions(text))
 
-    def segment_clauses(self, text: str) -> List[str]:
+    def extract_entity_mentions(self, text: str) -> List[Dict]:
         """
-        Segments text into potential clauses based on common numbering patterns.
+        Typed entities in document order: {"type", "text", "start", "end", "value", "source"}.
+        The rule-based pre-pass (EntityPrepass) resolves amounts, dates, durations, places and
+        companies with normalized values. spaCy NER then reads only the sentences that still
+        hold unresolved names or numbers, in document order and in growing waves: names it
+        finds are matched in the remaining sentences first, so a party named in the recitals
+        does not send every later sentence that mentions it through NER.
         """
-        # Improved pattern to catch various clause headers
-        clause_pattern = r'\n(?=\s*\d+\.|\s*[A-Z]\.|\s*Article\s+[IVXLCDM]+|\s*Section\s+\d+)'
-        clauses = re.split(clause_pattern, text)
-        
-        # Remove duplicates and very short fragments that aren't meaningful clauses
+        mentions = self.prepass.find(text)
+        pending = deque(self.prepass.unresolved(text, mentions))
+        wave_chars = self.chunk_chars
+        while pending:
+            wave, size = [], 0
+            while pending and (not wave or size + pending[0][1] - pending[0][0] <= wave_chars):
+                size += pending[0][1] - pending[0][0]
+                wave.append(pending.popleft())
+            pieces = self._ner_pieces(text, wave)
+            docs = self.nlp.pipe((text[start:end] for start, end in pieces), batch_size=self.batch_size, n_process=self.n_process)
+            found = []
+            for (offset, _), doc in zip(pieces, docs):
+                for ent in doc.ents:
+                    mention = self.prepass.from_ner(ent.label_, ent.text, offset + ent.start_char, offset + ent.end_char)
+                    if mention is not None:
+                        found.append(mention)
+            mentions = merge_mentions(mentions, found)
+
+            names = [m for m in found if m["type"] in ("PARTY", "LOCATION") and len(m["text"]) > 2]
+            if names and pending:
+                mentions = merge_mentions(mentions, self.prepass.propagate(text, names, pending))
+                pending = deque(self.prepass.unresolved(text, mentions, pending))
+            wave_chars *= 2
+        return mentions
+
+    def _ner_pieces(self, text: str, sentences):
+        """
+        Joins adjacent sentences into pieces of at most chunk_chars for nlp.pipe; a longer
+        sentence is cut at whitespace so no entity is split mid-word.
+        """
+        limit = self.chunk_chars
+        pieces = []
+        for start, end in sentences:
+            if pieces and not text[pieces[-1][1]:start].strip() and end - pieces[-1][0] <= limit:
+                pieces[-1] = (pieces[-1][0], end)
+                continue
+            while end - start > limit:
+                cut = text.rfind(" ", start + limit // 2, start + limit)
+                cut = cut if cut > start else start + limit
+                pieces.append((start, cut))
+                start = cut
+            pieces.append((start, end))
+        return pieces
+
+    def segment_clause_spans(self, text) -> List[ClauseSpan]:
+        """
+        Single-pass segmentation into ClauseSpan offsets (label, depth, parent) for every
+        numbered clause, with list items folded into their clause. Accepts a string or an
+        iterable of text chunks, which is segmented as it is consumed (e.g. PDF pages while
+        later ones are still parsed); very short fragments and repeated clauses are dropped.
+        """
+        if isinstance(text, str):
+            spans = self.segmenter.segment(text)
+        else:
+            chunks = []
+            spans = self.segmenter.segment(chunks.append(chunk) or chunk for chunk in text)
+            text = "".join(chunks)  # Offsets index the joined chunks for body() below
         seen = set()
         cleaned = []
-        for c in clauses:
-            text_snippet = c.strip()
-            # Further filtering: ensure it's not just a number or a very short phrase
-            if text_snippet and text_snippet not in seen and len(text_snippet) > 40 and not re.fullmatch(r'^\s*(\d+\.?|[A-Z]\.?)\s*$', text_snippet):
-                cleaned.append(text_snippet)
-                seen.add(text_snippet)
-        
+        for span in spans:
+            body = span.body(text).strip()
+            if len(body) > 40 and body not in seen:
+                cleaned.append(span)
+                seen.add(body)
         return cleaned
+
+    def segment_sections(self, text: str) -> List[str]:
+        """
+        Top-level sections (preamble, then each outermost clause with its sub-clauses) that
+        together cover the whole text, e.g. as chunk boundaries for map-reduce summarization.
+        """
+        sections = [span.text(text) for span in self.segmenter.segment(text) if span.parent is None]
+        return sections or [text]
+
+    def segment_clauses(self, text: str) -> List[str]:
+        """
+        Segments text into potential clauses based on common numbering patterns.
+        """
+        return [span.body(text).strip() for span in self.segment_clause_spans(text)]
@@ -1,85 +1,847 @@
-from .parser import ContractParser
-from .nlp_engine import NLPEngine
-from .llm_engine import LLMEngine
+from . import metrics
+from .audit_log import AuditLog
+from .clause_selection import ClauseBudget, ClauseSelector
+from .entities import group_entities
+from .language import contains_devanagari, detect_segments, translation_chunks, document_language
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
 import json
+import math
 import os
+import threading
+import time
+import uuid
 from datetime import datetime
 
+# Bump when parsing, segmentation, clause selection or the report shape changes, so cached reports are recomputed
+PIPELINE_VERSION = "3"
+
+def _no_progress(stage, **details):
+    pass
+
 class LegalAssistantBackend:
     """
     Orchestrates the parsing, NLP analysis, and LLM reasoning.
+    Heavy components (pdfplumber/docx, spaCy, the LLM SDKs) are imported and built on first use.
     """
-    def __init__(self, llm_provider="openai"):
-        self.parser = ContractParser()
-        self.nlp = NLPEngine()
-        self.llm = LLMEngine(provider=llm_provider)
-        
+    def __init__(self, llm_provider="openai", concurrent=True, max_concurrency=None, clause_timeout=None, batch_clauses=None):
+        self.llm_provider = llm_provider
+        self._parser = None
+        self._nlp = None
+        self._llm = None
+        self._init_lock = threading.Lock()
+
+        # Concurrency settings (env overridable so deployments can tune them)
+        self.concurrent = concurrent
+        self.max_concurrency = max_concurrency or int(os.getenv("LLM_MAX_CONCURRENCY", "6"))
+        self.clause_timeout = clause_timeout or float(os.getenv("LLM_CLAUSE_TIMEOUT", "90"))
+        # Pack several clauses into one LLM request (see LLMEngine.analyze_clause_batch)
+        self.batch_clauses = batch_clauses if batch_clauses is not None else os.getenv("LLM_BATCH_CLAUSES", "1") != "0"
+        self.translate_chunk_chars = int(os.getenv("TRANSLATE_CHUNK_CHARS", "2000"))
+        # Near-duplicate clause reuse across contracts (see ClauseIndex)
+        self.reuse_clauses = os.getenv("CLAUSE_INDEX_ENABLED", "1") != "0"
+        self._clause_index = None
+        # Finished reports keyed by file content hash (see _report_cache_key)
+        self.cache_reports = os.getenv("REPORT_CACHE_ENABLED", "1") != "0"
+        self._report_cache = None
+        # Share of clause text a revision may change before its summary is recomputed
+        self.material_change = float(os.getenv("REVISION_MATERIAL_CHANGE", "0.15"))
+        # Ranks clauses by likely risk so the budget goes to the riskiest ones (see _select_clauses)
+        self.clause_selector = ClauseSelector()
+        # Tier 1: local rule packs answer the clauses they are confident about (see RuleEngine)
+        self.use_rules = os.getenv("RULES_ENABLED", "1") != "0"
+        # Async engine: concurrent LLM calls are coroutines on one shared loop instead of a thread each
+        self.async_llm = concurrent and os.getenv("LLM_ASYNC", "1") != "0"
+        # Shared pool: long-lived so a timed-out clause never blocks the report on shutdown
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="llm") if concurrent else None
+
         # Paths relative to project root
         self.root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
         self.logs_dir = os.path.join(self.root_dir, "logs")
         if not os.path.exists(self.logs_dir):
             os.makedirs(self.logs_dir)
+        self.audit = AuditLog(self.logs_dir)
+
+    @property
+    def parser(self):
+        if self._parser is None:
+            with self._init_lock:
+                if self._parser is None:
+                    from .parser import ContractParser
+                    self._parser = ContractParser()
+        return self._parser
+
+    @property
+    def nlp(self):
+        if self._nlp is None:
+            with self._init_lock:
+                if self._nlp is None:
+                    from .nlp_engine import NLPEngine
+                    self._nlp = NLPEngine()
+        return self._nlp
+
+    @property
+    def llm(self):
+        if self._llm is None:
+            with self._init_lock:
+                if self._llm is None:
+                    if self.async_llm:
+                        from .async_llm_engine import AsyncLLMEngine
+                        self._llm = AsyncLLMEngine(provider=self.llm_provider)
+                    else:
+                        from .llm_engine import LLMEngine
+                        self._llm = LLMEngine(provider=self.llm_provider)
+        return self._llm
 
-    def process_contract(self, file_path: str):
+    @property
+    def clause_index(self):
+        if self._clause_index is None and self.reuse_clauses:
+            with self._init_lock:
+                if self._clause_index is None:
+                    from .clause_index import ClauseIndex
+                    self._clause_index = ClauseIndex()
+        return self._clause_index
+
+    @property
+    def rules(self):
+        if not self.use_rules:
+            return None
+        from .rule_engine import get_rule_engine
+        return get_rule_engine()
+
+    @property
+    def report_cache(self):
+        if self._report_cache is None and self.cache_reports:
+            with self._init_lock:
+                if self._report_cache is None:
+                    from .llm_cache import LLMCache
+                    self._report_cache = LLMCache(
+                        path=os.path.join(self.root_dir, "data", "cache", "report_cache.sqlite3"),
+                        memory_entries=64,
+                        max_entries=int(os.getenv("REPORT_CACHE_MAX_ENTRIES", "2000")),
+                        ttl_seconds=float(os.getenv("REPORT_CACHE_TTL", str(30 * 24 * 3600))),
+                        name="report",
+                        trim_every=1  # Reports are large and written once per analysis
+                    )
+        return self._report_cache
+
+    @property
+    def ready(self):
+        """True once the parser, spaCy model and LLM client are loaded, by warm_up() or on first use."""
+        return self._parser is not None and self._llm is not None and self._nlp is not None and self._nlp.loaded
+
+    def warm_up(self):
+        """Builds every component and loads the spaCy model so the first request is not slow."""
+        self.parser
+        self.nlp.load_model()
+        self.llm
+        self.rules
+
+    def process_contract(self, source, progress=None, priority="interactive", content_hash=None, filename=None,
+                         prepared=None, previous_report_id=None, budget=None):
         """
         Full pipeline: Parse -> Classify -> NER -> Segment -> LLM Analysis.
+        `source` is a file path or the file's content (bytes, memoryview or a binary file
+        object); in-memory sources need `filename` so the parser knows the format.
+        `prepared` is the output of prepare_contract (parse and NER done elsewhere, e.g. in a
+        batch worker process); those stages are then skipped.
+        `progress`, if given, is called as progress(stage, **details) as the pipeline advances.
+        `priority` ("interactive" or "batch") orders this contract's LLM calls against others.
+        `content_hash` (SHA-256 of the file) is computed when not given and keys the report cache.
+        `previous_report_id` marks the upload as a revision of that report: only added or
+        modified clauses are analyzed and the report carries a "revision" delta (see _plan_revision).
+        `budget` (a ClauseBudget, default ClauseBudget.from_env()) limits the clauses analyzed;
+        the riskiest clauses are picked first and the rest are listed in "skipped_clauses".
         """
-        # 1. Extraction
-        text = self.parser.get_text(file_path)
+        report = None
+        for event in self.iter_contract_events(source, progress=progress, priority=priority, content_hash=content_hash,
+                                               filename=filename, prepared=prepared, previous_report_id=previous_report_id,
+                                               budget=budget):
+            if event["event"] == "report":
+                report = event["report"]
+            elif event["event"] == "error":
+                report = {"error": event["error"]}
+        return report
+
+    def iter_contract_events(self, source, progress=None, priority="interactive", content_hash=None, filename=None,
+                             prepared=None, previous_report_id=None, budget=None):
+        """
+        Same pipeline as process_contract, yielded as events the moment each part is ready:
+        "metadata" (contract type + entities), "summary", one "clause" per analysis in clause
+        order, then the complete "report" (or a single "error"). A file analyzed before with the
+        same pipeline and prompt versions is replayed from the report cache instead.
+        """
+        progress = progress or _no_progress
+        budget = budget or ClauseBudget.from_env()
+        filename = filename or (os.path.basename(source) if isinstance(source, (str, os.PathLike)) else "upload")
+        metrics.CONTRACTS_IN_FLIGHT.inc()
+        try:
+            previous = None
+            if previous_report_id:
+                previous = self.audit.get(previous_report_id)
+                if previous is None:
+                    yield {"event": "error", "error": f"Previous report {previous_report_id} not found"}
+                    return
+            # A revision report describes its delta, so it is neither served from nor stored in the cache
+            cache_key = self._report_cache_key(source, content_hash, budget) if previous is None else None
+            cached = self.report_cache.get(cache_key) if cache_key else None
+            if cached is not None:
+                yield from self._replay_report(cached, filename, progress)
+                return
+            for event in self._contract_events(source, filename, progress, priority, budget, prepared, previous):
+                if event["event"] == "report" and cache_key:
+                    self._store_report(cache_key, event["report"])
+                yield event
+        finally:
+            metrics.CONTRACTS_IN_FLIGHT.dec()
+
+    def has_cached_report(self, source, content_hash=None, budget=None) -> bool:
+        """True if process_contract would replay this file from the report cache."""
+        cache_key = self._report_cache_key(source, content_hash, budget or ClauseBudget.from_env())
+        return cache_key is not None and self.report_cache.get(cache_key) is not None
+
+    def prepare_contract(self, source, filename=None):
+        """
+        The local, LLM-free stages that dominate CPU time: parsing and NER. Returns a picklable
+        dict for process_contract(prepared=...). Text with Devanagari is only parsed, since NER
+        must run on its translation.
+        """
+        timings, parse_stats = {}, {}
+        started = time.perf_counter()
+        text = "".join(self.parser.iter_text(source, filename, parse_stats))
+        timings["parse"] = time.perf_counter() - started
+        prepared = {"text": text, "timings": timings, "parse_stats": parse_stats or None}
+        if not contains_devanagari(text):
+            started = time.perf_counter()
+            prepared["entities"] = self.nlp.extract_entity_mentions(text)
+            timings["ner"] = time.perf_counter() - started
+        return prepared
+
+    def _parse_and_segment(self, source, filename, req):
+        """
+        Extracts the text and segments it in one pass: the segmenter reads each PDF page as
+        soon as it is parsed, so only the last page's segmentation waits for the parser.
+        Returns (text, spans); the parser's page stats go to req.parse_stats.
+        """
+        stats, pieces = {}, []
+
+        def pages():
+            for piece in self.parser.iter_text(source, filename, stats):
+                pieces.append(piece)
+                yield piece
+        spans = self.nlp.segment_clause_spans(pages())
+        req.parse_stats = stats or None
+        return "".join(pieces), spans
+
+    def _report_cache_key(self, source, content_hash, budget):
+        if self.report_cache is None:
+            return None
+        if content_hash is None:
+            try:
+                from .uploads import content_sha256
+                content_hash = content_sha256(source)
+            except OSError:
+                return None
+        return self.report_cache.make_key(
+            self.llm.provider, self.llm.model, f"report:{PIPELINE_VERSION}",
+            json.dumps(self._prompt_versions(), sort_keys=True), self.batch_clauses,
+            json.dumps(budget.to_dict(), sort_keys=True), self._rules_version(), content_hash
+        )
+
+    def _rules_version(self):
+        rules = self.rules
+        return f"{rules.version}:{rules.min_confidence}" if rules is not None else "off"
+
+    @staticmethod
+    def _prompt_versions():
+        from .llm_engine import PROMPT_VERSIONS
+        return PROMPT_VERSIONS
+
+    def _store_report(self, cache_key, report):
+        """Caches a report only if it is live provider output without errors anywhere."""
+        if not self.llm.is_live() or "error" in (report.get("summary") or {}):
+            return
+        if any("error" in (item.get("analysis") or {}) for item in report.get("clause_analysis", [])):
+            return
+        try:
+            self.report_cache.set(cache_key, report)
+        except Exception as e:
+            print(f"Report Cache Error: {str(e)}")
+
+    def _replay_report(self, cached, filename, progress):
+        """Re-emits a cached report's events under a new report id (and audits it as a new analysis)."""
+        started = time.perf_counter()
+        progress("cached")
+        report = dict(cached)
+        report.update({
+            "report_id": uuid.uuid4().hex,
+            "timestamp": datetime.now().isoformat(),
+            "filename": filename,
+            "cached_from": cached.get("report_id"),
+            "llm_usage": {"calls": 0, "cache_hits": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0}
+        })
+        yield {
+            "event": "metadata",
+            "filename": report["filename"],
+            "contract_type": report.get("contract_type"),
+            "contract_type_candidates": report.get("contract_type_candidates", []),
+            "entities": report.get("entities", {}),
+            "language": report.get("language"),
+            "clauses_total": len(report.get("clause_analysis", [])),
+            "clauses_skipped": len(report.get("skipped_clauses", [])),
+            "cached_from": report["cached_from"]
+        }
+        yield {"event": "summary", "summary": report.get("summary", {})}
+        for idx, item in enumerate(report.get("clause_analysis", [])):
+            yield {"event": "clause", "index": idx, **item}
+        report["timings"] = {"total": round(time.perf_counter() - started, 4)}
+        self._log_audit(report)
+        metrics.CONTRACTS.inc(outcome="cached")
+        yield {"event": "report", "report": report}
+
+    def _contract_events(self, source, filename, progress, priority, budget, prepared=None, previous=None):
+        """The pipeline behind iter_contract_events, timed stage by stage."""
+        report_id = uuid.uuid4().hex
+        req = metrics.RequestMetrics(priority=priority)
+
+        # 1. Extraction (PDF pages are segmented as they arrive)
+        progress("parsing")
+        spans = None
+        if prepared is not None:
+            text = prepared["text"]
+            req.parse_stats = prepared.get("parse_stats")
+            for stage, seconds in prepared["timings"].items():
+                req.add_time(stage, seconds)
+        else:
+            with req.stage("parse"):
+                text, spans = self._parse_and_segment(source, filename, req)
         if "Error" in text or "Unsupported" in text:
-            return {"error": text}
-
-        # 2. Language Handling
-        # Preliminary check for Hindi characters
-        if any('\u0900' <= char <= '\u097F' for char in text):
-            translation_info = self.llm.detect_hindi_and_translate(text[:2000]) # Sample for detection
-            if translation_info.get("language") == "Hindi":
-                # For full processing, we'd translate the whole doc or process via LLM directly
-                # For now, we flag it and let the LLM handle the summary/analysis knowing it's Hindi
-                pass
-
-        # 3. Classification & Basic Entities
-        contract_type = self.nlp.classify_contract(text)
-        entities = self.nlp.extract_entities(text)
-        
-        # 4. Summary & Global Risk (LLM)
-        summary_data = self.llm.summarize_contract(text, contract_type)
-        
-        # 4. Clause Analysis (LLM - limited to top clauses for performance/cost)
-        clauses = self.nlp.segment_clauses(text)
-        
-        detailed_analysis = []
-        for clause in clauses[:15]: # Process top 15 meaningful clauses
-            analysis = self.llm.analyze_clause(clause, contract_type)
-            detailed_analysis.append({
-                "original_text": clause,
-                "analysis": analysis
-            })
+            req.finish(outcome="error")
+            yield {"event": "error", "error": text}
+            return
+
+        # 2. Language Handling (Hindi/mixed segments are translated; English passes through)
+        progress("language_check")
+        with req.stage("language_check"):
+            text, language_info = self._translate_hindi_segments(text, req)
+
+        # 3. Classification
+        progress("classifying")
+        with req.stage("classify"):
+            type_candidates = self.nlp.rank_contract_types(text)
+        contract_type = type_candidates[0]["label"]
+        # Segmentation of the parsed pages is redone only if translation changed the text
+        if spans is None or language_info.get("translated_chunks"):
+            with req.stage("segment"):
+                spans = self.nlp.segment_clause_spans(text)
+        clauses = [span.body(text).strip() for span in spans]
+        # Tier 1 runs on every clause first, so the ones the rules answer cost no LLM budget
+        with req.stage("rules"):
+            local = self._rule_answers(clauses, contract_type)
+
+        # Revision of an earlier report: every clause is aligned before the budget is applied, and
+        # unchanged clauses (and maybe the summary) carry over without counting against the budget
+        revision, known, summary = None, {}, None
+        if previous is not None:
+            with req.stage("revision_diff"):
+                revision, known, summary = self._plan_revision(previous, clauses, contract_type)
+        with req.stage("clause_selection"):
+            selection, skipped_clauses = self._select_clauses(spans, clauses, budget, local, known)
+        all_spans, all_clauses = spans, clauses
+        spans = [spans[i] for i in selection["indices"]]
+        clauses = [clauses[i] for i in selection["indices"]]
+        local = {n: local[i] for n, i in enumerate(selection["indices"]) if i in local}
+        known = {n: known[i] for n, i in enumerate(selection["indices"]) if i in known}
+        # Clauses carried over from the previous revision keep their analysis; the rules answer
+        # the rest where confident, and everything else escalates to the index and the LLM
+        known = {**{idx: (analysis, None) for idx, analysis in local.items()}, **known}
+
+        # 4. NER, Summary & Clause Analysis
+        progress("analyzing", clauses_done=0, clauses_total=len(clauses))
+        analysis_started = time.perf_counter()
+        entities = prepared.get("entities") if prepared is not None else None
+        if self.concurrent:
+            results = self._stream_concurrently(text, contract_type, clauses, req, entities, known, summary)
+        else:
+            results = self._stream_sequentially(text, contract_type, clauses, req, entities, known, summary)
+        masker = None
+
+        mentions, entities, summary_data, detailed_analysis = [], {}, {}, []
+        for kind, value in results:
+            if kind == "entities":
+                mentions = value
+                entities = group_entities(mentions)
+                masker = self._entity_masker(mentions)
+                yield {
+                    "event": "metadata",
+                    "filename": filename,
+                    "contract_type": contract_type,
+                    "contract_type_candidates": type_candidates,
+                    "entities": entities,
+                    "language": language_info,
+                    "clauses_total": len(clauses),
+                    "clauses_skipped": len(skipped_clauses)
+                }
+            elif kind == "summary":
+                summary_data = value
+                yield {"event": "summary", "summary": summary_data}
+            else:
+                analysis, reused_from = value
+                idx = len(detailed_analysis)
+                item = {
+                    "original_text": clauses[idx],
+                    "span": spans[idx].to_dict(),
+                    "prescore": selection["scores"][idx],
+                    "analysis": analysis
+                }
+                if revision is not None:
+                    item["revision"] = revision["status_by_clause"][selection["indices"][idx]]
+                if reused_from:
+                    item["reused_from"] = reused_from
+                elif analysis.get("source") != "rules":
+                    self._remember_clause(clauses[idx], contract_type, analysis, masker, {
+                        "report_id": report_id,
+                        "filename": filename,
+                        "clause": spans[idx].label
+                    })
+                detailed_analysis.append(item)
+                progress("analyzing", clauses_done=len(detailed_analysis), clauses_total=len(clauses))
+                yield {"event": "clause", "index": len(detailed_analysis) - 1, **item}
+
+        req.add_time("analysis_wall", time.perf_counter() - analysis_started)
 
         # 5. Audit Log
+        progress("auditing")
+        timings, llm_usage = req.finish()
         report = {
+            "report_id": report_id,
             "timestamp": datetime.now().isoformat(),
-            "filename": os.path.basename(file_path),
+            "filename": filename,
             "contract_type": contract_type,
+            "contract_type_candidates": type_candidates,
+            "language": language_info,
             "entities": entities,
+            "entity_mentions": mentions,
             "summary": summary_data,
-            "clause_analysis": detailed_analysis
+            "clause_analysis": detailed_analysis,
+            "skipped_clauses": skipped_clauses,
+            "clause_selection": selection["summary"],
+            "rule_engine": self._rule_summary(detailed_analysis),
+            "timings": timings,
+            "parse_stats": req.parse_stats,
+            "llm_usage": llm_usage
         }
-        
+        if revision is not None:
+            analyzed = {i: (n, item) for n, (i, item) in enumerate(zip(selection["indices"], detailed_analysis))}
+            report["revision"] = self._revision_delta(previous, all_spans, all_clauses, analyzed, revision)
+
+        # The audit write is timed after the record is built, so only the returned report shows it
+        audit_started = time.perf_counter()
         self._log_audit(report)
-        
-        return report
+        report["timings"]["audit"] = round(time.perf_counter() - audit_started, 4)
+        metrics.STAGE_SECONDS.observe(report["timings"]["audit"], stage="audit")
 
-    def _log_audit(self, report):
-        log_file = os.path.join(self.logs_dir, "audit_trail.json")
-        logs = []
-        if os.path.exists(log_file):
-            with open(log_file, 'r') as f:
+        yield {"event": "report", "report": report}
+
+    def _rule_answers(self, clauses, contract_type):
+        """
+        Tier 1: {clause index: analysis} for the clauses the rule packs answer with enough
+        confidence. Without an API key they answer every clause, since there is no LLM to
+        escalate to; the ones below the confidence threshold get the neutral answer (RuleEngine.answer).
+        """
+        rules = self.rules
+        if rules is None:
+            return {}
+        if not self.llm.is_live():
+            return {idx: rules.answer(clause, contract_type) for idx, clause in enumerate(clauses)}
+        answers = {}
+        for idx, clause in enumerate(clauses):
+            analysis = rules.analyze(clause, contract_type)
+            if rules.is_confident(analysis):
+                answers[idx] = analysis
+        return answers
+
+    def _rule_summary(self, detailed_analysis):
+        """Rule-engine block of the report: pack version and how many clauses it answered or escalated."""
+        rules = self.rules
+        if rules is None:
+            return {"enabled": False}
+        fresh = [item for item in detailed_analysis if "reused_from" not in item]
+        answered = sum(1 for item in fresh if (item.get("analysis") or {}).get("source") == "rules")
+        escalated = len(fresh) - answered
+        metrics.RULE_CLAUSES.inc(answered, outcome="answered")
+        metrics.RULE_CLAUSES.inc(escalated, outcome="escalated")
+        return {"enabled": True, "version": rules.version, "min_confidence": rules.min_confidence,
+                "answered": answered, "escalated": escalated}
+
+    def _select_clauses(self, spans, clauses, budget, local=None, carried=None):
+        """
+        Fills the budget with the riskiest clauses (see ClauseSelector); clauses in `local`
+        (answered by the rules) cost nothing, and clauses in `carried` (analyses carried over
+        from a previous revision) are always kept outside the budget. Returns (selection,
+        skipped): the chosen span indices in document order with their pre-scores and a report
+        summary, and one entry per clause left out (with its text, so a later revision can align it).
+        """
+        carried = set(carried or ())
+        cost = self._clause_cost_model(clauses, set(local or ()) | carried)
+        indices, skipped, scores, estimate = self.clause_selector.select(clauses, budget, cost, keep=carried)
+        selection = {
+            "indices": indices,
+            "scores": [scores[i] for i in indices],
+            "summary": {
+                "clauses_total": len(spans),
+                "clauses_selected": len(indices),
+                "clauses_carried_over": len(carried),
+                "budget": budget.to_dict(),
+                "estimated": estimate
+            }
+        }
+        return selection, [
+            {"span": spans[i].to_dict(), "prescore": score, "reason": reason, "preview": clauses[i][:200],
+             "original_text": clauses[i]}
+            for i, score, reason in skipped
+        ]
+
+    def _clause_cost_model(self, clauses, free=frozenset()):
+        """
+        cost(indices) for ClauseSelector.select: provider calls and tokens as the clause batches
+        would be planned, and wall seconds from the observed call latency and how many calls
+        run at once. Clauses in `free` are answered locally. Cache hits and reused clauses are
+        not known yet, so this is an upper bound.
+        """
+        call_seconds = self.llm.expected_call_seconds()
+        # The async engine starts every call at once (the scheduler paces them); threads run max_concurrency
+        parallel = None if self.async_llm else self.max_concurrency if self.concurrent else 1
+
+        def cost(indices):
+            chosen = [clauses[i] for i in indices if i not in free]
+            calls, tokens = self.llm.estimate_clause_usage(chosen, self._clause_batches(chosen))
+            rounds = math.ceil(calls / parallel) if parallel else min(calls, 1)
+            return {"llm_calls": calls, "tokens": tokens, "seconds": round(rounds * call_seconds, 3)}
+        return cost
+
+    def _translate_hindi_segments(self, text, req=None):
+        """
+        Tags each paragraph as English, Hindi or mixed by script ratio and translates only the
+        non-English spans (in parallel, cached by LLMEngine), splicing English back in place.
+        Offline there is no translation to splice: the text is only tagged and kept as is.
+        """
+        if not contains_devanagari(text):
+            return text, {"detected": "en"}
+
+        segments = detect_segments(text)
+        chunks = translation_chunks(segments, self.translate_chunk_chars, text)
+        sources = [text[start:end] for start, end in chunks]
+        info = {
+            "detected": document_language(segments),
+            "segments": len(segments),
+            "hindi_segments": sum(1 for seg in segments if seg.language != "en"),
+            "translated_chunks": 0,
+            "translated_chars": 0
+        }
+        if not self.llm.is_live():
+            return text, info
+
+        req = req or metrics.RequestMetrics()
+        translate = self.llm.detect_hindi_and_translate
+        if self.concurrent:
+            futures = [self._llm_future(req, translate, source) for source in sources]
+            translations = [self._translation_of(future.result, self.clause_timeout) for future in futures]
+        else:
+            translations = [self._translation_of(req.bind, translate, source) for source in sources]
+
+        parts, pos = [], 0
+        for (start, end), source, english in zip(chunks, sources, translations):
+            parts.append(text[pos:start])
+            parts.append(english or source)  # Keep the original if translation failed
+            if english:
+                info["translated_chunks"] += 1
+                info["translated_chars"] += len(source)
+            pos = end
+        parts.append(text[pos:])
+        return "".join(parts), info
+
+    @staticmethod
+    def _translation_of(call, *args):
+        try:
+            info = call(*args)
+        except Exception as e:
+            print(f"Translation Error: {str(e) or type(e).__name__}")
+            return None
+        return info.get("translated_text") if isinstance(info, dict) else None
+
+    def _clause_batches(self, clauses):
+        if self.batch_clauses:
+            return self.llm.plan_clause_batches(clauses)
+        return [[idx] for idx in range(len(clauses))]
+
+    def _analyze_batch(self, batch_clauses, contract_type):
+        if len(batch_clauses) == 1:
+            return [self.llm.analyze_clause(batch_clauses[0], contract_type)]
+        return self.llm.analyze_clause_batch(batch_clauses, contract_type)
+
+    async def _analyze_batch_async(self, batch_clauses, contract_type):
+        if len(batch_clauses) == 1:
+            return [await self.llm.analyze_clause(batch_clauses[0], contract_type)]
+        return await self.llm.analyze_clause_batch(batch_clauses, contract_type)
+
+    def _llm_future(self, req, fn, *args, stage=None, on_start=None):
+        """
+        Starts fn(*args), charged to req, and returns a concurrent.futures.Future. With the
+        async engine fn is a coroutine function run on the shared LLM event loop (no thread is
+        held while the provider answers); otherwise it runs on the thread pool.
+        `on_start` is called when the work actually begins; from then on its LLM calls have
+        clause_timeout seconds (see call_deadline), so a timed-out call also frees its worker.
+        """
+        from .llm_engine import call_deadline
+        if self.async_llm:
+            from .async_llm_engine import get_llm_loop
+
+            async def run():
+                if on_start:
+                    on_start()
+                with call_deadline(self.clause_timeout):
+                    return await req.bind_async(fn, *args, stage=stage)
+            return get_llm_loop().submit(run())
+
+        def run_sync():
+            if on_start:
+                on_start()
+            with call_deadline(self.clause_timeout):
+                return req.bind(fn, *args, stage=stage)
+        return self._executor.submit(run_sync)
+
+    @staticmethod
+    def _entity_masker(mentions):
+        from .clause_index import ClauseIndex
+        return ClauseIndex.entity_masker(mentions)
+
+    def _find_reusable(self, clauses, contract_type, entities, known=None):
+        """
+        Looks every clause up in the near-duplicate index. Returns {clause index: (analysis, reused_from)},
+        starting from `known` (e.g. clauses unchanged since the previous revision), which are not looked up.
+        """
+        reused = dict(known or {})
+        if self.clause_index is None:
+            return reused
+        masker = self._entity_masker(entities)
+        scope = self.llm.analysis_scope()
+        for idx, clause in enumerate(clauses):
+            if idx in reused:
+                continue
+            match = self.clause_index.lookup(clause, contract_type, masker, scope=scope)
+            if match:
+                analysis, score, source = match
+                reused[idx] = (analysis, {**source, "similarity": round(score, 3)})
+        return reused
+
+    def _plan_revision(self, previous, clauses, contract_type):
+        """
+        Aligns the clauses with the previous report's (see clause_diff.align_clauses). Returns
+        (revision, known, summary): the alignment, the analyses carried over for unchanged or
+        moved clauses, and the previous summary, or None when the change is material (more than
+        material_change of the clause text, or a different contract type) so it is recomputed.
+        """
+        from .clause_diff import align_clauses, changed_ratio
+        old_items = self._previous_clauses(previous)
+        old_clauses = [item.get("original_text", "") for item in old_items]
+        ops = align_clauses(old_clauses, clauses)
+
+        known, status_by_clause = {}, {}
+        for op in ops:
+            if op["new"] is None:
+                continue
+            status_by_clause[op["new"]] = op["status"]
+            old = old_items[op["old"]] if op["status"] in ("unchanged", "moved") else None
+            if old and isinstance(old.get("analysis"), dict) and "error" not in old["analysis"]:
+                known[op["new"]] = (old["analysis"], {
+                    "report_id": previous.get("report_id"),
+                    "filename": previous.get("filename"),
+                    "clause": (old.get("span") or {}).get("label"),
+                    "similarity": 1.0
+                })
+
+        ratio = changed_ratio(old_clauses, clauses, ops)
+        previous_summary = previous.get("summary") or {}
+        material = (ratio > self.material_change or contract_type != previous.get("contract_type")
+                    or not previous_summary or "error" in previous_summary)
+        revision = {"ops": ops, "status_by_clause": status_by_clause, "changed_ratio": ratio, "summary_recomputed": material}
+        return revision, known, None if material else previous_summary
+
+    @staticmethod
+    def _previous_clauses(previous):
+        """
+        The previous report's clauses in document order: the analyzed ones and the ones its
+        budget skipped (which have no analysis; reports before skipped clauses kept their text
+        only list the analyzed ones).
+        """
+        items = list(previous.get("clause_analysis", []))
+        items += [item for item in previous.get("skipped_clauses", []) if item.get("original_text")]
+        return sorted(items, key=lambda item: (item.get("span") or {}).get("start", 0))
+
+    def _revision_delta(self, previous, spans, clauses, analyzed, revision):
+        """
+        Redline-style delta against the previous report: every non-unchanged clause with its
+        risk before/after. `analyzed` maps clause index -> (report position, report item) for
+        the clauses analyzed now; a changed clause the budget skipped is marked "skipped" and has no risk after.
+        """
+        from .clause_diff import redline, risk_change
+        old_items = self._previous_clauses(previous)
+        counts = dict.fromkeys(("unchanged", "moved", "modified", "added", "removed"), 0)
+        changes = []
+        for op in revision["ops"]:
+            counts[op["status"]] += 1
+            if op["status"] == "unchanged":
+                continue
+            change = {"status": op["status"]}
+            if op["old"] is not None:
+                old = old_items[op["old"]]
+                change["previous_index"] = op["old"]
+                change["previous_clause"] = (old.get("span") or {}).get("label")
+                change["risk_before"] = (old.get("analysis") or {}).get("risk_level")
+            if op["new"] is not None:
+                position, new = analyzed.get(op["new"], (None, None))
+                change["clause"] = spans[op["new"]].label
+                if new is None:
+                    change["skipped"] = True
+                    change["risk_after"] = None
+                else:
+                    change["index"] = position
+                    change["risk_after"] = (new.get("analysis") or {}).get("risk_level")
+            if op["status"] == "modified":
+                change["similarity"] = op["similarity"]
+                change["risk_change"] = risk_change(change["risk_before"], change["risk_after"])
+                change["redline"] = redline(old_items[op["old"]].get("original_text", ""), clauses[op["new"]])
+            elif op["status"] == "removed":
+                change["text"] = old_items[op["old"]].get("original_text", "")
+            changes.append(change)
+        return {
+            "previous_report_id": previous.get("report_id"),
+            "changed_ratio": round(revision["changed_ratio"], 3),
+            "summary_recomputed": revision["summary_recomputed"],
+            "counts": counts,
+            "changes": changes
+        }
+
+    def _remember_clause(self, clause, contract_type, analysis, masker, source):
+        """Stores a fresh provider analysis for future reuse (never demo, rule or error output)."""
+        if self.clause_index is None or not self.llm.is_live():
+            return
+        if not isinstance(analysis, dict) or "error" in analysis:
+            return
+        try:
+            self.clause_index.add(clause, contract_type, analysis, source, masker, scope=self.llm.analysis_scope())
+        except Exception as e:
+            print(f"Clause Index Error: {str(e)}")
+
+    def _stream_sequentially(self, text, contract_type, clauses, req, entities=None, known=None, summary=None):
+        """
+        One call at a time (NER -> Summary -> Clause batches). NER is skipped if `entities` is
+        given, the summary call if `summary` is, and the clauses in `known` ({index: (analysis, reused_from)}).
+        """
+        if entities is None:
+            entities = req.bind(self.nlp.extract_entity_mentions, text, stage="ner")
+        yield "entities", entities
+        reused = req.bind(self._find_reusable, clauses, contract_type, entities, known, stage="clause_reuse")
+        if summary is None:
+            summary = req.bind(self.llm.summarize_contract, text, contract_type, self.nlp.segment_sections(text), stage="summary")
+        yield "summary", summary
+
+        todo = [i for i in range(len(clauses)) if i not in reused]
+        ready, next_idx = dict(reused), 0
+        for batch in [[]] + self._clause_batches([clauses[i] for i in todo]):
+            indices = [todo[b] for b in batch]
+            if indices:
+                analyses = req.bind(self._analyze_batch, [clauses[i] for i in indices], contract_type, stage="clause_llm")
+                for idx, analysis in zip(indices, analyses):
+                    ready[idx] = (analysis, None)
+            while next_idx in ready:
+                yield "clause", ready.pop(next_idx)
+                next_idx += 1
+
+    def _stream_concurrently(self, text, contract_type, clauses, req, entities=None, known=None, summary=None):
+        """
+        Overlaps NER, the summary call and every clause batch on the shared pool.
+        Yields entities, then the summary, then clause results in clause order as soon as
+        each is available; every call has its own timeout. `entities`, `summary` and `known`
+        skip work as in _stream_sequentially.
+        """
+        started = {}
+        analyze_batch = self._analyze_batch_async if self.async_llm else self._analyze_batch
+
+        def launch(key, stage, fn, *args):
+            return self._llm_future(req, fn, *args, stage=stage, on_start=lambda: started.__setitem__(key, time.monotonic()))
+
+        if entities is not None:
+            ner_future = Future()
+            ner_future.set_result(entities)
+        else:
+            # NER is CPU-bound local work, so keep it off the LLM pool
+            ner_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ner")
+            ner_future = ner_pool.submit(req.bind, self.nlp.extract_entity_mentions, text, stage="ner")
+            ner_pool.shutdown(wait=False)
+
+        pending = {}
+        if summary is None:
+            sections = self.nlp.segment_sections(text)
+            pending[launch("summary", "summary", self.llm.summarize_contract, text, contract_type, sections)] = "summary"
+
+        # Index lookups need the entities for masking; without the index, clauses start right away
+        entities, reused = None, dict(known or {})
+        if self.clause_index is not None:
+            entities = ner_future.result()
+            reused = req.bind(self._find_reusable, clauses, contract_type, entities, known, stage="clause_reuse")
+
+        todo = [i for i in range(len(clauses)) if i not in reused]
+        for batch in self._clause_batches([clauses[i] for i in todo]):
+            key = tuple(todo[b] for b in batch)
+            pending[launch(key, "clause_llm", analyze_batch, [clauses[i] for i in key], contract_type)] = key
+
+        yield "entities", entities if entities is not None else ner_future.result()
+
+        # Buffer out-of-order completions and release them in order
+        order = ["summary"] + list(range(len(clauses)))
+        ready = dict(reused)
+        if summary is not None:
+            ready["summary"] = summary
+        for key, result in self._iter_completed(pending, started):
+            if key == "summary":
+                ready[key] = result
+            else:
+                # A failed/timed-out batch reports the same error for each of its clauses
+                results = result if isinstance(result, list) else [result] * len(key)
+                ready.update((idx, (analysis, None)) for idx, analysis in zip(key, results))
+            while order and order[0] in ready:
+                key = order.pop(0)
+                yield ("summary" if key == "summary" else "clause"), ready.pop(key)
+        # Everything left was reused (or is the carried-over summary)
+        for key in order:
+            yield ("summary" if key == "summary" else "clause"), ready.pop(key)
+
+    def _iter_completed(self, pending, started):
+        """
+        Yields (key, result) as futures finish, timing each one out individually from the
+        moment it started running. Queued work only starts its clock once a worker picks it up.
+        A running call cannot be cancelled; its own call_deadline ends it and frees the worker.
+        """
+        pending = dict(pending)
+        while pending:
+            done, _ = wait(list(pending), timeout=0.5, return_when=FIRST_COMPLETED)
+            for future in done:
+                key = pending.pop(future)
                 try:
-                    logs = json.load(f)
-                except:
-                    logs = []
-        
-        logs.append(report)
-        with open(log_file, 'w') as f:
-            json.dump(logs, f, indent=4)
+                    result = future.result()
+                except Exception as e:
+                    print(f"Analysis Error ({key}): {str(e)}")
+                    result = {"error": f"Analysis failed: {str(e)}"}
+                yield key, result
+
+            now = time.monotonic()
+            for future, key in list(pending.items()):
+                start = started.get(key)
+                if start is not None and now - start > self.clause_timeout:
+                    future.cancel()
+                    pending.pop(future)
+                    yield key, {"error": f"Analysis timed out after {self.clause_timeout:.0f}s", "retryable": True}
+
+    def _log_audit(self, report):
+        self.audit.append(report)
@@ -1,50 +1,194 @@
 import pdfplumber
 import docx
+import io
 import os
+import time
+from collections import namedtuple
+from concurrent.futures.process import BrokenProcessPool
+from .process_pool import discard_process_pool, get_process_pool
+
+# One extracted PDF page: 1-based page number, its text and how long extraction took
+PageText = namedtuple("PageText", ["number", "text", "seconds"])
+
+
+def _is_path(source):
+    return isinstance(source, (str, os.PathLike))
+
+
+def _open_input(source):
+    """
+    What pdfplumber / python-docx can open: a path as is, an in-memory buffer wrapped in
+    BytesIO (which shares a bytes object rather than copying it), a binary file rewound.
+    """
+    if _is_path(source):
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    source.seek(0)
+    return source
+
+
+def _picklable_input(source):
+    """A path or bytes to hand to process pool workers (file objects cannot be pickled)."""
+    if _is_path(source) or isinstance(source, bytes):
+        return source
+    if isinstance(source, (bytearray, memoryview)):
+        return bytes(source)
+    source.seek(0)
+    return source.read()
+
+
+def _extract_page_range(source, start, end):
+    """Extracts pages [start, end) of a PDF. Module-level so process pool workers can pickle it."""
+    pages = []
+    with pdfplumber.open(_open_input(source)) as pdf:
+        for n in range(start, end):
+            t0 = time.perf_counter()
+            page = pdf.pages[n]
+            text = page.extract_text() or ""  # Image-only pages return None
+            page.flush_cache()
+            pages.append(PageText(n + 1, text, time.perf_counter() - t0))
+    return pages
+
 
 class ContractParser:
     """
     Handles extraction of text from various file formats (PDF, DOCX, TXT).
+    A source is a file path, bytes / bytearray / memoryview, or a seekable binary file object
+    (e.g. an upload's spooled buffer), so uploads can be parsed without writing them to disk.
     """
-    
+    def __init__(self, workers=None, pages_per_task=None, parallel_min_pages=None):
+        # Large PDFs are split into page ranges and extracted across a process pool
+        self.workers = workers or int(os.getenv("PDF_WORKERS", str(os.cpu_count() or 1)))
+        self.pages_per_task = pages_per_task or int(os.getenv("PDF_PAGES_PER_TASK", "8"))
+        self.parallel_min_pages = parallel_min_pages or int(os.getenv("PDF_PARALLEL_MIN_PAGES", "24"))
+
     @staticmethod
-    def parse_pdf(file_path):
+    def parse_pdf(source):
         """Extracts text from a PDF file using pdfplumber."""
-        text = ""
         try:
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    text += page.extract_text() + "\n"
+            with pdfplumber.open(_open_input(source)) as pdf:
+                pages = [page.extract_text() or "" for page in pdf.pages]  # Image-only pages return None
+            return "\n".join(pages) + "\n"
         except Exception as e:
-            text = f"Error parsing PDF: {str(e)}"
-        return text
+            return f"Error parsing PDF: {str(e)}"
+
+    def iter_pdf_pages(self, source, workers=None):
+        """
+        Yields PageText for each page, in page order, as soon as it (and every page before it)
+        is extracted. Documents with at least `parallel_min_pages` pages are spread across the
+        shared "pdf" process pool in ranges of `pages_per_task` pages (in-memory sources are
+        sent as bytes). If the pool breaks, the remaining pages are extracted in-process.
+        """
+        workers = workers or self.workers
+        with pdfplumber.open(_open_input(source)) as pdf:
+            page_count = len(pdf.pages)
+
+        if workers <= 1 or page_count < self.parallel_min_pages:
+            yield from _extract_page_range(source, 0, page_count)
+            return
+
+        source = _picklable_input(source)
+        ranges = [(start, min(start + self.pages_per_task, page_count))
+                  for start in range(0, page_count, self.pages_per_task)]
+        pool = get_process_pool("pdf", workers)
+        futures = []
+        try:
+            futures = [pool.submit(_extract_page_range, source, start, end) for start, end in ranges]
+            for n, future in enumerate(futures):
+                try:
+                    pages = future.result()
+                except BrokenProcessPool as e:
+                    print(f"PDF Pool Error: {str(e) or type(e).__name__}")
+                    discard_process_pool("pdf", pool)
+                    for start, end in ranges[n:]:
+                        yield from _extract_page_range(source, start, end)
+                    return
+                yield from pages
+        finally:
+            # The pool is shared: only this document's unstarted ranges are dropped
+            for future in futures:
+                future.cancel()
+
+    def iter_pdf_text(self, source, stats=None):
+        """
+        Yields each page's text (with its line break) as soon as it is extracted, so callers
+        can segment while later pages are still being parsed. `stats`, if given, is filled
+        with the page count, total wall time and per-page extraction seconds.
+        """
+        t0 = time.perf_counter()
+        page_seconds = []
+        for page in self.iter_pdf_pages(source):
+            page_seconds.append(round(page.seconds, 4))
+            yield page.text + "\n"
+        if stats is not None:
+            stats.update({
+                "format": "pdf",
+                "pages": len(page_seconds),
+                "seconds": round(time.perf_counter() - t0, 4),
+                "page_seconds": page_seconds,
+            })
+
+    def parse_pdf_with_stats(self, source):
+        """
+        Parallel PDF extraction. Returns (text, stats) where stats holds the page count,
+        total wall time and per-page extraction seconds.
+        """
+        stats = {}
+        text = "".join(self.iter_pdf_text(source, stats))
+        return text, stats
 
     @staticmethod
-    def parse_docx(file_path):
+    def parse_docx(source):
         """Extracts text from a DOCX file."""
         try:
-            doc = docx.Document(file_path)
+            doc = docx.Document(_open_input(source))
             return "\n".join([para.text for para in doc.paragraphs])
         except Exception as e:
             return f"Error parsing DOCX: {str(e)}"
 
     @staticmethod
-    def parse_txt(file_path):
+    def parse_txt(source):
         """Read text from a plain text file."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read()
+            if _is_path(source):
+                with open(source, 'r', encoding='utf-8') as f:
+                    return f.read()
+            if not isinstance(source, (bytes, bytearray, memoryview)):
+                source.seek(0)
+                source = source.read()
+            return str(source, 'utf-8')
         except Exception as e:
             return f"Error parsing TXT: {str(e)}"
 
-    def get_text(self, file_path):
-        """Determines file type and extracts text."""
-        ext = os.path.splitext(file_path)[1].lower()
+    def get_text(self, source, filename=None):
+        """
+        Determines file type and extracts text. The type comes from `filename` if given,
+        else from the source path (so in-memory sources need a filename).
+        """
+        return "".join(self.iter_text(source, filename))
+
+    def iter_text(self, source, filename=None, stats=None):
+        """
+        get_text in pieces: one per PDF page as soon as it is extracted (the whole text for
+        other formats). `stats` is filled as in iter_pdf_text for PDFs. A PDF that fails
+        part-way yields an "Error parsing PDF" piece; callers check the joined text as for get_text.
+        """
+        name = filename or (os.fspath(source) if _is_path(source) else "")
+        ext = os.path.splitext(name)[1].lower()
         if ext == '.pdf':
-            return self.parse_pdf(file_path)
-        elif ext == '.docx':
-            return self.parse_docx(file_path)
+            try:
+                yield from self.iter_pdf_text(source, stats)
+            except Exception as e:
+                yield f"Error parsing PDF: {str(e)}"
+        else:
+            yield self._parse_other(source, ext)
+
+    def _parse_other(self, source, ext):
+        if ext == '.docx':
+            return self.parse_docx(source)
         elif ext == '.txt':
-            return self.parse_txt(file_path)
+            return self.parse_txt(source)
         else:
             return "Unsupported file format."
+
@@ -0,0 +1,40 @@
+import re
+
+
+def _trie_pattern(trie):
+    """Renders a character trie as a regex with shared prefixes, e.g. emp(?:loye(?:e|r)|loyment)."""
+    if "" in trie and len(trie) == 1:
+        return ""
+    branches = []
+    optional = False
+    for ch in sorted(trie):
+        if ch == "":
+            optional = True
+            continue
+        token = r"\s+" if ch == " " else re.escape(ch)  # Phrases match across line breaks
+        branches.append(token + _trie_pattern(trie[ch]))
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if optional:
+        body = "(?:" + body + ")?"
+    return body
+
+
+def compile_phrases(phrases, flags=re.IGNORECASE):
+    """
+    Compiles keyword phrases into one regex whose alternation is a prefix trie, so the
+    regex engine walks all patterns in a single left-to-right pass (an automaton over the
+    phrase set) instead of retrying each phrase separately. Matches are whole words only.
+    Map a match back to its phrase with `phrase_of(match)`.
+    """
+    trie = {}
+    for phrase in sorted({p.lower() for p in phrases if p}):
+        node = trie
+        for ch in phrase:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+    return re.compile(r"(?<!\w)" + _trie_pattern(trie) + r"(?!\w)", flags)
+
+
+def phrase_of(match) -> str:
+    """Canonical (lowercase, single-spaced) phrase for a match from compile_phrases."""
+    return " ".join(match.group(0).lower().split())
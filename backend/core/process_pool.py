@@ -0,0 +1,58 @@
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+_pools = {}  # name -> (pool, max_workers)
+_lock = threading.Lock()
+
+
+def start_method():
+    """
+    How pool workers are started: PROCESS_POOL_START_METHOD, else forkserver where the
+    platform has it, else spawn. Never fork: the API process runs uvicorn, job-manager and
+    LLM event-loop threads, and a forked child can inherit a lock one of them held and hang.
+    """
+    method = os.getenv("PROCESS_POOL_START_METHOD")
+    if method:
+        return method
+    return "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def get_process_pool(name, max_workers, initializer=None, initargs=()):
+    """
+    The process-wide pool called `name`, created on first use and then shared by every
+    caller, so workers (and whatever `initializer` builds in them) outlive a single request.
+    Asking for a different `max_workers`, or a pool whose worker died (BrokenProcessPool),
+    replaces it.
+    """
+    with _lock:
+        entry = _pools.get(name)
+        if entry is not None and entry[1] == max_workers and not getattr(entry[0], "_broken", False):
+            return entry[0]
+        if entry is not None:
+            entry[0].shutdown(wait=False, cancel_futures=True)
+        pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context(start_method()),
+                                   initializer=initializer, initargs=initargs)
+        _pools[name] = (pool, max_workers)
+        return pool
+
+
+def discard_process_pool(name, pool=None):
+    """Drops the pool called `name` (e.g. after BrokenProcessPool); the next get_process_pool starts a new one."""
+    with _lock:
+        entry = _pools.get(name)
+        if entry is None or (pool is not None and entry[0] is not pool):
+            return
+        del _pools[name]
+    entry[0].shutdown(wait=False, cancel_futures=True)
+
+
+@atexit.register
+def shutdown_process_pools():
+    with _lock:
+        pools = [pool for pool, _ in _pools.values()]
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,225 @@
+import glob
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+from collections import defaultdict
+from .patterns import compile_phrases, phrase_of
+
+RULE_KEYS = ("id", "category", "risk_level", "patterns", "explanation", "risk_reason", "suggestion")
+RISK_ORDER = {"Low": 0, "Medium": 1, "High": 2}
+
+# Packs shipped with the backend: backend/rules/*.json
+DEFAULT_RULES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "rules")
+
+# Words that negate or waive a trigger phrase when they come shortly before it, in the same clause part
+NEGATIONS = {"not", "no", "never", "neither", "nor", "without", "waive", "waives", "waived", "waiver",
+             "exempt", "exempted", "cannot"}
+NEGATION_WINDOW = 4
+# Set phrases with a negation word that do not negate what follows ("including but not limited to ...")
+_NEGATION_IDIOMS = re.compile(r"\b(?:not|no) (?:limited to|later than|less than|more than|earlier than)\b"
+                              r"|\bwithout (?:limitation|prejudice)\b", re.IGNORECASE)
+_CLAUSE_PART = re.compile(r"[,;:.()]")
+_WORD = re.compile(r"[a-z']+")
+
+# Answer for a clause no rule matches
+FALLBACK = {
+    "id": "fallback/general",
+    "explanation": "This clause covers general administrative or standard operating procedures of the agreement.",
+    "risk_level": "Low",
+    "risk_reason": "No known risk pattern was found; it reads like standard boilerplate language.",
+    "suggestion": "Verify that the governing law is set to your local jurisdiction (e.g., Delhi or Mumbai).",
+    "category": "General Provisions"
+}
+
+# Offline answer for a clause the rules match without enough confidence; it keeps the best rule's category
+UNCERTAIN = {
+    "id": "fallback/uncertain",
+    "explanation": "This clause matches more than one known pattern, or only weakly, so it could not be classified without the AI review.",
+    "risk_level": "Medium",
+    "risk_reason": "The local rules found weak or conflicting evidence; the risk depends on wording they cannot judge.",
+    "suggestion": "Review this clause manually, or run the analysis with an API key configured."
+}
+
+
+class Rule:
+    """One rule of a pack: weighted trigger phrases and the analysis it stands for."""
+    __slots__ = ("id", "category", "risk_level", "patterns", "explanation", "risk_reason", "suggestion", "contract_types",
+                 "negatable")
+
+    def __init__(self, spec, pack, contract_types):
+        missing = [key for key in RULE_KEYS if key not in spec]
+        if missing:
+            raise ValueError(f"Rule {spec.get('id', '?')} is missing {', '.join(missing)}")
+        if spec["risk_level"] not in RISK_ORDER:
+            raise ValueError(f"Rule {spec['id']} has unknown risk level {spec['risk_level']!r}")
+        self.id = f"{pack}/{spec['id']}"
+        self.category = spec["category"]
+        self.risk_level = spec["risk_level"]
+        self.patterns = {" ".join(p.lower().split()): float(w) for p, w in spec["patterns"].items()}
+        self.explanation = spec["explanation"]
+        self.risk_reason = spec["risk_reason"]
+        self.suggestion = spec["suggestion"]
+        self.contract_types = contract_types
+        # False for rules about prohibitions ("shall not assign"), where a negation is the usual wording
+        self.negatable = bool(spec.get("negatable", True))
+
+    def applies_to(self, contract_type):
+        return self.contract_types is None or contract_type in self.contract_types
+
+
+class RuleEngine:
+    """
+    Tier-1 clause analyzer built from rule packs (JSON files with a list of rules, each a
+    category, risk level, weighted trigger phrases and advice; see backend/rules/). All
+    phrases of all packs are compiled into one trie-shaped regex and found in a single pass.
+    Each rule scores sum(weight * log(1 + occurrences)), with occurrences in the clause
+    heading (its first line, up to `heading_chars`) counted `heading_boost` times. The best
+    rule answers the clause with a confidence of
+        (1 - exp(-best / evidence_scale)) * best / (sum of the best scores per matching category and risk level)
+    so a clause with weak evidence, or evidence for conflicting verdicts, is left to the LLM.
+    Unless the rule sets "negatable": false, occurrences negated by a word in NEGATIONS among
+    the NEGATION_WINDOW words before them ("shall not be required to indemnify", "waives any
+    indemnity") scale the confidence down by their share of the rule's evidence, so a
+    negated clause goes to the LLM.
+    """
+    def __init__(self, paths=None, min_confidence=None, heading_chars=80, heading_boost=2.0, evidence_scale=2.0):
+        if paths is None:
+            extra = [p for p in os.getenv("RULE_PACKS_DIRS", "").split(os.pathsep) if p]
+            paths = [DEFAULT_RULES_DIR] + extra
+        self.min_confidence = min_confidence if min_confidence is not None else float(os.getenv("RULES_MIN_CONFIDENCE", "0.7"))
+        self.heading_chars = heading_chars
+        self.heading_boost = heading_boost
+        self.evidence_scale = evidence_scale
+        self.rules = []
+        self.packs = []
+        digest = hashlib.sha256()
+        for path in self._pack_files(paths):
+            try:
+                with open(path, "rb") as f:
+                    raw = f.read()
+                self._load_pack(json.loads(raw), os.path.splitext(os.path.basename(path))[0])
+                digest.update(raw)
+            except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+                print(f"Rule Pack Error ({path}): {str(e)}")
+        # Changes whenever a pack changes, so cached reports built with other rules are not reused
+        self.version = digest.hexdigest()[:16]
+
+        # phrase -> [(rule, weight)]; one phrase may trigger several rules
+        self._phrase_rules = defaultdict(list)
+        for rule in self.rules:
+            for phrase, weight in rule.patterns.items():
+                self._phrase_rules[phrase].append((rule, weight))
+        self._matcher = compile_phrases(self._phrase_rules) if self._phrase_rules else None
+
+    @staticmethod
+    def _pack_files(paths):
+        files = []
+        for path in paths:
+            files.extend(sorted(glob.glob(os.path.join(path, "*.json"))) if os.path.isdir(path) else [path])
+        return files
+
+    def _load_pack(self, data, default_name):
+        name = data.get("name", default_name)
+        contract_types = data.get("contract_types")
+        contract_types = set(contract_types) if contract_types else None
+        rules = [Rule(spec, name, contract_types) for spec in data["rules"]]
+        self.rules.extend(rules)
+        self.packs.append({"name": name, "version": str(data.get("version", "")), "rules": len(rules)})
+
+    def _heading_end(self, clause):
+        newline = clause.find("\n")
+        return min(self.heading_chars, newline if newline > 0 else len(clause))
+
+    def analyze(self, clause: str, contract_type: str = None):
+        """
+        Returns the best rule's analysis (the LLM's clause-analysis keys) plus "source": "rules",
+        "rule_id" and "confidence" (0-1). Clauses no rule matches get the FALLBACK answer at confidence 0.
+        """
+        heading_end = self._heading_end(clause)
+        counts, negated = defaultdict(float), defaultdict(float)
+        for m in self._matcher.finditer(clause) if self._matcher else ():
+            weight = self.heading_boost if m.start() < heading_end else 1.0
+            counts[phrase_of(m)] += weight
+            if self._is_negated(clause, m.start()):
+                negated[phrase_of(m)] += weight
+
+        scores = defaultdict(float)
+        for phrase, count in counts.items():
+            for rule, weight in self._phrase_rules[phrase]:
+                if rule.applies_to(contract_type):
+                    scores[rule] += weight * math.log1p(count)
+
+        # Competing evidence counts once per (category, risk level): rules that agree do not dilute each other
+        by_verdict = defaultdict(float)
+        for rule, score in scores.items():
+            key = (rule.category, rule.risk_level)
+            by_verdict[key] = max(by_verdict[key], score)
+        ranked = sorted(((s, RISK_ORDER[r.risk_level], r) for r, s in scores.items() if s > 0),
+                        key=lambda entry: entry[:2], reverse=True)
+        if not ranked:
+            return self._answer(FALLBACK, FALLBACK["id"], 0.0)
+
+        best, _, rule = ranked[0]
+        confidence = (1 - math.exp(-best / self.evidence_scale)) * best / sum(by_verdict.values())
+        if rule.negatable and negated:
+            evidence = sum(w * counts[p] for p, w in rule.patterns.items() if p in counts)
+            confidence *= 1 - sum(w * negated[p] for p, w in rule.patterns.items() if p in negated) / evidence
+        return self._answer({
+            "explanation": rule.explanation,
+            "risk_level": rule.risk_level,
+            "risk_reason": rule.risk_reason,
+            "suggestion": rule.suggestion,
+            "category": rule.category
+        }, rule.id, confidence)
+
+    @staticmethod
+    def _is_negated(clause, start):
+        """True when a negation word is among the few words before `start` in the same clause part."""
+        part = _CLAUSE_PART.split(clause[max(0, start - 80):start])[-1]
+        words = _WORD.findall(_NEGATION_IDIOMS.sub(" ", part.lower()))
+        return any(w in NEGATIONS or w.endswith("n't") for w in words[-NEGATION_WINDOW:])
+
+    @staticmethod
+    def _answer(fields, rule_id, confidence):
+        return {
+            "explanation": fields["explanation"],
+            "risk_level": fields["risk_level"],
+            "risk_reason": fields["risk_reason"],
+            "suggestion": fields["suggestion"],
+            "category": fields["category"],
+            "source": "rules",
+            "rule_id": rule_id,
+            "confidence": round(confidence, 3)
+        }
+
+    def is_confident(self, analysis) -> bool:
+        return analysis.get("confidence", 0.0) >= self.min_confidence
+
+    def answer(self, clause: str, contract_type: str = None):
+        """
+        analyze() for when there is no LLM to escalate to: an answer below min_confidence is
+        replaced by the neutral UNCERTAIN answer (with the best rule's category and the confidence).
+        """
+        analysis = self.analyze(clause, contract_type)
+        if self.is_confident(analysis) or analysis["rule_id"] == FALLBACK["id"]:
+            return analysis
+        return self._answer({**UNCERTAIN, "category": analysis["category"]}, UNCERTAIN["id"], analysis["confidence"])
+
+    def stats(self):
+        return {"version": self.version, "packs": list(self.packs), "rules": len(self.rules), "min_confidence": self.min_confidence}
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_rule_engine() -> RuleEngine:
+    """The process-wide RuleEngine over the default packs (and RULE_PACKS_DIRS), built on first use."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = RuleEngine()
+        return _engine
@@ -0,0 +1,240 @@
+import asyncio
+import os
+import threading
+import time
+from . import metrics
+
+# Lower value is served first
+PRIORITIES = {"interactive": 0, "batch": 1}
+
+# Per-provider defaults; override with LLM_RPM_<PROVIDER> / LLM_TPM_<PROVIDER>
+DEFAULT_LIMITS = {
+    "openai": (500, 300000),
+    "anthropic": (50, 40000),
+}
+
+QUEUE_DEPTH = metrics.Gauge("llm_scheduler_queued", "LLM calls waiting for rate-limit budget.", ["provider", "priority"])
+WAIT_SECONDS = metrics.Histogram("llm_scheduler_wait_seconds", "Time LLM calls spent queued in the scheduler.", ["provider", "priority"])
+
+
+class SchedulerBusyError(Exception):
+    """Raised when too many interactive LLM calls are already waiting, or one waited longer than allowed."""
+
+
+class TokenBucket:
+    """Refills `per_minute` units evenly over a minute, holding at most one minute's worth."""
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.level = self.capacity
+        self.rate = self.capacity / 60.0
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount, now):
+        """Seconds until `amount` units are available (0 if they are now)."""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount):
+        self.level -= min(amount, self.capacity)
+
+    def give_back(self, amount):
+        self.level = min(self.capacity, self.level + amount)
+
+
+class _Waiter:
+    __slots__ = ("priority", "tag", "seq", "tokens")
+
+    def __init__(self, priority, tag, seq, tokens):
+        self.priority = priority
+        self.tag = tag
+        self.seq = seq
+        self.tokens = tokens
+
+    def key(self):
+        return self.priority, self.tag, self.seq
+
+
+class LLMScheduler:
+    """
+    Process-wide admission control for one provider's LLM calls. Each call waits for both a
+    request (RPM) and an estimated-token (TPM) budget. Waiting calls are served strictly by
+    priority (interactive before batch) and, within a priority, by start-time fair queuing
+    across jobs: every job gets an equal share of tokens however many calls it has queued.
+    A 429 from the provider pauses admissions for its retry-after period.
+    Interactive calls are turned away (SchedulerBusyError) when `max_queue` interactive calls
+    are waiting or after `max_wait` seconds. Batch calls never time out: once `max_queue`
+    batch calls are waiting, new ones block until there is room (backpressure on the job).
+    """
+    def __init__(self, provider, rpm=None, tpm=None, max_queue=None, max_wait=None):
+        default_rpm, default_tpm = DEFAULT_LIMITS.get(provider, (60, 60000))
+        self.provider = provider
+        self.rpm = rpm or int(os.getenv(f"LLM_RPM_{provider.upper()}", str(default_rpm)))
+        self.tpm = tpm or int(os.getenv(f"LLM_TPM_{provider.upper()}", str(default_tpm)))
+        self.max_queue = max_queue or int(os.getenv("LLM_SCHEDULER_MAX_QUEUE", "200"))
+        self.max_wait = max_wait or float(os.getenv("LLM_SCHEDULER_MAX_WAIT", "120"))
+
+        self._requests = TokenBucket(self.rpm)
+        self._tokens = TokenBucket(self.tpm)
+        self._cond = threading.Condition()
+        self._waiting = []
+        self._queued = dict.fromkeys(PRIORITIES, 0)  # priority -> calls waiting
+        self._seq = 0
+        self._virtual_time = 0.0
+        self._finish_tags = {}  # job -> finish tag of its last queued call
+        self._paused_until = 0.0
+
+    def saturated(self) -> bool:
+        """True when new interactive work should be turned away (its queue is full or the provider asked us to back off)."""
+        with self._cond:
+            return self._queued["interactive"] >= self.max_queue or time.monotonic() < self._paused_until
+
+    def queued(self) -> int:
+        with self._cond:
+            return len(self._waiting)
+
+    def backlog_seconds(self) -> float:
+        """Seconds the RPM/TPM budgets need to admit every call now waiting (plus any 429 pause)."""
+        with self._cond:
+            tokens = sum(w.tokens for w in self._waiting)
+            pause = max(0.0, self._paused_until - time.monotonic())
+            return pause + 60.0 * max(len(self._waiting) / self.rpm, tokens / self.tpm)
+
+    def acquire(self, tokens, priority="interactive", job=None):
+        """
+        Blocks until the call may be sent. `tokens` is the estimated prompt + completion size
+        and `job` groups the calls of one contract for fair sharing.
+        Raises SchedulerBusyError for an interactive call if the queue is full or the wait
+        exceeds max_wait; a batch call waits for room in the queue and then for its budget.
+        """
+        start = time.monotonic()
+        with self._cond:
+            while not self._has_room(priority):
+                self._cond.wait()
+            waiter = self._enqueue(tokens, priority, job)
+            try:
+                while True:
+                    delay = self._try_admit(waiter, start)
+                    if delay == 0:
+                        break
+                    self._cond.wait(delay)
+            finally:
+                self._dequeue(waiter, priority)
+        WAIT_SECONDS.observe(time.monotonic() - start, provider=self.provider, priority=priority)
+
+    async def acquire_async(self, tokens, priority="interactive", job=None, poll=0.05):
+        """
+        acquire() for coroutines: waits with asyncio.sleep instead of blocking a thread.
+        Async waiters are not woken by notify, so they re-check at least every `poll` seconds.
+        """
+        start = time.monotonic()
+        while True:
+            with self._cond:
+                if self._has_room(priority):
+                    waiter = self._enqueue(tokens, priority, job)
+                    break
+            await asyncio.sleep(poll)
+        try:
+            while True:
+                with self._cond:
+                    delay = self._try_admit(waiter, start)
+                if delay == 0:
+                    break
+                await asyncio.sleep(poll if delay is None else min(delay, poll))
+        finally:
+            with self._cond:
+                self._dequeue(waiter, priority)
+        WAIT_SECONDS.observe(time.monotonic() - start, provider=self.provider, priority=priority)
+
+    def _has_room(self, priority):
+        """
+        Whether a call of `priority` may join the queue now. A full interactive queue raises
+        SchedulerBusyError; a full batch queue returns False so the caller waits. Call with the lock held.
+        """
+        if self._queued.get(priority, 0) < self.max_queue:
+            return True
+        if priority != "batch":
+            raise SchedulerBusyError(f"{self.provider} LLM queue is full ({self.max_queue} calls waiting)")
+        return False
+
+    def _enqueue(self, tokens, priority, job):
+        job_key = job if job is not None else object()
+        start_tag = max(self._virtual_time, self._finish_tags.get(job_key, 0.0))
+        self._finish_tags[job_key] = start_tag + tokens
+        self._seq += 1
+        waiter = _Waiter(PRIORITIES.get(priority, 0), start_tag, self._seq, tokens)
+        self._waiting.append(waiter)
+        self._queued[priority] = self._queued.get(priority, 0) + 1
+        QUEUE_DEPTH.inc(provider=self.provider, priority=priority)
+        return waiter
+
+    def _try_admit(self, waiter, start):
+        """
+        Admits the waiter and returns 0 if it is first in line and the budgets allow it;
+        otherwise returns how long to wait before checking again (None: until notified).
+        Only interactive calls are bounded by max_wait. Call with the lock held.
+        """
+        now = time.monotonic()
+        delay = self._paused_until - now
+        if min(self._waiting, key=_Waiter.key) is waiter and delay <= 0:
+            delay = max(self._requests.wait_time(1, now), self._tokens.wait_time(waiter.tokens, now))
+            if delay <= 0:
+                self._requests.take(1)
+                self._tokens.take(waiter.tokens)
+                self._virtual_time = waiter.tag
+                self._prune_tags()
+                return 0
+        if waiter.priority == PRIORITIES["batch"]:
+            return delay if delay > 0 else None
+        remaining = self.max_wait - (now - start)
+        if remaining <= 0:
+            raise SchedulerBusyError(f"Waited over {self.max_wait:.0f}s for {self.provider} rate-limit budget")
+        return min(delay, remaining) if delay > 0 else remaining
+
+    def _dequeue(self, waiter, priority):
+        self._waiting.remove(waiter)
+        self._queued[priority] = self._queued.get(priority, 0) - 1
+        QUEUE_DEPTH.dec(provider=self.provider, priority=priority)
+        self._cond.notify_all()
+
+    def settle(self, estimated, actual):
+        """Corrects the token bucket once the provider reports the real usage of a call."""
+        with self._cond:
+            if actual > estimated:
+                self._tokens.take(actual - estimated)
+            else:
+                self._tokens.give_back(estimated - actual)
+            self._cond.notify_all()
+
+    def pause(self, seconds):
+        """Stops admitting calls for `seconds` (after a 429 from the provider)."""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._cond.notify_all()
+
+    def _prune_tags(self):
+        # Jobs whose last call is behind virtual time would restart at virtual time anyway
+        if len(self._finish_tags) > 1000:
+            self._finish_tags = {j: t for j, t in self._finish_tags.items() if t > self._virtual_time}
+
+
+_schedulers = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(provider: str) -> LLMScheduler:
+    """The shared scheduler for a provider (one per process)."""
+    with _schedulers_lock:
+        if provider not in _schedulers:
+            _schedulers[provider] = LLMScheduler(provider)
+        return _schedulers[provider]
+
+
+def any_saturated() -> bool:
+    with _schedulers_lock:
+        schedulers = list(_schedulers.values())
+    return any(s.saturated() for s in schedulers)
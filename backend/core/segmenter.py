@@ -0,0 +1,153 @@
+import re
+
+# Clause headings at the start of a line:
+#   Article IV / ARTICLE 4, Section 2 / Section 2.1, 12. / 12.3 / 12.3(a), A., (a) / (iv) / (2)
+HEADING = re.compile(
+    r'^[ \t]*(?:'
+    r'(?P<article>Article|ARTICLE)\s+(?P<article_no>[IVXLCDM]+|\d+)\b'
+    r'|(?P<section>Section|SECTION)\s+(?P<section_no>\d+(?:\.\d+)*)\b'
+    r'|(?P<num>\d{1,3}(?:\.\d{1,3})+\.?|\d{1,3}\.)(?P<num_sub>\([a-z0-9]{1,4}\))?(?=\s)'
+    r'|(?P<letter>[A-Z])\.(?=\s)'
+    r'|\((?P<item>[a-z]{1,4}|\d{1,2})\)(?=\s)'
+    r')',
+    re.M
+)
+ROMAN = re.compile(r'[ivx]+')
+
+# Structural rank of each heading kind; lower ranks contain higher ones
+ARTICLE_RANK = 0
+NUMBERED_RANK = 1
+ITEM_RANK = 10
+
+
+class ClauseSpan:
+    """
+    One heading-delimited clause as offsets into the source text (no copied text).
+    `end` covers nested sub-clauses; `body_end` is where the clause's own text stops
+    (the next heading of any level).
+    """
+    __slots__ = ("start", "end", "body_end", "label", "depth", "parent", "rank")
+
+    def __init__(self, start, label, depth, parent, rank):
+        self.start = start
+        self.end = start
+        self.body_end = start
+        self.label = label
+        self.depth = depth
+        self.parent = parent
+        self.rank = rank
+
+    def text(self, source: str) -> str:
+        return source[self.start:self.end]
+
+    def body(self, source: str) -> str:
+        return source[self.start:self.body_end]
+
+    def path(self):
+        labels = []
+        node = self
+        while node is not None:
+            if node.label:
+                labels.append(node.label)
+            node = node.parent
+        return " > ".join(reversed(labels))
+
+    def to_dict(self):
+        return {
+            "start": self.start,
+            "end": self.end,
+            "body_end": self.body_end,
+            "label": self.label,
+            "depth": self.depth,
+            "parent": self.parent.label if self.parent is not None else None,
+            "path": self.path(),
+        }
+
+    def __repr__(self):
+        return f"ClauseSpan({self.label!r}, {self.start}-{self.end}, depth={self.depth})"
+
+
+def _rank(m, stack):
+    """Maps a heading match to (label, rank)."""
+    if m.group("article"):
+        return f"Article {m.group('article_no')}", ARTICLE_RANK
+    if m.group("section"):
+        number = m.group("section_no")
+        return f"Section {number}", NUMBERED_RANK + number.count(".")
+    if m.group("num"):
+        number = m.group("num").rstrip(".")
+        sub = m.group("num_sub")
+        rank = NUMBERED_RANK + number.count(".")
+        return number + (sub or ""), rank + (1 if sub else 0)
+    if m.group("letter"):
+        return f"{m.group('letter')}.", NUMBERED_RANK
+    item = m.group("item")
+    # (i), (ii) ... nested under a lettered item are one level deeper than (a), (b) ...
+    if ROMAN.fullmatch(item) and stack and (
+            stack[-1].rank == ITEM_RANK + 1 or (stack[-1].rank == ITEM_RANK and stack[-1].label != "(h)")):
+        return f"({item})", ITEM_RANK + 1
+    return f"({item})", ITEM_RANK
+
+
+class ClauseSegmenter:
+    """
+    Single-pass, offset-based clause segmenter. Works on a string or on an iterable of text
+    chunks (e.g. PDF pages as they are parsed) and returns ClauseSpan objects in document
+    order, linked into a tree through `parent`. Text before the first heading becomes a
+    preamble span with an empty label. With fold_items=True, list items such as (a) or (iv)
+    stay inside their parent clause's body instead of becoming spans of their own.
+    """
+    def __init__(self, fold_items=False):
+        self.fold_items = fold_items
+
+    def segment(self, source):
+        if isinstance(source, str):
+            source = (source,)
+
+        spans = []
+        stack = []
+        offset = 0  # Document position of `carry`
+        carry = ""  # Unfinished last line of the previous chunk
+
+        for chunk in source:
+            if carry:
+                chunk = carry + chunk
+            cut = chunk.rfind("\n") + 1
+            if cut:
+                self._scan(chunk[:cut], offset, spans, stack)
+                offset += cut
+            carry = chunk[cut:]
+
+        if carry:
+            self._scan(carry, offset, spans, stack)
+            offset += len(carry)
+
+        self._close(spans, stack, offset, ARTICLE_RANK - 1)
+        return spans
+
+    def _scan(self, text, offset, spans, stack):
+        if not spans:
+            # Preamble (title, recitals) before the first heading
+            first = HEADING.search(text)
+            if text[:first.start() if first else len(text)].strip():
+                spans.append(ClauseSpan(offset, "", 0, None, ARTICLE_RANK - 1))
+        for m in HEADING.finditer(text):
+            start = offset + m.start()
+            label, rank = _rank(m, stack)
+            if self.fold_items and rank >= ITEM_RANK:
+                continue
+            self._close(spans, stack, start, rank)
+            parent = stack[-1] if stack else None
+            span = ClauseSpan(start, label, len(stack), parent, rank)
+            spans.append(span)
+            stack.append(span)
+
+    @staticmethod
+    def _close(spans, stack, position, rank):
+        """Ends the previous clause body and every open clause of the same or lower rank."""
+        if spans and spans[-1].body_end == spans[-1].start:
+            spans[-1].body_end = position
+            if not spans[-1].label:
+                spans[-1].end = position  # The preamble never has children
+        while stack and stack[-1].rank >= rank:
+            stack.pop().end = position
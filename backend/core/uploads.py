@@ -0,0 +1,137 @@
+import hashlib
+import io
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+CHUNK = 1024 * 1024
+
+
+def content_sha256(source) -> str:
+    """SHA-256 of a file path, bytes-like object or binary file object (which is rewound afterwards)."""
+    digest = hashlib.sha256()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        digest.update(source)
+    elif isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            for block in iter(lambda: f.read(CHUNK), b""):
+                digest.update(block)
+    else:
+        source.seek(0)
+        for block in iter(lambda: source.read(CHUNK), b""):
+            digest.update(block)
+        source.seek(0)
+    return digest.hexdigest()
+
+
+class UploadStore:
+    """
+    Content-addressed upload directory: each file is stored once as <sha256><ext>, however
+    often it is uploaded. Files older than the retention period, and the least recently
+    uploaded files beyond the size budget, are evicted on every upload, except those held
+    by a running analysis. Uploads are only written here when `persist` is on (UPLOAD_PERSIST=1,
+    for audit retention); otherwise accept() hands the in-memory upload straight to the parser,
+    and files kept while persisting was on still age out.
+    """
+    def __init__(self, root, max_bytes=None, retention_days=None, persist=None):
+        self.root = root
+        self.persist = persist if persist is not None else os.getenv("UPLOAD_PERSIST", "0") != "0"
+        self.max_bytes = max_bytes or int(os.getenv("UPLOAD_MAX_BYTES", str(1024 ** 3)))
+        self.retention_seconds = (retention_days or float(os.getenv("UPLOAD_RETENTION_DAYS", "30"))) * 24 * 3600
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._held = {}  # path -> number of analyses using it
+
+    def accept(self, upload, filename: str, detach=False):
+        """
+        Returns (sha256, source) for an upload (a binary file object or bytes). The source is
+        the stored path when persisting (held until release) and otherwise the upload itself,
+        or its bytes with `detach` when it must outlive the request (background jobs).
+        """
+        if self.persist:
+            return self.save(io.BytesIO(upload) if isinstance(upload, bytes) else upload, filename)
+        self.evict()
+        content_hash = content_sha256(upload)
+        if detach and not isinstance(upload, bytes):
+            upload = upload.read()
+        return content_hash, upload
+
+    def save(self, fileobj, filename: str):
+        """
+        Streams fileobj to disk while hashing it. Returns (sha256, stored path). The stored
+        file is held against eviction until the caller calls release(path).
+        """
+        ext = os.path.splitext(filename or "")[1].lower()
+        digest = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".incoming-")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                for block in iter(lambda: fileobj.read(CHUNK), b""):
+                    digest.update(block)
+                    out.write(block)
+            content_hash = digest.hexdigest()
+            path = os.path.join(self.root, content_hash + ext)
+            with self._lock:
+                if os.path.exists(path):
+                    os.remove(tmp_path)
+                    os.utime(path)  # Re-uploads count as recent use for eviction
+                else:
+                    os.replace(tmp_path, path)
+                self._held[path] = self._held.get(path, 0) + 1
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.evict()
+        return content_hash, path
+
+    @contextmanager
+    def hold(self, path):
+        """Protects path from eviction while an analysis reads it."""
+        self.acquire(path)
+        try:
+            yield path
+        finally:
+            self.release(path)
+
+    def acquire(self, path):
+        with self._lock:
+            self._held[path] = self._held.get(path, 0) + 1
+
+    def release(self, path):
+        if not isinstance(path, str):
+            return  # In-memory source from accept(); nothing is held
+        with self._lock:
+            count = self._held.get(path, 0) - 1
+            if count > 0:
+                self._held[path] = count
+            else:
+                self._held.pop(path, None)
+
+    def evict(self):
+        """Removes expired files, then the oldest ones until the directory fits in max_bytes."""
+        now = time.time()
+        with self._lock:
+            files = []
+            for entry in os.scandir(self.root):
+                if not entry.is_file() or entry.name.startswith(".incoming-") or entry.path in self._held:
+                    continue
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+            files.sort()
+            total = sum(size for _, size, _ in files)
+            for mtime, size, path in files:
+                if now - mtime <= self.retention_seconds and total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError as e:
+                    print(f"Upload Eviction Error: {str(e)}")
+
+    def stats(self):
+        with self._lock:
+            files = [e.stat().st_size for e in os.scandir(self.root) if e.is_file() and not e.name.startswith(".")]
+            return {"files": len(files), "bytes": sum(files), "max_bytes": self.max_bytes, "held": len(self._held)}
@@ -0,0 +1,199 @@
+"""
+Synthetic contract generator for the benchmarks.
+
+    python -m benchmarks.corpus --out data/bench --clauses 10,50,200 --hindi 0,0.3 --formats txt,docx,pdf
+"""
+import argparse
+import os
+import random
+import zlib
+
+PARTIES = ["Sharma Traders Pvt. Ltd.", "Bharat Logistics LLP", "Kaveri Textiles Pvt. Ltd.", "Nexa Softech Private Limited",
+           "Gupta & Sons", "Deccan Foods Ltd.", "Vyas Engineering Works", "Anand Retail Pvt. Ltd."]
+CITIES = ["Mumbai", "New Delhi", "Bengaluru", "Chennai", "Hyderabad", "Pune", "Ahmedabad", "Kolkata"]
+MONTHS = ["January", "March", "April", "June", "August", "October", "December"]
+
+TITLES = {
+    "Service Contract": "MASTER SERVICES AGREEMENT",
+    "Employment Agreement": "EMPLOYMENT AGREEMENT",
+    "Lease Agreement": "LEASE DEED",
+    "Vendor Contract": "VENDOR SUPPLY AGREEMENT",
+    "Partnership Deed": "PARTNERSHIP DEED",
+}
+
+# (heading, body) templates; {a} and {b} are the parties, {amount}, {days}, {city}, {date} are filled in
+CLAUSES = [
+    ("Payment Terms", "{b} shall pay {a} a fee of Rs. {amount} within {days} days of the date of each invoice. "
+                      "Late payments shall carry interest at 18% per annum until the date of actual payment."),
+    ("Termination", "Either party may terminate this Agreement by giving {days} days written notice. {a} may terminate "
+                    "immediately upon any breach by {b} that is not cured within 15 days of notice."),
+    ("Limitation of Liability", "The total liability of {a} under this Agreement shall not exceed Rs. {amount}. "
+                                "{b} shall indemnify {a} against all claims, losses and damages arising from its negligence."),
+    ("Intellectual Property", "All intellectual property, copyright and work product created under this Agreement shall "
+                              "vest solely in {b}. {a} retains its pre-existing tools and know-how."),
+    ("Confidentiality", "Each party shall keep the other party's confidential information secret for {days} months after "
+                        "termination and shall use it only for the purposes of this Agreement."),
+    ("Governing Law", "This Agreement is governed by the laws of India. The courts at {city} shall have exclusive jurisdiction, "
+                      "and disputes shall first be referred to arbitration under the Arbitration and Conciliation Act, 1996."),
+    ("Force Majeure", "Neither party is liable for delay caused by events beyond its reasonable control, including flood, "
+                      "epidemic or government action, provided notice is given within {days} days."),
+    ("Notices", "All notices shall be in writing and delivered to the registered office of the receiving party in {city}, "
+                "effective from {date}."),
+    ("Assignment", "{b} shall not assign or subcontract any of its obligations without the prior written consent of {a}."),
+    ("Non-Solicitation", "For {days} months after termination {b} shall not solicit any employee of {a} for employment."),
+]
+
+HINDI_CLAUSES = [
+    ("भुगतान", "{b} चालान की तारीख से {days} दिनों के भीतर {a} को रु. {amount} का भुगतान करेगा। "
+               "देर से भुगतान पर 18% वार्षिक ब्याज लगेगा।"),
+    ("समाप्ति", "कोई भी पक्ष {days} दिनों की लिखित सूचना देकर इस अनुबंध को समाप्त कर सकता है।"),
+    ("दायित्व", "इस अनुबंध के अंतर्गत {a} का कुल दायित्व रु. {amount} से अधिक नहीं होगा।"),
+    ("गोपनीयता", "प्रत्येक पक्ष दूसरे पक्ष की गोपनीय जानकारी को गुप्त रखेगा।"),
+    ("शासी कानून", "यह अनुबंध भारत के कानूनों द्वारा शासित होगा और {city} के न्यायालयों को अधिकार क्षेत्र होगा।"),
+]
+
+SUB_ITEMS = [
+    "the obligations in this clause survive termination;",
+    "any waiver must be in writing and signed by both parties;",
+    "amounts are exclusive of GST, which shall be charged at the applicable rate;",
+    "time is of the essence for every payment obligation.",
+]
+
+
+def generate_contract(clauses: int = 20, hindi_ratio: float = 0.0, contract_type: str = "Service Contract", seed: int = 0) -> str:
+    """
+    Returns the text of a synthetic contract: title, recitals and `clauses` numbered clauses,
+    some with (a)/(b) sub-items. About `hindi_ratio` of the clauses are written in Hindi.
+    The same arguments always produce the same text.
+    """
+    rng = random.Random(seed)
+    a, b = rng.sample(PARTIES, 2)
+    fields = lambda: {
+        "a": a, "b": b, "city": rng.choice(CITIES), "days": rng.choice([15, 30, 45, 60, 90]),
+        "amount": f"{rng.randint(1, 99)},{rng.randint(10, 99)},000",
+        "date": f"{rng.randint(1, 28)} {rng.choice(MONTHS)} {rng.randint(2023, 2026)}",
+    }
+
+    lines = [
+        TITLES.get(contract_type, "AGREEMENT"),
+        "",
+        f"This Agreement is made at {rng.choice(CITIES)} on {fields()['date']} between {a} (the \"Company\") "
+        f"and {b} (the \"Counterparty\").",
+        "",
+        f"WHEREAS the parties wish to record the terms of this {contract_type.lower()}.",
+        "",
+    ]
+    for n in range(1, clauses + 1):
+        templates = HINDI_CLAUSES if rng.random() < hindi_ratio else CLAUSES
+        heading, body = rng.choice(templates)
+        lines.append(f"{n}. {heading}. {body.format(**fields())}")
+        if rng.random() < 0.3:
+            for letter, item in zip("abcd", rng.sample(SUB_ITEMS, rng.randint(2, 4))):
+                lines.append(f"({letter}) {item}")
+        lines.append("")
+    lines.append(f"IN WITNESS WHEREOF the parties have signed this Agreement through their authorised signatories.")
+    return "\n".join(lines) + "\n"
+
+
+def write_txt(text: str, path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def write_docx(text: str, path: str):
+    from docx import Document
+    document = Document()
+    for line in text.split("\n"):
+        document.add_paragraph(line)
+    document.save(path)
+
+
+def _wrap(line, width):
+    out = []
+    while len(line) > width:
+        cut = line.rfind(" ", 0, width)
+        cut = cut if cut > 0 else width
+        out.append(line[:cut])
+        line = line[cut:].lstrip()
+    out.append(line)
+    return out
+
+
+def write_pdf(text: str, path: str, lines_per_page: int = 60, width: int = 95):
+    """
+    Minimal text-only PDF (Helvetica, one page per `lines_per_page` wrapped lines), so the
+    corpus needs no PDF library. Characters outside Latin-1 (e.g. Devanagari) become "?":
+    the standard PDF fonts cannot show them without an embedded Unicode font.
+    """
+    wrapped = [w for line in text.split("\n") for w in _wrap(line, width)]
+    pages = [wrapped[i:i + lines_per_page] for i in range(0, len(wrapped), lines_per_page)] or [[]]
+
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"]
+    kids = []
+    for i, page in enumerate(pages):
+        page_id = 4 + 2 * i
+        kids.append(f"{page_id} 0 R")
+        shown = []
+        for line in page:
+            escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            shown.append(f"({escaped}) '")
+        stream = zlib.compress(f"BT /F1 10 Tf 50 800 Td 12 TL {' '.join(shown)} ET".encode("latin-1", "replace"))
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources << /Font << /F1 3 0 R >> >> "
+            f"/Contents {page_id + 1} 0 R >>".encode()
+        )
+        objects.append(f"<< /Length {len(stream)} /Filter /FlateDecode >>\nstream\n".encode() + stream + b"\nendstream")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>".encode()
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for i, obj in enumerate(objects):
+        offsets.append(len(out))
+        out += f"{i + 1} 0 obj\n".encode() + obj + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{o:010d} 00000 n \n".encode() for o in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+WRITERS = {"txt": write_txt, "docx": write_docx, "pdf": write_pdf}
+
+
+def build_corpus(out_dir: str, sizes=(10, 50, 200), hindi_ratios=(0.0, 0.3), formats=("txt", "docx", "pdf"), seed: int = 0):
+    """
+    Writes one file per (size, hindi ratio, format) into out_dir and returns a list of
+    {"path", "format", "clauses", "hindi_ratio", "chars"} entries.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    types = list(TITLES)
+    corpus = []
+    for i, size in enumerate(sizes):
+        for ratio in hindi_ratios:
+            text = generate_contract(size, ratio, types[i % len(types)], seed=seed + i)
+            for fmt in formats:
+                path = os.path.join(out_dir, f"contract_{size}c_hi{int(ratio * 100)}.{fmt}")
+                WRITERS[fmt](text, path)
+                corpus.append({"path": path, "format": fmt, "clauses": size, "hindi_ratio": ratio, "chars": len(text)})
+    return corpus
+
+
+def _csv(cast):
+    return lambda value: [cast(v) for v in value.split(",") if v]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic contract corpus")
+    parser.add_argument("--out", default=os.path.join("data", "bench"))
+    parser.add_argument("--clauses", type=_csv(int), default=[10, 50, 200])
+    parser.add_argument("--hindi", type=_csv(float), default=[0.0, 0.3])
+    parser.add_argument("--formats", type=_csv(str), default=["txt", "docx", "pdf"])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    for entry in build_corpus(args.out, args.clauses, args.hindi, args.formats, args.seed):
+        print(f"{entry['path']} ({entry['chars']} chars)")
+
+
+if __name__ == "__main__":
+    main()
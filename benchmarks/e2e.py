@@ -0,0 +1,86 @@
+"""
+End-to-end /analyze benchmark: concurrent clients upload corpus files and we record
+throughput and latency percentiles. Without a URL the API is started in-process.
+"""
+import os
+import socket
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .timing import summarize
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_api():
+    """Runs backend.api on a free local port (uploads and audit reports go to a temp dir)."""
+    import uvicorn
+    from backend import api
+    from backend.core.audit_log import AuditLog
+    from backend.core.uploads import UploadStore
+
+    scratch = tempfile.mkdtemp(prefix="bench-api-")
+    api.UPLOAD_DIR = scratch
+    api.uploads = UploadStore(scratch)
+    api.backend.audit = AuditLog(scratch)
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(api.app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, name="bench-api", daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, f"http://127.0.0.1:{port}"
+
+
+def run_e2e_benchmark(files, url=None, requests: int = 20, concurrency: int = 4, timeout: float = 600):
+    """
+    Sends `requests` POST /analyze uploads (cycling through `files`) from `concurrency`
+    client threads. Returns throughput, latency percentiles and status counts.
+    """
+    import httpx
+
+    server = None
+    if url is None:
+        server, url = start_api()
+
+    def one(i):
+        path = files[i % len(files)]
+        start = time.perf_counter()
+        try:
+            with open(path, "rb") as f, httpx.Client(timeout=timeout) as client:
+                status = client.post(f"{url}/analyze", files={"file": (os.path.basename(path), f)}).status_code
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        return time.perf_counter() - start, status
+
+    # One untimed request so model loading is not counted as request latency
+    one(0)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(one, range(requests)))
+    wall = time.perf_counter() - started
+
+    if server is not None:
+        server.should_exit = True
+
+    statuses = {}
+    for _, status in outcomes:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    ok = [latency for latency, status in outcomes if status == 200]
+    result = {
+        "requests": requests,
+        "concurrency": concurrency,
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(len(ok) / wall, 3) if wall else 0.0,
+        "statuses": statuses,
+        "latency": summarize(ok),
+    }
+    print(f"  /analyze x{requests} @ {concurrency}: {result['throughput_rps']} req/s, "
+          f"p50 {result['latency'].get('p50_s', 0):.2f}s, p99 {result['latency'].get('p99_s', 0):.2f}s, {statuses}")
+    return result
@@ -0,0 +1,221 @@
+"""
+Local stand-in for the OpenAI and Anthropic HTTP APIs, so benchmarks measure our pipeline
+without network cost or token spend. Point the SDKs at it with:
+
+    OPENAI_BASE_URL=http://127.0.0.1:8900/v1  ANTHROPIC_BASE_URL=http://127.0.0.1:8900
+
+    python -m benchmarks.fake_llm --port 8900 --latency 0.8 --jitter 0.2 --error-rate 0.01 --rpm 500
+"""
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BATCH_ENTRY = re.compile(r'^\s*\[(\d+)\] "', re.M)
+
+ANALYSIS = {
+    "explanation": "Synthetic analysis produced by the benchmark LLM server.",
+    "risk_level": "Medium",
+    "risk_reason": "Synthetic risk reason.",
+    "suggestion": "Synthetic suggestion.",
+    "category": "General Provisions",
+}
+SUMMARY = {
+    "summary": ["Synthetic summary point one.", "Synthetic summary point two."],
+    "composite_risk_score": 5,
+    "top_risks": ["Liability", "Termination", "Payment"],
+    "missing_clauses": ["Force Majeure"],
+}
+SECTION = {
+    "key_points": ["Synthetic key point."],
+    "risks": ["Synthetic risk."],
+    "risk_score": 5,
+    "clauses_present": ["Payment", "Termination"],
+}
+
+
+def answer_for(prompt: str) -> dict:
+    """Schema-valid JSON answer for each prompt template LLMEngine sends."""
+    if '{"analyses"' in prompt:
+        return {"analyses": [dict(ANALYSIS, index=int(n)) for n in BATCH_ENTRY.findall(prompt)]}
+    if "Contract Section:" in prompt or "findings for consecutive parts" in prompt:
+        return dict(SECTION)
+    if "findings for each part" in prompt:
+        return dict(SUMMARY)
+    if "Clause Text:" in prompt:
+        return dict(ANALYSIS)
+    if "Contract Text:" in prompt:
+        return dict(SUMMARY)
+    if "Translate it into" in prompt:
+        source = prompt.split('Text: "', 1)[-1]
+        words = max(len(source.split()) - 5, 1)
+        return {"language": "Hindi", "translated_text": " ".join(["translated"] * words)}
+    return {"error": "Unrecognized prompt"}
+
+
+class FakeLLMServer(ThreadingHTTPServer):
+    """
+    Serves POST /v1/chat/completions (OpenAI) and POST /v1/messages (Anthropic) after a
+    simulated latency. `error_rate` of requests fail with HTTP 500, and requests beyond
+    `rpm` in any 60 second window get HTTP 429 with a retry-after header.
+    GET /stats returns request counters.
+    """
+    daemon_threads = True
+    request_queue_size = 512  # Accept bursts of hundreds of concurrent connections
+
+    def __init__(self, address, latency=0.5, jitter=0.1, error_rate=0.0, rpm=0, seed=0):
+        super().__init__(address, _Handler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rpm = rpm
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window = deque()
+        self.counters = {"requests": 0, "ok": 0, "errors": 0, "rate_limited": 0, "prompt_tokens": 0, "completion_tokens": 0}
+
+    def admit(self):
+        """Returns "ok", "error" or "rate_limited" for the next request."""
+        with self._lock:
+            self.counters["requests"] += 1
+            now = time.monotonic()
+            while self._window and now - self._window[0] >= 60:
+                self._window.popleft()
+            if self.rpm and len(self._window) >= self.rpm:
+                self.counters["rate_limited"] += 1
+                return "rate_limited"
+            self._window.append(now)
+            if self._rng.random() < self.error_rate:
+                self.counters["errors"] += 1
+                return "error"
+            return "ok"
+
+    def delay(self):
+        with self._lock:
+            seconds = self._rng.gauss(self.latency, self.jitter) if self.jitter else self.latency
+        time.sleep(max(seconds, 0.0))
+
+    def record(self, prompt_tokens, completion_tokens):
+        with self._lock:
+            self.counters["ok"] += 1
+            self.counters["prompt_tokens"] += prompt_tokens
+            self.counters["completion_tokens"] += completion_tokens
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output clean
+
+    def do_GET(self):
+        if self.path == "/stats":
+            return self._send(200, self.server.stats())
+        self._send(404, {"error": {"message": "Not found"}})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if self.path.rstrip("/").endswith("/chat/completions"):
+            provider = "openai"
+        elif self.path.rstrip("/").endswith("/messages"):
+            provider = "anthropic"
+        else:
+            return self._send(404, {"error": {"message": "Not found"}})
+
+        outcome = self.server.admit()
+        if outcome == "rate_limited":
+            return self._send(429, {"error": {"type": "rate_limit_error", "message": "Rate limit reached"}}, {"retry-after": "1"})
+        self.server.delay()
+        if outcome == "error":
+            return self._send(500, {"error": {"type": "api_error", "message": "Simulated server error"}})
+
+        prompt = "\n".join(
+            m["content"] if isinstance(m.get("content"), str) else "".join(p.get("text", "") for p in m.get("content", []))
+            for m in body.get("messages", [])
+        )
+        content = json.dumps(answer_for(prompt))
+        prompt_tokens, completion_tokens = len(prompt) // 4 + 1, len(content) // 4 + 1
+        self.server.record(prompt_tokens, completion_tokens)
+
+        if provider == "openai":
+            payload = {
+                "id": "chatcmpl-bench", "object": "chat.completion", "created": int(time.time()),
+                "model": body.get("model", "fake"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                          "total_tokens": prompt_tokens + completion_tokens},
+            }
+        else:
+            payload = {
+                "id": "msg_bench", "type": "message", "role": "assistant", "model": body.get("model", "fake"),
+                "content": [{"type": "text", "text": content}], "stop_reason": "end_turn", "stop_sequence": None,
+                "usage": {"input_tokens": prompt_tokens, "output_tokens": completion_tokens},
+            }
+        self._send(200, payload)
+
+    def _send(self, status, payload, headers=None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def start_server(host="127.0.0.1", port=0, **config):
+    """Starts the server on a daemon thread; port=0 picks a free port (see server.server_port)."""
+    server = FakeLLMServer((host, port), **config)
+    threading.Thread(target=server.serve_forever, name="fake-llm", daemon=True).start()
+    return server
+
+
+def point_sdks_at(server):
+    """
+    Routes both SDKs to the fake server and makes LLMEngine treat the run as live. Caching,
+    clause reuse, the rule engine and the report cache are turned off so every clause reaches
+    the "provider".
+    Must run before the backend modules build their LLM clients.
+    """
+    base = f"http://{server.server_address[0]}:{server.server_port}"
+    os.environ["OPENAI_BASE_URL"] = base + "/v1"
+    os.environ["ANTHROPIC_BASE_URL"] = base
+    os.environ["OPENAI_API_KEY"] = "bench-key"
+    os.environ["ANTHROPIC_API_KEY"] = "bench-key"
+    os.environ["LLM_CACHE_ENABLED"] = "0"
+    os.environ["CLAUSE_INDEX_ENABLED"] = "0"
+    os.environ["REPORT_CACHE_ENABLED"] = "0"
+    os.environ["RULES_ENABLED"] = "0"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fake OpenAI/Anthropic-compatible LLM server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", type=float, default=0.5, help="mean seconds per request")
+    parser.add_argument("--jitter", type=float, default=0.1, help="standard deviation of the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with HTTP 500")
+    parser.add_argument("--rpm", type=int, default=0, help="requests per minute before HTTP 429 (0 = unlimited)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    server = FakeLLMServer((args.host, args.port), latency=args.latency, jitter=args.jitter,
+                           error_rate=args.error_rate, rpm=args.rpm, seed=args.seed)
+    print(f"Fake LLM server on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Runs the benchmark suite and writes a JSON results file.
+
+    python -m benchmarks.run                          # corpus + stages + e2e, results in benchmarks/results/
+    python -m benchmarks.run --skip-e2e --clauses 10,50
+    python -m benchmarks.run --compare benchmarks/results/old.json benchmarks/results/new.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT_DIR, "benchmarks", "results")
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def flatten(results) -> dict:
+    """{metric name: seconds} for every timed stage and the e2e run, for comparisons."""
+    metrics = {}
+    for row in results.get("stages", []):
+        metrics[f"{row['stage']}/{row['document']}/p50_s"] = row["p50_s"]
+    e2e = results.get("e2e")
+    if e2e and e2e["latency"].get("runs"):
+        for key in ("p50_s", "p99_s"):
+            metrics[f"e2e/analyze/{key}"] = e2e["latency"][key]
+    return metrics
+
+
+def compare(base_path, new_path, threshold: float = 0.10):
+    """Prints each shared metric with its relative change; changes beyond threshold are flagged."""
+    with open(base_path) as f:
+        base = flatten(json.load(f))
+    with open(new_path) as f:
+        new = flatten(json.load(f))
+    regressions = 0
+    for name in sorted(set(base) & set(new)):
+        change = (new[name] - base[name]) / base[name] if base[name] else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  SLOWER"
+            regressions += 1
+        elif change < -threshold:
+            flag = "  faster"
+        print(f"{name:<60} {base[name]:>10.4f} -> {new[name]:>10.4f}  {change:+7.1%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Contract pipeline benchmarks")
+    parser.add_argument("--corpus-dir", help="where to write the synthetic corpus (default: a temp dir)")
+    parser.add_argument("--clauses", default="10,50,200")
+    parser.add_argument("--hindi", default="0,0.3")
+    parser.add_argument("--formats", default="txt,docx,pdf")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-stages", action="store_true")
+    parser.add_argument("--skip-e2e", action="store_true")
+    parser.add_argument("--url", help="benchmark an already running API instead of starting one")
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--llm-latency", type=float, default=0.2)
+    parser.add_argument("--llm-jitter", type=float, default=0.05)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--llm-rpm", type=int, default=0)
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<time>_<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"))
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare) else 0)
+
+    from .corpus import build_corpus, _csv
+    from .fake_llm import start_server, point_sdks_at
+
+    # The fake provider must be configured before any backend module creates an SDK client
+    llm_server = start_server(latency=args.llm_latency, jitter=args.llm_jitter,
+                              error_rate=args.llm_error_rate, rpm=args.llm_rpm)
+    point_sdks_at(llm_server)
+
+    corpus_dir = args.corpus_dir or tempfile.mkdtemp(prefix="bench-corpus-")
+    corpus = build_corpus(corpus_dir, _csv(int)(args.clauses), _csv(float)(args.hindi), _csv(str)(args.formats))
+    print(f"Corpus: {len(corpus)} files in {corpus_dir}")
+
+    commit = _git_commit()
+    results = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "args": {k: v for k, v in vars(args).items() if k != "compare"},
+        },
+        "corpus": [{**entry, "path": os.path.basename(entry["path"])} for entry in corpus],
+    }
+
+    if not args.skip_stages:
+        from .stages import run_stage_benchmarks
+        print("Stage benchmarks:")
+        results["stages"] = run_stage_benchmarks(corpus, repeat=args.repeat)
+
+    if not args.skip_e2e:
+        from .e2e import run_e2e_benchmark
+        print("End-to-end benchmark:")
+        files = [entry["path"] for entry in corpus]
+        results["e2e"] = run_e2e_benchmark(files, url=args.url, requests=args.requests, concurrency=args.concurrency)
+
+    results["llm_server"] = llm_server.stats()
+    llm_server.shutdown()
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}_{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
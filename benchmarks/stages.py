@@ -0,0 +1,48 @@
+"""
+Per-stage microbenchmarks: parsing (per file format), language detection, classification,
+segmentation, NER and the whole in-process pipeline (against the fake LLM server).
+"""
+import os
+import tempfile
+from .timing import timed
+
+
+def run_stage_benchmarks(corpus, repeat: int = 5, pipeline_repeat: int = 2, include_pipeline: bool = True):
+    """
+    Returns one result dict per (stage, document). Text stages run on the TXT variant of each
+    document; parsing runs on every format. `include_pipeline` needs the LLM SDKs pointed at
+    a fake server (see benchmarks.fake_llm.point_sdks_at).
+    """
+    from backend.core.parser import ContractParser
+    from backend.core.nlp_engine import NLPEngine
+    from backend.core.language import detect_segments
+
+    parser = ContractParser()
+    nlp = NLPEngine()
+    nlp.load_model()
+    results = []
+
+    def record(stage, entry, stats):
+        results.append({"stage": stage, "document": os.path.basename(entry["path"]), "format": entry["format"],
+                        "clauses": entry["clauses"], "hindi_ratio": entry["hindi_ratio"], "chars": entry["chars"], **stats})
+        print(f"  {stage:<18} {os.path.basename(entry['path']):<28} p50 {stats['p50_s'] * 1000:9.2f} ms")
+
+    for entry in corpus:
+        record(f"parse_{entry['format']}", entry, timed(parser.get_text, entry["path"], repeat=repeat))
+
+    texts = [(entry, parser.get_text(entry["path"])) for entry in corpus if entry["format"] == "txt"]
+    for entry, text in texts:
+        record("detect_language", entry, timed(detect_segments, text, repeat=repeat))
+        record("classify_contract", entry, timed(nlp.classify_contract, text, repeat=repeat))
+        record("segment_clauses", entry, timed(nlp.segment_clauses, text, repeat=repeat))
+        record("extract_entities", entry, timed(nlp.extract_entities, text, repeat=repeat))
+
+    if include_pipeline:
+        from backend.core.audit_log import AuditLog
+        from backend.core.orchestrator import LegalAssistantBackend
+        backend = LegalAssistantBackend()
+        with tempfile.TemporaryDirectory() as logs_dir:
+            backend.audit = AuditLog(logs_dir)  # Keep benchmark reports out of the real audit trail
+            for entry, _ in texts:
+                record("process_contract", entry, timed(backend.process_contract, entry["path"], repeat=pipeline_repeat))
+    return results
@@ -0,0 +1,37 @@
+import math
+import statistics
+import time
+
+
+def percentile(samples, pct: float) -> float:
+    """Nearest-rank percentile (pct in 0-100) of a non-empty list."""
+    ordered = sorted(samples)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def summarize(samples) -> dict:
+    """Seconds statistics for a list of durations."""
+    if not samples:
+        return {"runs": 0}
+    return {
+        "runs": len(samples),
+        "min_s": round(min(samples), 6),
+        "mean_s": round(statistics.fmean(samples), 6),
+        "p50_s": round(percentile(samples, 50), 6),
+        "p90_s": round(percentile(samples, 90), 6),
+        "p99_s": round(percentile(samples, 99), 6),
+        "max_s": round(max(samples), 6),
+    }
+
+
+def timed(func, *args, repeat: int = 5, warmup: int = 1, **kwargs) -> dict:
+    """Calls func `warmup` times untimed, then `repeat` times timed, and summarizes the durations."""
+    for _ in range(warmup):
+        func(*args, **kwargs)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
@@ -9,7 +9,7 @@ ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if ROOT_DIR not in sys.path:
     sys.path.append(ROOT_DIR)
 
-from backend.core.orchestrator import LegalAssistantBackend
+from backend.core.audit_log import AuditLog
 from datetime import datetime
 import base64
 import plotly.graph_objects as go
@@ -162,16 +162,50 @@ BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8001")
 
 @st.cache_resource
 def get_backend():
+    # Local engine is only needed when the API is unreachable, so import and build it on demand
+    from backend.core.orchestrator import LegalAssistantBackend
     return LegalAssistantBackend()
 
-backend = get_backend()
-
 def check_api_status():
     api_key = os.getenv("OPENAI_API_KEY")
     return bool(api_key and "your_" not in api_key)
 
 is_api_configured = check_api_status()
 
+def risk_class(level):
+    return "clause-high" if level == "High" else ("clause-med" if level == "Medium" else "clause-low")
+
+def render_live_metadata(container, event):
+    parties = ", ".join(event.get("entities", {}).get("Parties", [])[:3]) or "Not detected"
+    container.markdown(f"""
+        <div class='glass-panel'>
+            <h4 style='color:var(--neon-cyan); margin:0;'>{event.get('contract_type', 'General Agreement')}</h4>
+            <p style='color:#94a3b8; margin:8px 0 0 0;'>Parties: {parties}</p>
+        </div>
+    """, unsafe_allow_html=True)
+
+def render_live_summary(container, summary):
+    items = "".join(f"<li>{item}</li>" for item in summary.get("summary", []))
+    container.markdown(f"""
+        <div class='glass-panel'>
+            <h4 style='color:var(--neon-purple); margin:0;'>RISK INDEX: {summary.get('composite_risk_score', '-')}/10</h4>
+            <ul style='margin-top:12px;'>{items}</ul>
+        </div>
+    """, unsafe_allow_html=True)
+
+def render_live_clause(container, event):
+    analysis = event.get("analysis", {})
+    level = analysis.get("risk_level", "Low")
+    container.markdown(f"""
+        <div class='glass-panel {risk_class(level)} clause-box' style='padding:18px;'>
+            <div style='display:flex; justify-content:space-between;'>
+                <b>C{event['index'] + 1}: {analysis.get('category', 'Agreement Section')}</b>
+                <span style='font-size:0.75rem;'>RISK: {level}</span>
+            </div>
+            <p style='font-size:0.9rem; margin:8px 0 0 0;'>{analysis.get('explanation', analysis.get('error', ''))}</p>
+        </div>
+    """, unsafe_allow_html=True)
+
 # --- Sidebar Experience ---
 with st.sidebar:
     st.markdown("""
@@ -189,19 +223,17 @@ with st.sidebar:
     
     st.markdown("---")
     st.subheader("📜 Audit Trail")
-    log_file = os.path.join(ROOT_DIR, "logs", "audit_trail.json")
-    if os.path.exists(log_file):
-        with open(log_file, 'r') as f:
-            try:
-                logs = json.load(f)
-                for log in reversed(logs[-4:]):
-                    st.markdown(f"""
-                        <div style='margin-bottom:12px; font-size:0.85rem; background:rgba(255,255,255,0.03); padding:10px; border-radius:12px;'>
-                            <b style='color:#22d3ee;'>{log['filename'][:20]}...</b><br>
-                            <span style='color:#94a3b8;'>Scored: {log['summary']['composite_risk_score']}/10</span>
-                        </div>
-                    """, unsafe_allow_html=True)
-            except: st.caption("No history yet.")
+    try:
+        logs = AuditLog(os.path.join(ROOT_DIR, "logs")).recent(4)
+        for log in logs:
+            st.markdown(f"""
+                <div style='margin-bottom:12px; font-size:0.85rem; background:rgba(255,255,255,0.03); padding:10px; border-radius:12px;'>
+                    <b style='color:#22d3ee;'>{log['filename'][:20]}...</b><br>
+                    <span style='color:#94a3b8;'>Scored: {log['summary']['composite_risk_score']}/10</span>
+                </div>
+            """, unsafe_allow_html=True)
+        if not logs: st.caption("No history yet.")
+    except: st.caption("No history yet.")
     
     st.markdown("---")
     st.caption("Environment: Premium AI-SME Agent")
@@ -241,28 +273,49 @@ with tab1:
                 st.warning("⚠️ **DEMO MODE ACTIVE**: Standard legal reasoning will be simulated.")
                 
             if st.button("🚀 INITIATE AI AUDIT"):
-                with st.spinner("Decoding legalese, spotting hidden liabilities, and auditing Indian Law compliance..."):
-                    try:
-                        # Call Backend API
-                        files = {"file": (uploaded_file.name, uploaded_file.getvalue(), uploaded_file.type)}
-                        res = requests.post(f"{BACKEND_URL}/analyze", files=files)
-                        
-                        if res.status_code == 200:
-                            st.session_state.analysis_report = res.json()
-                            st.balloons()
-                            st.toast("Forensic Audit Complete!", icon="🛡️")
-                        else:
-                            st.error(f"API Internal Error: {res.text}")
-                    except Exception as e:
-                        # Fallback
-                        st.warning("System connection failed. Running local forensic engine...")
-                        # Save temp
-                        path = os.path.join(ROOT_DIR, "data", "uploads", uploaded_file.name)
-                        if not os.path.exists(os.path.dirname(path)):
-                            os.makedirs(os.path.dirname(path))
-                        with open(path, "wb") as f: f.write(uploaded_file.getbuffer())
-                        report = backend.process_contract(path)
-                        st.session_state.analysis_report = report
+                # Live panels filled in as the streaming API emits each part of the report
+                live_status = st.empty()
+                live_brief = st.container()
+                live_clauses = st.container()
+                live_status.info("Decoding legalese, spotting hidden liabilities, and auditing Indian Law compliance...")
+                try:
+                    # Call Backend API (streaming)
+                    files = {"file": (uploaded_file.name, uploaded_file.getvalue(), uploaded_file.type)}
+                    res = requests.post(f"{BACKEND_URL}/analyze/stream", files=files, stream=True)
+                    
+                    if res.status_code == 200:
+                        clauses_total = 0
+                        for line in res.iter_lines():
+                            if not line:
+                                continue
+                            event = json.loads(line)
+                            kind = event.get("event")
+                            if kind == "metadata":
+                                clauses_total = event.get("clauses_total", 0)
+                                live_status.info(f"Identified **{event.get('contract_type')}**. Auditing {clauses_total} clauses...")
+                                render_live_metadata(live_brief, event)
+                            elif kind == "summary":
+                                render_live_summary(live_brief, event.get("summary", {}))
+                            elif kind == "clause":
+                                live_status.info(f"Audited {event['index'] + 1}/{clauses_total} clauses...")
+                                render_live_clause(live_clauses, event)
+                            elif kind == "report":
+                                live_status.empty()
+                                st.session_state.analysis_report = event["report"]
+                                st.balloons()
+                                st.toast("Forensic Audit Complete!", icon="🛡️")
+                            elif kind == "error":
+                                live_status.empty()
+                                st.error(f"API Internal Error: {event.get('error')}")
+                    else:
+                        live_status.empty()
+                        st.error(f"API Internal Error: {res.text}")
+                except Exception as e:
+                    # Fallback
+                    live_status.warning("System connection failed. Running local forensic engine...")
+                    # Parse straight from the in-memory upload
+                    report = get_backend().process_contract(uploaded_file, filename=uploaded_file.name)
+                    st.session_state.analysis_report = report
             
     with col_guide:
         st.markdown(f"""
@@ -363,13 +416,15 @@ with tab3:
         for idx, item in enumerate(clause_analyses):
             analysis = item.get('analysis', {})
             level = analysis.get('risk_level', 'Low')
-            cls_type = "clause-high" if level == "High" else ("clause-med" if level == "Medium" else "clause-low")
+            cls_type = risk_class(level)
+            reused = item.get('reused_from')
+            reused_badge = f"♻️ REUSED FROM {reused.get('filename', 'PRIOR AUDIT')} · " if reused else ""
             
             st.markdown(f"""
                 <div class='glass-panel {cls_type} clause-box'>
                     <div style='display:flex; justify-content:space-between; margin-bottom:15px;'>
                         <h4 style='margin:0; color:#fff;'>C{idx+1}: {analysis.get('category', 'Agreement Section')}</h4>
-                        <span style='background:rgba(255,255,255,0.05); padding:4px 15px; border-radius:20px; font-size:0.75rem;'>RISK: {level}</span>
+                        <span style='background:rgba(255,255,255,0.05); padding:4px 15px; border-radius:20px; font-size:0.75rem;'>{reused_badge}RISK: {level}</span>
                     </div>
                     <div style='background:rgba(0,0,0,0.3); padding:15px; border-radius:12px; margin-bottom:20px;'>
                         <p style='color:#94a3b8; font-style:italic; font-size:0.9rem;'>"{item.get('original_text', '')[:400]}..."</p>
@@ -377,7 +432,7 @@ with tab3:
                     <div style='display:grid; grid-template-columns: 1fr 1fr; gap:30px;'>
                         <div>
                             <h5 style='color:var(--neon-cyan); margin-bottom:8px;'>📖 BUSINESS MEANING</h5>
-                            <p style='font-size:0.95rem;'>{analysis.get('explanation')}</p>
+                            <p style='font-size:0.95rem;'>{analysis.get('explanation', analysis.get('error', ''))}</p>
                             <h5 style='color:var(--risk-high); margin-bottom:8px;'>🚩 THE TRAP</h5>
                             <p style='font-size:0.95rem;'>{analysis.get('risk_reason')}</p>
                         </div>
@@ -0,0 +1,53 @@
+import pytest
+import spacy
+from fastapi.testclient import TestClient
+
+from backend import api
+from backend.core.audit_log import AuditLog
+from backend.core.nlp_engine import NLPEngine
+from backend.core.orchestrator import LegalAssistantBackend
+
+CONTRACT = (b"SERVICE AGREEMENT\n\n1. Services. Ravi Kumar shall provide consulting services to the Client in Pune.\n\n"
+            b"2. Payment. The Client shall pay Rs. 50,000 within 30 days of each invoice.\n")
+
+
+@pytest.fixture
+def offline_backend(monkeypatch, tmp_path):
+    """An offline backend (no API key, no caches) whose spaCy model is a blank English pipeline on disk."""
+    for name in ("OPENAI_API_KEY", "ANTHROPIC_API_KEY"):
+        monkeypatch.delenv(name, raising=False)
+    for name in ("REPORT_CACHE_ENABLED", "CLAUSE_INDEX_ENABLED", "LLM_CACHE_ENABLED"):
+        monkeypatch.setenv(name, "0")
+    model = tmp_path / "model"
+    spacy.blank("en").to_disk(model)
+    backend = LegalAssistantBackend(concurrent=False)
+    backend._nlp = NLPEngine(model=str(model))
+    backend.audit = AuditLog(str(tmp_path / "logs"))
+    monkeypatch.setattr(api, "backend", backend)
+    return backend
+
+
+def test_ready_after_first_request_without_warm_up(monkeypatch, offline_backend):
+    monkeypatch.setenv("WARMUP_ON_STARTUP", "0")
+    with TestClient(api.app) as client:
+        assert client.get("/health").status_code == 200
+        assert client.get("/ready").status_code == 503
+        response = client.post("/analyze", files={"file": ("contract.txt", CONTRACT)})
+        assert response.status_code == 200 and response.json()["clause_analysis"]
+        assert client.get("/ready").json() == {"status": "ready"}
+
+
+def test_failed_warm_up_is_retried(monkeypatch, offline_backend):
+    monkeypatch.setenv("WARMUP_RETRY_SECONDS", "0.01")
+    attempts = []
+    warm_up = offline_backend.warm_up
+
+    def flaky_warm_up():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise OSError("model not downloaded yet")
+        warm_up()
+
+    monkeypatch.setattr(offline_backend, "warm_up", flaky_warm_up)
+    api._warm_up()
+    assert len(attempts) == 3 and offline_backend.ready
@@ -0,0 +1,59 @@
+import json
+import threading
+
+from backend.core.audit_log import AuditLog
+
+
+def _report(n):
+    return {"report_id": f"r{n}", "timestamp": f"2024-01-{n + 1:02d}T00:00:00", "filename": f"c{n}.pdf"}
+
+
+def test_get_and_pages_read_through_the_offset_index(tmp_path):
+    log = AuditLog(str(tmp_path))
+    for n in range(10):
+        log.append(_report(n))
+    assert log.count() == 10
+    assert log.get("r7")["filename"] == "c7.pdf"
+    assert log.get("missing") is None
+
+    page = log.list(limit=3, offset=2)
+    assert page["total"] == 10
+    assert [r["report_id"] for r in page["items"]] == ["r7", "r6", "r5"]  # Newest first
+    assert [r["report_id"] for r in log.list(since="2024-01-09")["items"]] == ["r9", "r8"]
+
+
+def test_index_entries_point_at_the_report_lines(tmp_path):
+    log = AuditLog(str(tmp_path))
+    for n in range(3):
+        log.append(_report(n))
+    data = (tmp_path / "audit_trail.jsonl").read_bytes()
+    for line in (tmp_path / "audit_index.jsonl").read_text().splitlines():
+        entry = json.loads(line)
+        assert json.loads(data[entry["offset"]:entry["offset"] + entry["length"]])["report_id"] == entry["id"]
+
+
+def test_readers_pick_up_appends_from_other_writers(tmp_path):
+    reader, writer = AuditLog(str(tmp_path)), AuditLog(str(tmp_path))
+    writer.append(_report(0))
+    assert reader.count() == 1
+    writer.append(_report(1))
+    assert reader.get("r1")["filename"] == "c1.pdf"  # Only the new index lines are read
+
+
+def test_concurrent_appends_keep_every_report(tmp_path):
+    log = AuditLog(str(tmp_path))
+    threads = [threading.Thread(target=lambda n=n: [log.append(_report(n * 10 + i)) for i in range(10)]) for n in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert AuditLog(str(tmp_path)).count() == 50
+    assert all(log.get(f"r{n}") is not None for n in range(50))
+
+
+def test_legacy_json_array_is_migrated(tmp_path):
+    (tmp_path / "audit_trail.json").write_text(json.dumps([_report(0), _report(1)]))
+    log = AuditLog(str(tmp_path))
+    assert log.count() == 2
+    assert (tmp_path / "audit_trail.json.migrated").exists()
+    assert AuditLog(str(tmp_path)).count() == 2  # Not imported twice
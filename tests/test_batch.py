@@ -0,0 +1,134 @@
+import io
+import zipfile
+
+import pytest
+
+from backend.core.batch import BatchRunner, BatchTooLargeError, collect_files, portfolio_summary
+
+
+class FakeScheduler:
+    def __init__(self, backlog=()):
+        self.backlog = list(backlog)
+
+    def backlog_seconds(self):
+        return self.backlog.pop(0) if self.backlog else 0.0
+
+
+class FakeLLM:
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+
+
+class FakeBackend:
+    """Answers process_contract from `answers` (filename -> list of reports, one per attempt)."""
+    def __init__(self, answers, backlog=()):
+        self.answers = answers
+        self.calls = []
+        self.llm = FakeLLM(FakeScheduler(backlog))
+
+    def has_cached_report(self, source, content_hash):
+        return True  # Keeps the tests off the process pool
+
+    def process_contract(self, source, priority, content_hash, filename, prepared):
+        self.calls.append((filename, priority))
+        answer = self.answers[filename].pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return dict(answer, filename=filename)
+
+
+def report(report_id, score, risks=("High",), missing=(), contract_type="Service Contract", usage=None):
+    return {
+        "report_id": report_id,
+        "contract_type": contract_type,
+        "summary": {"composite_risk_score": score, "missing_clauses": list(missing)},
+        "clause_analysis": [{"analysis": {"risk_level": level}} for level in risks],
+        "llm_usage": usage or {"calls": 1, "cost_usd": 0.5}
+    }
+
+
+def make_runner(backend, **kwargs):
+    runner = BatchRunner(backend, workers=1, concurrency=2, **kwargs)
+    runner.pace_seconds = 0.01
+    return runner
+
+
+def test_run_analyzes_duplicates_once_and_lists_failures():
+    backend = FakeBackend({"a.txt": [report("r1", 8)], "c.txt": [RuntimeError("unreadable")]})
+    files = [("a.txt", "h1", b"a"), ("b.txt", "h1", b"a"), ("c.txt", "h2", b"c")]
+    result = make_runner(backend).run(files)
+    assert sorted(backend.calls) == [("a.txt", "batch"), ("c.txt", "batch")]
+    assert [r["filename"] for r in result["reports"]] == ["a.txt", "b.txt"]
+    assert result["reports"][1]["duplicate_of"] == "r1"
+    assert result["failed"] == [{"filename": "c.txt", "error": "unreadable"}]
+    assert result["portfolio"]["contracts"] == 2
+    assert result["portfolio"]["llm_usage"] == {"calls": 1, "cost_usd": 0.5}  # Duplicates cost nothing
+
+
+def test_retryable_errors_are_analyzed_again():
+    busy = report("r1", 8)
+    busy["clause_analysis"].append({"analysis": {"error": "LLM request failed: queue is full", "retryable": True}})
+    backend = FakeBackend({"a.txt": [busy, report("r2", 8)]})
+    result = make_runner(backend).run([("a.txt", "h1", b"a")])
+    assert len(backend.calls) == 2
+    assert result["reports"][0]["report_id"] == "r2"
+    assert result["portfolio"]["failed_clauses"] == 0
+
+
+def test_other_errors_are_not_retried_and_not_counted_as_risk():
+    failed = report("r1", 8, risks=("Low",))
+    failed["clause_analysis"].append({"analysis": {"error": "LLM request failed: invalid key"}})
+    backend = FakeBackend({"a.txt": [failed]})
+    portfolio = make_runner(backend, retries=3).run([("a.txt", "h1", b"a")])["portfolio"]
+    assert len(backend.calls) == 1
+    assert portfolio["failed_clauses"] == 1 and portfolio["incomplete_contracts"] == 1
+    assert portfolio["clause_risk_distribution"] == {"High": 0, "Medium": 0, "Low": 1}
+
+
+def test_contracts_wait_for_the_scheduler_backlog():
+    backend = FakeBackend({"a.txt": [report("r1", 5)]}, backlog=[120.0, 90.0, 10.0])
+    make_runner(backend, max_backlog=30).run([("a.txt", "h1", b"a")])
+    assert backend.llm.scheduler.backlog == [] and len(backend.calls) == 1
+
+
+def test_portfolio_summary():
+    reports = [
+        report("r1", 9, risks=("High", "Low"), missing=["Arbitration", "Force Majeure"]),
+        report("r2", 2, risks=("Medium",), missing=["arbitration"], contract_type="Lease Agreement"),
+        dict(report("r3", 5, missing=["Arbitration"]), duplicate_of="r1"),
+    ]
+    reports[1]["summary"] = {"error": "LLM request failed", "missing_clauses": ["arbitration"]}
+    portfolio = portfolio_summary(reports)
+    assert portfolio["by_type"] == {"Service Contract": 2, "Lease Agreement": 1}
+    assert portfolio["clause_risk_distribution"] == {"High": 2, "Medium": 1, "Low": 1}
+    assert portfolio["contract_risk_distribution"] == {"Low": 0, "Medium": 1, "High": 1}
+    assert portfolio["average_risk_score"] == 7.0
+    assert portfolio["incomplete_contracts"] == 1
+    assert portfolio["most_common_missing_clauses"][0] == {"clause": "Arbitration", "contracts": 3, "share": 1.0}
+    assert [c["report_id"] for c in portfolio["highest_risk_contracts"]] == ["r1", "r3"]
+    assert portfolio["llm_usage"] == {"calls": 2, "cost_usd": 1.0}
+
+
+class FakeStore:
+    def accept(self, data, filename, detach=False):
+        return f"hash-{filename}", data
+
+
+def test_collect_files_expands_zip_archives():
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as z:
+        z.writestr("a.txt", "contract a")
+        z.writestr("__MACOSX/._a.txt", "junk")
+        z.writestr("notes.md", "not a contract")
+    archive.seek(0)
+    files = collect_files([("batch.zip", archive), ("b.txt", io.BytesIO(b"contract b"))], FakeStore())
+    assert files == [("a.txt", "hash-a.txt", b"contract a"), ("b.txt", "hash-b.txt", b"contract b")]
+
+
+def test_collect_files_enforces_limits():
+    uploads = [(f"{i}.txt", io.BytesIO(b"x" * 10)) for i in range(3)]
+    with pytest.raises(BatchTooLargeError):
+        collect_files(uploads, FakeStore(), max_files=2)
+    uploads = [(f"{i}.txt", io.BytesIO(b"x" * 10)) for i in range(3)]
+    with pytest.raises(BatchTooLargeError):
+        collect_files(uploads, FakeStore(), max_bytes=25)
@@ -0,0 +1,39 @@
+from backend.core.classifier import DEFAULT_LABEL, ContractClassifier
+
+
+def test_distinctive_phrases_win():
+    ranked = ContractClassifier().rank(
+        "LEAVE AND LICENSE AGREEMENT\nThe licensor grants the premises to the licensee for rent.\n"
+        "1. The tenant shall pay rent of Rs. 20,000 and a security deposit.")
+    assert ranked[0]["label"] == "Lease Agreement"
+    assert abs(sum(r["confidence"] for r in ranked) - 1.0) < 0.01
+    assert ranked == sorted(ranked, key=lambda r: r["score"], reverse=True)
+
+
+def test_title_and_recitals_outweigh_the_body():
+    # The same words count header_boost times before the first clause heading
+    text = ("EMPLOYMENT AGREEMENT\nbetween the employer and the employee.\n"
+            "1. The vendor shall deliver goods.\n2. The supplier's delivery schedule applies.")
+    assert ContractClassifier().classify(text) == "Employment Agreement"
+    assert ContractClassifier(header_boost=1.0).rank(text)[0]["score"] < ContractClassifier().rank(text)[0]["score"]
+
+
+def test_overlapping_phrases_are_matched_in_one_pass():
+    classifier = ContractClassifier(keywords={"A": {"service": 1, "service agreement": 5}, "B": {"agreement": 2}})
+    scores = {r["label"]: r["score"] for r in classifier.rank("This service agreement. Another agreement.")}
+    # "service agreement" is taken as the longer phrase, not as "service" plus "agreement"
+    assert scores["A"] > scores["B"] > 0
+
+
+def test_no_evidence_gives_the_default_label_with_zero_confidence():
+    assert ContractClassifier().rank("Minutes of the meeting held on Monday.") == [
+        {"label": DEFAULT_LABEL, "score": 0.0, "confidence": 0.0}]
+
+
+def test_batch_keeps_input_order():
+    classifier = ContractClassifier()
+    texts = ["PARTNERSHIP DEED between the partners of the firm.", "Nothing relevant.",
+             "EMPLOYMENT AGREEMENT with the employee."]
+    labels = [ranked[0]["label"] for ranked in classifier.classify_batch(texts, top_k=2)]
+    assert labels == ["Partnership Deed", DEFAULT_LABEL, "Employment Agreement"]
+    assert all(len(ranked) <= 2 for ranked in classifier.classify_batch(texts, top_k=2))
@@ -0,0 +1,49 @@
+from backend.core.clause_diff import align_clauses, changed_ratio, redline, risk_change
+
+OLD = [
+    "1. Services. The Vendor shall provide the services described in Schedule A.",
+    "2. Payment. The Client shall pay each invoice within thirty days of receipt.",
+    "3. Termination. Either party may terminate this Agreement on sixty days notice.",
+    "4. Confidentiality. Each party shall keep the other party's information confidential.",
+]
+
+
+def statuses(ops):
+    return [(op["status"], op["old"], op["new"]) for op in ops]
+
+
+def test_identical_versions_are_unchanged():
+    ops = align_clauses(OLD, list(OLD))
+    assert all(op["status"] == "unchanged" for op in ops)
+    assert changed_ratio(OLD, OLD, ops) == 0.0
+
+
+def test_renumbering_and_whitespace_are_no_change():
+    new = ["5. Services.  The vendor shall provide the services described in Schedule A."] + OLD[1:]
+    assert statuses(align_clauses(OLD, new))[0] == ("unchanged", 0, 0)
+
+
+def test_modified_added_and_removed():
+    new = [OLD[0], OLD[1].replace("thirty", "fifteen"), OLD[3],
+           "5. Arbitration. Disputes go to a sole arbitrator seated in New Delhi."]
+    ops = statuses(align_clauses(OLD, new))
+    assert ("modified", 1, 1) in ops
+    assert ("removed", 2, None) in ops
+    assert ("added", None, 3) in ops
+    assert ("unchanged", 3, 2) in ops
+
+
+def test_moved_clause():
+    new = [OLD[0], OLD[2], OLD[1], OLD[3]]
+    ops = statuses(align_clauses(OLD, new))
+    assert any(status == "moved" for status, _, _ in ops)
+    assert not any(status in ("added", "removed") for status, _, _ in ops)
+
+
+def test_redline_and_risk_change():
+    segments = redline("pay within thirty days", "pay within fifteen days")
+    assert {"op": "delete", "text": "thirty"} in segments
+    assert {"op": "insert", "text": "fifteen"} in segments
+    assert risk_change("Low", "High") == "increased"
+    assert risk_change("High", "Medium") == "decreased"
+    assert risk_change(None, "High") == "unknown"
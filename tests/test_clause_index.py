@@ -0,0 +1,51 @@
+import time
+
+from backend.core.clause_index import ClauseIndex
+
+CLAUSE = ("The Vendor shall indemnify and hold harmless the Client against all losses, damages and "
+          "expenses arising out of any breach of this Agreement by the Vendor or its employees.")
+ANALYSIS = {"risk_level": "High", "category": "Liability & Indemnity"}
+SOURCE = {"report_id": "r1", "clause": "7"}
+
+
+def make_index(tmp_path, **kwargs):
+    return ClauseIndex(path=str(tmp_path / "clause_index.sqlite3"), **kwargs)
+
+
+def test_reuses_near_duplicate_with_other_party_and_amount(tmp_path):
+    index = make_index(tmp_path)
+    index.add(CLAUSE + " Liability is capped at Rs. 5,00,000.", "Service Contract", ANALYSIS, SOURCE, scope="s")
+    match = index.lookup(CLAUSE + " Liability is capped at Rs. 9,00,000.", "Service Contract", scope="s")
+    assert match is not None
+    analysis, score, source = match
+    assert analysis == ANALYSIS and source == SOURCE and score >= index.threshold
+
+
+def test_rejects_negated_clause(tmp_path):
+    index = make_index(tmp_path, threshold=0.8)
+    index.add(CLAUSE, "Service Contract", ANALYSIS, SOURCE, scope="s")
+    negated = CLAUSE.replace("shall indemnify", "shall not indemnify")
+    assert index.similarity(index.signature(CLAUSE), index.signature(negated)) >= index.threshold
+    assert index.lookup(negated, "Service Contract", scope="s") is None
+
+
+def test_rejects_other_scope_and_contract_type(tmp_path):
+    index = make_index(tmp_path)
+    index.add(CLAUSE, "Service Contract", ANALYSIS, SOURCE, scope="openai/gpt-4-turbo")
+    assert index.lookup(CLAUSE, "Service Contract", scope="anthropic/claude") is None
+    assert index.lookup(CLAUSE, "Lease Agreement", scope="openai/gpt-4-turbo") is None
+    assert index.lookup(CLAUSE, "Service Contract", scope="openai/gpt-4-turbo") is not None
+
+
+def test_expired_entries_are_not_reused(tmp_path):
+    index = make_index(tmp_path, ttl_seconds=0.05)
+    index.add(CLAUSE, "Service Contract", ANALYSIS, SOURCE)
+    time.sleep(0.1)
+    assert index.lookup(CLAUSE, "Service Contract") is None
+
+
+def test_trim_keeps_max_entries(tmp_path):
+    index = make_index(tmp_path, max_entries=10)
+    for i in range(100):
+        index.add(f"{CLAUSE} Schedule {'x' * i}.", "Service Contract", ANALYSIS, SOURCE)
+    assert len(index) == 10
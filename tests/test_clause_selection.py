@@ -0,0 +1,77 @@
+from backend.core.clause_selection import ClauseBudget, ClauseSelector
+
+CLAUSES = [
+    "The parties shall meet quarterly.",
+    "The Vendor shall indemnify the Client with unlimited liability for all losses and penalty.",
+    "Either party may terminate this Agreement on notice.",
+    "Notices shall be sent by email.",
+]
+
+
+def per_clause_cost(indices):
+    return {"llm_calls": len(indices), "tokens": 100 * len(indices), "seconds": 1.0 * len(indices)}
+
+
+def test_riskier_clauses_score_higher():
+    selector = ClauseSelector()
+    assert selector.score(CLAUSES[1]) > selector.score(CLAUSES[0])
+
+
+def test_max_clauses_keeps_the_riskiest_in_document_order():
+    selector = ClauseSelector()
+    indices, skipped, scores, estimate = selector.select(CLAUSES, ClauseBudget(max_clauses=2), per_clause_cost)
+    assert 1 in indices and len(indices) == 2
+    assert indices == sorted(indices)
+    assert sorted(i for i, _, _ in skipped) == sorted(set(range(4)) - set(indices))
+    assert all(reason == "max_clauses" for _, _, reason in skipped)
+    assert estimate == per_clause_cost(indices)
+
+
+def test_token_budget_is_respected():
+    indices, skipped, _, estimate = ClauseSelector().select(CLAUSES, ClauseBudget(max_tokens=250), per_clause_cost)
+    assert len(indices) == 2 and estimate["tokens"] <= 250
+    assert {reason for _, _, reason in skipped} == {"max_tokens"}
+
+
+def test_unlimited_budget_selects_everything():
+    indices, skipped, _, _ = ClauseSelector().select(CLAUSES, ClauseBudget(), per_clause_cost)
+    assert indices == [0, 1, 2, 3] and skipped == []
+
+
+def test_kept_clauses_do_not_count_towards_the_budget():
+    def cost(indices):
+        return per_clause_cost([i for i in indices if i not in (0, 3)])
+    indices, skipped, _, _ = ClauseSelector().select(CLAUSES, ClauseBudget(max_clauses=1), cost, keep=[0, 3])
+    assert indices == [0, 1, 3]
+    assert [(i, reason) for i, _, reason in skipped] == [(2, "max_clauses")]
+
+
+def test_from_env_overrides(monkeypatch):
+    monkeypatch.setenv("CLAUSE_BUDGET_MAX_CLAUSES", "15")
+    budget = ClauseBudget.from_env(max_clauses=0, max_llm_calls=3)
+    assert budget.max_clauses is None and budget.max_llm_calls == 3
+
+
+def test_long_documents_need_few_estimates_and_match_one_by_one_greedy():
+    clauses = [f"Clause {n}. " + "The vendor shall pay the penalty and indemnify. " * (1 + n * 7 % 5) for n in range(400)]
+    calls = []
+
+    def cost(indices):
+        calls.append(len(indices))
+        tokens = sum(len(clauses[i]) // 4 for i in indices)
+        return {"llm_calls": len(indices), "tokens": tokens, "seconds": 0.0}
+
+    budget = ClauseBudget(max_tokens=cost(range(400))["tokens"] // 3)
+    selector = ClauseSelector()
+    calls.clear()
+    indices, skipped, scores, estimate = selector.select(clauses, budget, cost)
+    assert len(calls) < 100  # Not one estimate per clause
+
+    # Same picks as trying every clause on its own, best score first
+    expected = []
+    for i in sorted(range(400), key=lambda i: (-scores[i], i)):
+        if budget.exceeded(len(expected) + 1, cost(expected + [i])) is None:
+            expected.append(i)
+    assert indices == sorted(expected)
+    assert estimate["tokens"] <= budget.max_tokens
+    assert {reason for _, _, reason in skipped} == {"max_tokens"}
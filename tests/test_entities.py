@@ -0,0 +1,73 @@
+from backend.core.entities import EntityPrepass, normalize_amount, normalize_date, split_sentences, words_to_number
+
+
+def test_normalize_amount_indian_formats():
+    assert normalize_amount("₹5,00,000/-") == (500000, "INR")
+    assert normalize_amount("Rs. 2.5 crore") == (25000000, "INR")
+    assert normalize_amount("INR 10 lakh") == (1000000, "INR")
+    assert normalize_amount("USD 1,000") == (1000, "USD")
+    assert normalize_amount("no money here") is None
+
+
+def test_normalize_date_day_first_and_month():
+    assert normalize_date("15/03/2024") == "2024-03-15"
+    assert normalize_date("15 March 2024") == "2024-03-15"
+    assert normalize_date("March 2024") == "2024-03"
+
+
+def test_normalize_date_rejects_invalid_and_ambiguous():
+    assert normalize_date("31/02/2024") is None
+    assert normalize_date("15.03.24") is None  # Dotted dates need a four-digit year
+    assert normalize_date("may 2024") is None  # Lower-case "may" is the verb
+
+
+def test_words_to_number():
+    assert words_to_number("five lakh twenty thousand") == 520000
+    assert words_to_number("two hundred and fifty") == 250
+    assert words_to_number("several") is None
+
+
+def test_split_sentences_keeps_abbreviations():
+    text = "Pay Rs. 500 now. Then stop.\nNext line"
+    assert [text[s:e] for s, e in split_sentences(text)] == ["Pay Rs. 500 now.", "Then stop.", "Next line"]
+
+
+def test_find_resolves_typed_mentions():
+    text = "The Client shall pay Rs. 5 lakh on 15 March 2024 to Acme Technologies Pvt. Ltd. in Mumbai."
+    mentions = {m["type"]: m for m in EntityPrepass().find(text)}
+    assert mentions["AMOUNT"]["value"] == 500000
+    assert mentions["DATE"]["value"] == "2024-03-15"
+    assert mentions["PARTY"]["value"] == "Acme Technologies Private Limited"
+    assert mentions["LOCATION"]["state"] == "Maharashtra"
+
+
+def test_find_ignores_clause_references():
+    text = "Subject to Clause 4.2 and Section 12(b), the Client may 2024 terminate."
+    assert EntityPrepass().find(text) == []
+
+
+def parties(text):
+    return [(m["text"], m["value"]) for m in EntityPrepass().find(text) if m["type"] == "PARTY"]
+
+
+def test_company_does_not_take_in_a_person_before_and():
+    assert parties("This Agreement is made between Ravi Kumar and Sharma Traders Pvt. Ltd. today.") == [
+        ("Sharma Traders Pvt. Ltd.", "Sharma Traders Private Limited")]
+
+
+def test_company_does_not_take_in_a_place_before_and():
+    mentions = EntityPrepass().find("between Acme Technologies Pvt. Ltd., Mumbai and Sharma & Sons LLP.")
+    assert [(m["type"], m["text"]) for m in mentions] == [
+        ("PARTY", "Acme Technologies Pvt. Ltd."), ("LOCATION", "Mumbai"), ("PARTY", "Sharma & Sons LLP")]
+
+
+def test_company_drops_roles_and_sentence_period():
+    assert parties("Signed by the Director of Gupta Steel Pvt Ltd on its behalf.") == [
+        ("Gupta Steel Pvt Ltd", "Gupta Steel Private Limited")]
+    assert parties("The supplier is Beta LLP.") == [("Beta LLP", "Beta LLP")]
+    assert parties("The supplier is Acme Ltd.") == [("Acme Ltd.", "Acme Limited")]
+
+
+def test_company_keeps_connectors_inside_names():
+    assert parties("Bank of Baroda Ltd and Larsen and Toubro Limited") == [
+        ("Bank of Baroda Ltd", "Bank of Baroda Limited"), ("Larsen and Toubro Limited", "Larsen and Toubro Limited")]
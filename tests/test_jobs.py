@@ -0,0 +1,73 @@
+import threading
+import time
+
+import pytest
+
+from backend.core.jobs import JobManager, QueueFullError
+
+
+def _wait(job, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while job.to_dict()["status"] in ("queued", "running"):
+        assert time.monotonic() < deadline, "job did not finish"
+        time.sleep(0.01)
+    return job.to_dict()
+
+
+def test_job_reports_progress_and_result():
+    manager = JobManager(workers=1, queue_depth=5)
+    release = threading.Event()
+
+    def pipeline(name, progress):
+        progress("analyzing", clauses_done=1, clauses_total=3)
+        release.wait(5)
+        return {"filename": name}
+
+    job = manager.submit(pipeline, "c.pdf")
+    deadline = time.monotonic() + 5
+    while job.to_dict()["progress"]["stage"] != "analyzing":
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert job.to_dict()["progress"] == {"stage": "analyzing", "clauses_done": 1, "clauses_total": 3}
+    assert manager.stats()["running"] == 1
+    release.set()
+    data = _wait(job)
+    assert data["status"] == "completed" and data["report"] == {"filename": "c.pdf"}
+    assert data["progress"]["stage"] == "done"
+    assert manager.get(job.id) is job
+
+
+def test_errors_fail_the_job():
+    manager = JobManager(workers=1, queue_depth=5)
+
+    def broken(progress):
+        raise ValueError("unreadable file")
+
+    assert _wait(manager.submit(broken))["error"] == "unreadable file"
+    # Pipelines that return an error report fail too
+    data = _wait(manager.submit(lambda progress: {"error": "No text found"}))
+    assert data["status"] == "failed" and data["error"] == "No text found"
+
+
+def test_full_queue_rejects_instead_of_blocking():
+    manager = JobManager(workers=1, queue_depth=1)
+    release = threading.Event()
+    running = manager.submit(lambda progress: release.wait(5))
+    while running.to_dict()["status"] == "queued":
+        time.sleep(0.01)
+    manager.submit(lambda progress: None)  # Fills the queue
+    with pytest.raises(QueueFullError):
+        manager.submit(lambda progress: None)
+    assert manager.stats()["queued"] == 1
+    release.set()
+
+
+def test_oldest_finished_jobs_are_forgotten():
+    manager = JobManager(workers=1, queue_depth=10, max_retained=3)
+    jobs = [manager.submit(lambda progress: {}) for _ in range(3)]
+    for job in jobs:
+        _wait(job)
+    latest = manager.submit(lambda progress: {})
+    assert manager.get(jobs[0].id) is None
+    assert manager.get(jobs[2].id) is jobs[2]
+    assert manager.get(latest.id) is latest
@@ -0,0 +1,20 @@
+from backend.core.language import LanguageSegment, detect_segments, split_span, translation_chunks
+
+
+def test_translation_chunks_skip_english():
+    text = "यह अनुबंध है।\n\nThis is English.\n\nभुगतान तीस दिनों में होगा।"
+    chunks = translation_chunks(detect_segments(text), text=text)
+    assert [text[s:e] for s, e in chunks] == ["यह अनुबंध है।", "भुगतान तीस दिनों में होगा।"]
+
+
+def test_translation_chunks_split_long_segment_at_danda():
+    sentence = "यह एक लंबा वाक्य है। "
+    text = sentence * 20
+    chunks = translation_chunks([LanguageSegment(0, len(text), "hi", 1.0)], max_chars=100, text=text)
+    assert all(e - s <= 100 for s, e in chunks)
+    assert all(text[s:e].rstrip().endswith("।") for s, e in chunks)
+    assert "".join(text[s:e] for s, e in chunks) == text
+
+
+def test_split_span_without_text_cuts_at_max_chars():
+    assert split_span(None, 0, 250, 100) == [(0, 100), (100, 200), (200, 250)]
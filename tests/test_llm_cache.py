@@ -0,0 +1,59 @@
+import time
+
+from backend.core.llm_cache import LLMCache
+
+
+def test_memory_and_disk_hits(tmp_path):
+    path = str(tmp_path / "llm_cache.sqlite3")
+    cache = LLMCache(path=path)
+    key = LLMCache.make_key("openai", "gpt-4-turbo", "analyze_clause:v1", "Service Contract", "Clause text")
+    assert cache.get(key) is None
+    cache.set(key, {"risk_level": "Low"})
+    assert cache.get(key) == {"risk_level": "Low"}
+    assert LLMCache(path=path).get(key) == {"risk_level": "Low"}  # Survives a restart
+
+
+def test_key_ignores_whitespace_and_case():
+    a = LLMCache.make_key("openai", "gpt-4-turbo", "analyze_clause:v1", "The  Vendor shall pay.")
+    b = LLMCache.make_key("openai", "gpt-4-turbo", "analyze_clause:v1", "the vendor shall pay.")
+    assert a == b
+    assert a != LLMCache.make_key("openai", "gpt-4-turbo", "analyze_clause:v2", "the vendor shall pay.")
+
+
+def test_entries_expire_after_ttl(tmp_path):
+    cache = LLMCache(path=str(tmp_path / "llm_cache.sqlite3"), ttl_seconds=0.05)
+    cache.set("key", {"value": 1})
+    time.sleep(0.1)
+    assert cache.get("key") is None
+    assert cache.misses == 1
+
+
+def test_disk_tier_is_trimmed_to_max_entries(tmp_path):
+    cache = LLMCache(path=str(tmp_path / "llm_cache.sqlite3"), max_entries=10, memory_entries=5)
+    for i in range(100):
+        cache.set(f"key-{i}", {"value": i})
+    assert cache._db.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0] == 10
+    assert len(cache._memory) == 5
+    assert cache.get("key-99") == {"value": 99}
+    assert LLMCache(path=cache.path).get("key-0") is None
+
+
+def test_memory_only_cache(tmp_path):
+    cache = LLMCache(path="")
+    cache.set("key", [1, 2])
+    assert cache.get("key") == [1, 2]
+
+
+def test_expired_entries_are_dropped_when_the_cache_is_opened(tmp_path):
+    path = str(tmp_path / "report_cache.sqlite3")
+    LLMCache(path=path, ttl_seconds=0.05).set("key", {"value": 1})
+    time.sleep(0.1)
+    cache = LLMCache(path=path, ttl_seconds=0.05)
+    assert cache._db.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0] == 0
+
+
+def test_trim_every_write(tmp_path):
+    cache = LLMCache(path=str(tmp_path / "report_cache.sqlite3"), max_entries=3, trim_every=1)
+    for i in range(5):
+        cache.set(f"key-{i}", {"value": i})
+    assert cache._db.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0] == 3
@@ -0,0 +1,138 @@
+import time
+
+import pytest
+
+from backend.core.llm_engine import LLMEngine, LLMRequestError, _estimate_tokens, call_deadline
+
+SECTION = {"key_points": ["Vendor invoices monthly."], "risks": ["Uncapped liability."],
+           "risk_score": 6, "clauses_present": ["Payment", "Liability"]}
+SUMMARY = {"summary": ["Point."], "composite_risk_score": 6, "top_risks": ["Liability"], "missing_clauses": []}
+
+
+def _engine(monkeypatch, prompts):
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "0")
+    monkeypatch.setenv("SUMMARY_SINGLE_MAX_TOKENS", "600")
+    monkeypatch.setenv("SUMMARY_CHUNK_TOKENS", "100")
+    engine = LLMEngine()
+    engine.is_live = lambda: True
+
+    def complete(prompt, cache_key=None):
+        prompts.append(prompt)
+        return dict(SUMMARY) if "findings for each part" in prompt else dict(SECTION)
+
+    engine._get_completion = complete
+    return engine
+
+
+def test_long_contract_is_merged_in_groups_within_budget(monkeypatch):
+    prompts = []
+    engine = _engine(monkeypatch, prompts)
+    sections = [f"Clause {n}. " + "The vendor shall deliver the services on time. " * 8 for n in range(60)]
+    result = engine.summarize_contract("\n\n".join(sections), "Service Contract", sections)
+
+    merges = [p for p in prompts if "findings for consecutive parts" in p]
+    reduces = [p for p in prompts if "findings for each part" in p]
+    assert merges and len(reduces) == 1
+    assert max(_estimate_tokens(p) for p in merges + reduces) <= engine.summary_single_max_tokens
+    chunks = result["coverage"]["chunks"]
+    assert chunks > 1 and result["coverage"]["summarized"] == chunks
+
+
+def test_failed_merges_are_left_out_of_coverage():
+    groups = [[{"part": 1}, {"part": 2}], [{"part": 3}, {"part": 4}, {"part": 5}]]
+    parts, covered = LLMEngine._merged_parts(groups, [{"error": "timeout"}, dict(SECTION)])
+    assert [p["part"] for p in parts] == [1]
+    assert covered == [3]
+    # A later level counts original parts, not merged ones
+    parts, covered = LLMEngine._merged_parts([[{"part": 1}, {"part": 2}]], [dict(SECTION)], [2, 3])
+    assert covered == [5]
+
+
+def test_calls_give_up_at_the_deadline(monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "0")
+    engine = LLMEngine()
+    timeouts = []
+
+    def send(prompt, **options):
+        timeouts.append(options.get("timeout"))
+        time.sleep(options["timeout"])
+        raise TimeoutError("Request timed out.")
+
+    engine._send = send
+    start = time.monotonic()
+    with call_deadline(0.3):
+        with pytest.raises(LLMRequestError, match="Request timed out"):
+            engine._request_completion("Clause Text: The vendor shall pay.")
+    assert len(timeouts) == 1 and 0 < timeouts[0] <= 0.3
+    assert time.monotonic() - start < 1.0  # No retries once the deadline has passed
+
+
+def _analysis(index, **overrides):
+    entry = {"index": index, "explanation": "Pays monthly.", "risk_level": "low", "risk_reason": "Standard.",
+             "suggestion": "None.", "category": "Payment"}
+    return dict(entry, **overrides)
+
+
+def test_batch_response_keeps_only_schema_valid_entries():
+    response = {"analyses": [
+        _analysis(0),
+        _analysis("1", risk_level=" HIGH "),
+        _analysis(1, explanation="Duplicate index."),
+        _analysis(2, risk_level="Severe"),
+        _analysis(3, suggestion=""),
+        _analysis(9),
+        {"explanation": "No index."},
+        "not an object",
+    ]}
+    valid = LLMEngine._parse_batch_response(response, expected=5)
+    assert sorted(valid) == [0, 1]
+    assert valid[0]["risk_level"] == "Low" and "index" not in valid[0]
+    assert valid[1]["risk_level"] == "High" and valid[1]["explanation"] == "Pays monthly."
+    assert LLMEngine._parse_batch_response({"error": "timeout"}, expected=2) == {}
+    assert LLMEngine._parse_batch_response([_analysis(0)], expected=1)[0]["category"] == "Payment"
+
+
+def test_batch_answers_are_cached_for_single_clause_calls(monkeypatch, tmp_path):
+    from backend.core.llm_cache import LLMCache
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "1")
+    engine = LLMEngine(cache=LLMCache(path=str(tmp_path / "cache.sqlite3")))
+    engine.is_live = lambda: True
+    prompts = []
+
+    def request(prompt):
+        prompts.append(prompt)
+        return {"analyses": [_analysis(0), _analysis(1)]}
+
+    engine._request_completion = request
+    clauses = ["The client shall pay monthly.", "Either party may terminate on notice."]
+    assert [a["risk_level"] for a in engine.analyze_clause_batch(clauses, "Service Contract")] == ["Low", "Low"]
+    assert engine.analyze_clause(clauses[1], "Service Contract")["category"] == "Payment"
+    assert len(prompts) == 1  # The single-clause call was a cache hit
+
+
+def test_clause_cache_key_follows_both_prompt_versions(monkeypatch, tmp_path):
+    from backend.core import llm_engine
+    from backend.core.llm_cache import LLMCache
+    engine = LLMEngine(cache=LLMCache(path=str(tmp_path / "cache.sqlite3")))
+    key = engine._clause_cache_key("Service Contract", "The client shall pay monthly.")
+    assert engine._clause_request("The client shall pay monthly.", "Service Contract")[1] == key
+    monkeypatch.setitem(llm_engine.PROMPT_VERSIONS, "analyze_clause_batch", "v-next")
+    assert engine._clause_cache_key("Service Contract", "The client shall pay monthly.") != key
+
+
+@pytest.mark.parametrize("provider, key_env, other_env", [
+    ("openai", "OPENAI_API_KEY", "ANTHROPIC_API_KEY"),
+    ("anthropic", "ANTHROPIC_API_KEY", "OPENAI_API_KEY"),
+])
+def test_only_the_providers_own_key_makes_it_live(monkeypatch, provider, key_env, other_env):
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "0")
+    monkeypatch.delenv(key_env, raising=False)
+    monkeypatch.setenv(other_env, "sk-test")
+    engine = LLMEngine(provider=provider)
+    assert not engine.is_live()
+    assert key_env in engine._get_completion("Clause Text: The vendor shall pay.")["error"]
+    monkeypatch.setenv(key_env, "your_key_here")  # The .env placeholder
+    assert not LLMEngine(provider=provider).is_live()
+    monkeypatch.setenv(key_env, "sk-test")
+    monkeypatch.setattr(LLMEngine, "_make_client", lambda self: object())  # No SDK client needed here
+    assert LLMEngine(provider=provider).is_live()
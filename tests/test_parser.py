@@ -0,0 +1,31 @@
+from benchmarks.corpus import write_pdf
+from backend.core.parser import ContractParser
+
+LINES = [f"{n}. Clause line {n} of the agreement." for n in range(1, 121)]
+
+
+def _pdf(tmp_path):
+    path = str(tmp_path / "contract.pdf")
+    write_pdf("\n".join(LINES), path, lines_per_page=10)  # 12 pages
+    return path
+
+
+def test_parallel_pages_match_serial_extraction(tmp_path):
+    path = _pdf(tmp_path)
+    serial = list(ContractParser(workers=1).iter_pdf_pages(path))
+    parallel = list(ContractParser(workers=2, pages_per_task=5, parallel_min_pages=2).iter_pdf_pages(path))
+    assert [p.number for p in parallel] == list(range(1, 13))
+    assert [p.text for p in parallel] == [p.text for p in serial]
+    assert "1. Clause line 1 " in parallel[0].text and "120. Clause line 120 " in parallel[-1].text
+
+
+def test_in_memory_source_and_stats(tmp_path):
+    with open(_pdf(tmp_path), "rb") as f:
+        data = f.read()
+    parser = ContractParser(workers=2, pages_per_task=4, parallel_min_pages=2)
+    text, stats = parser.parse_pdf_with_stats(memoryview(data))
+    assert stats["format"] == "pdf" and stats["pages"] == 12
+    assert len(stats["page_seconds"]) == 12
+    # Pages arrive in order, so every clause line appears once and in sequence
+    positions = [text.index(f"{line.split('.')[0]}. Clause line") for line in LINES]
+    assert positions == sorted(positions)
@@ -0,0 +1,101 @@
+import json
+
+from backend.core.rule_engine import FALLBACK, UNCERTAIN, RuleEngine
+
+
+def rule(rule_id, category, risk_level, patterns):
+    return {"id": rule_id, "category": category, "risk_level": risk_level, "patterns": patterns,
+            "explanation": rule_id, "risk_reason": rule_id, "suggestion": rule_id}
+
+
+def make_engine(tmp_path, rules, **kwargs):
+    path = tmp_path / "pack.json"
+    path.write_text(json.dumps({"name": "test", "version": 1, "rules": rules}))
+    return RuleEngine(paths=[str(path)], **kwargs)
+
+
+def test_strongest_rule_wins(tmp_path):
+    engine = make_engine(tmp_path, [
+        rule("payment", "Payment", "Low", {"invoice": 1}),
+        rule("liability", "Liability", "High", {"indemnify": 3, "unlimited liability": 3}),
+    ])
+    analysis = engine.analyze("The Vendor shall indemnify the Client with unlimited liability for each invoice.")
+    assert analysis["rule_id"] == "test/liability"
+    assert analysis["risk_level"] == "High"
+    assert analysis["source"] == "rules"
+
+
+def test_tie_goes_to_higher_risk(tmp_path):
+    engine = make_engine(tmp_path, [
+        rule("low", "Termination", "Low", {"terminate": 2}),
+        rule("high", "Termination", "High", {"terminate": 2}),
+    ])
+    assert engine.analyze("Either party may terminate.")["rule_id"] == "test/high"
+
+
+def test_heading_phrases_count_more(tmp_path):
+    engine = make_engine(tmp_path, [
+        rule("payment", "Payment", "Low", {"payment": 1}),
+        rule("termination", "Termination", "Medium", {"termination": 1}),
+    ])
+    clause = "Termination\nOn termination, any payment due is settled."
+    assert engine.analyze(clause)["rule_id"] == "test/termination"
+
+
+def test_conflicting_evidence_lowers_confidence(tmp_path):
+    engine = make_engine(tmp_path, [
+        rule("liability", "Liability", "High", {"indemnify": 3}),
+        rule("payment", "Payment", "Low", {"payment": 3}),
+    ])
+    clear = engine.analyze("The Vendor shall indemnify the Client.")
+    mixed = engine.analyze("The Vendor shall indemnify the Client for any payment.")
+    assert mixed["confidence"] < clear["confidence"]
+
+
+def test_contract_type_restricts_packs(tmp_path):
+    path = tmp_path / "lease.json"
+    path.write_text(json.dumps({"name": "lease", "contract_types": ["Lease Agreement"],
+                                "rules": [rule("rent", "Payment", "Medium", {"rent": 3})]}))
+    engine = RuleEngine(paths=[str(path)])
+    assert engine.analyze("The rent is due monthly.", "Lease Agreement")["rule_id"] == "lease/rent"
+    assert engine.analyze("The rent is due monthly.", "Service Contract")["rule_id"] == FALLBACK["id"]
+
+
+def test_answer_is_neutral_below_min_confidence(tmp_path):
+    engine = make_engine(tmp_path, [rule("liability", "Liability", "High", {"indemnify": 0.5})], min_confidence=0.7)
+    analysis = engine.answer("The Vendor shall indemnify the Client.")
+    assert analysis["rule_id"] == UNCERTAIN["id"]
+    assert analysis["risk_level"] == "Medium"
+    assert analysis["category"] == "Liability"
+    assert engine.answer("The parties shall meet.")["rule_id"] == FALLBACK["id"]
+
+
+def test_default_packs_answer_common_clauses():
+    engine = RuleEngine()
+    liability = engine.answer("The Vendor shall indemnify and hold harmless the Client against all losses.")
+    assert liability["risk_level"] == "High" and engine.is_confident(liability)
+    notice = engine.answer("Either party may terminate this Agreement by giving thirty days written notice.")
+    assert notice["rule_id"] == "general/termination-notice"
+
+
+def test_negated_trigger_is_left_to_the_llm():
+    engine = RuleEngine()
+    clause = "The Client shall not be required to indemnify the Vendor, and the Vendor waives any indemnity."
+    analysis = engine.analyze(clause)
+    assert analysis["rule_id"] == "general/unlimited-liability"
+    assert not engine.is_confident(analysis)
+    assert engine.answer(clause)["rule_id"] == UNCERTAIN["id"]
+
+
+def test_negation_idioms_and_prohibition_rules_keep_confidence():
+    engine = RuleEngine()
+    notice = engine.analyze("Either party may terminate this Agreement by giving not less than thirty days written notice.")
+    assert notice["rule_id"] == "general/termination-notice" and engine.is_confident(notice)
+    assignment = engine.analyze("Assignment. The Vendor shall not assign or subcontract this Agreement without consent.")
+    assert assignment["rule_id"] == "general/assignment" and engine.is_confident(assignment)
+
+
+def test_negation_only_counts_in_the_same_clause_part(tmp_path):
+    engine = make_engine(tmp_path, [rule("liability", "Liability", "High", {"indemnify": 3})])
+    assert engine.analyze("No fee is due; the Vendor shall indemnify the Client.")["confidence"] > 0.7
+    assert engine.analyze("The Vendor shall never indemnify the Client.")["confidence"] == 0.0
@@ -0,0 +1,126 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.core.scheduler import LLMScheduler, SchedulerBusyError, TokenBucket
+
+
+def drain(scheduler):
+    """Uses up the request budget so the next calls have to queue."""
+    scheduler._requests.level = 0.0
+
+
+def run_threads(target, args_list):
+    threads = [threading.Thread(target=target, args=args) for args in args_list]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    return threads
+
+
+def test_token_bucket_refills_evenly():
+    bucket = TokenBucket(60)
+    now = bucket.updated
+    bucket.take(60)
+    assert bucket.wait_time(1, now) == pytest.approx(1.0)
+    assert bucket.wait_time(1, now + 1.0) == 0.0
+    assert bucket.wait_time(1000, now) == pytest.approx(60.0)  # Capped at one minute's worth
+
+
+def test_interactive_is_served_before_batch():
+    scheduler = LLMScheduler("test", rpm=600, tpm=10 ** 9)
+    drain(scheduler)
+    order = []
+
+    def call(priority, delay):
+        time.sleep(delay)
+        scheduler.acquire(10, priority=priority)
+        order.append(priority)
+
+    run_threads(call, [("batch", 0.0), ("batch", 0.0), ("interactive", 0.02)])
+    assert order[0] == "interactive"
+
+
+def test_jobs_share_tokens_fairly():
+    scheduler = LLMScheduler("test", rpm=6000, tpm=10 ** 9)
+    drain(scheduler)
+    busy, light, order = object(), object(), []
+
+    def call(job, delay):
+        time.sleep(delay)
+        scheduler.acquire(100, priority="batch", job=job)
+        order.append(job)
+
+    run_threads(call, [(busy, 0.0)] * 6 + [(light, 0.02)])
+    assert order.index(light) < 5
+
+
+def test_interactive_call_times_out_and_queue_rejects():
+    scheduler = LLMScheduler("test", rpm=60, tpm=10 ** 9, max_queue=1, max_wait=0.2)
+    drain(scheduler)
+    errors = []
+
+    def call():
+        try:
+            scheduler.acquire(10)
+        except SchedulerBusyError as e:
+            errors.append(str(e))
+
+    run_threads(call, [()] * 3)
+    assert len(errors) == 3
+    assert any("queue is full" in e for e in errors) and any("Waited over" in e for e in errors)
+    assert scheduler.queued() == 0
+
+
+def test_batch_calls_wait_instead_of_failing():
+    scheduler = LLMScheduler("test", rpm=600, tpm=10 ** 9, max_queue=3, max_wait=0.05)
+    drain(scheduler)
+    admitted, errors = [], []
+
+    def call():
+        try:
+            scheduler.acquire(10, priority="batch")
+            admitted.append(time.monotonic())
+        except SchedulerBusyError as e:
+            errors.append(e)
+
+    started = time.monotonic()
+    run_threads(call, [()] * 12)
+    assert errors == [] and len(admitted) == 12
+    assert max(admitted) - started >= 1.0  # 12 calls at 10 per second
+    assert not scheduler.saturated()
+
+
+def test_batch_backpressure_async():
+    scheduler = LLMScheduler("test", rpm=600, tpm=10 ** 9, max_queue=2, max_wait=0.05)
+    drain(scheduler)
+    peak = []
+
+    async def call():
+        await scheduler.acquire_async(10, priority="batch", poll=0.01)
+        peak.append(scheduler._queued["batch"])
+
+    async def main():
+        await asyncio.gather(*(call() for _ in range(8)))
+
+    asyncio.run(main())
+    assert len(peak) == 8 and max(peak) <= 2
+
+
+def test_pause_holds_admissions():
+    scheduler = LLMScheduler("test", rpm=600, tpm=10 ** 9)
+    scheduler.pause(0.3)
+    assert scheduler.saturated()
+    started = time.monotonic()
+    scheduler.acquire(10, priority="batch")
+    assert time.monotonic() - started >= 0.25
+
+
+def test_settle_returns_unused_tokens():
+    scheduler = LLMScheduler("test", rpm=600, tpm=1000)
+    scheduler.acquire(800)
+    scheduler.settle(800, 200)
+    assert scheduler._tokens.level == pytest.approx(800, abs=5)
@@ -0,0 +1,53 @@
+from backend.core.segmenter import ClauseSegmenter
+
+CONTRACT = (
+    "SERVICE AGREEMENT\n"
+    "This agreement is made between Acme Pvt Ltd and Beta LLP.\n"
+    "Article I Payment\n"
+    "1. The client shall pay monthly.\n"
+    "1.1 Invoices are due in 30 days.\n"
+    "(a) by bank transfer; or\n"
+    "(b) by cheque.\n"
+    "2. Late payments carry interest.\n"
+    "Article II Termination\n"
+    "3. Either party may terminate on notice.\n"
+)
+
+
+def _shape(spans):
+    return [(s.label, s.start, s.end, s.body_end, s.depth, s.path()) for s in spans]
+
+
+def test_spans_are_offsets_into_the_source():
+    spans = ClauseSegmenter().segment(CONTRACT)
+    assert [s.label for s in spans] == ["", "Article I", "1", "1.1", "(a)", "(b)", "2", "Article II", "3"]
+    assert spans[0].text(CONTRACT).startswith("SERVICE AGREEMENT")
+    assert spans[0].end == spans[1].start == CONTRACT.index("Article I ")
+    for span in spans[1:]:
+        assert CONTRACT[span.start:].lstrip().startswith(span.label.split()[0])
+    assert spans[-1].end == len(CONTRACT)
+    # Every character after the preamble belongs to exactly one clause body
+    assert all(a.body_end == b.start for a, b in zip(spans, spans[1:]))
+
+
+def test_clause_tree():
+    spans = {s.label: s for s in ClauseSegmenter().segment(CONTRACT)}
+    assert spans["(a)"].path() == "Article I > 1 > 1.1 > (a)"
+    assert spans["1"].text(CONTRACT).endswith("(b) by cheque.\n")  # `end` covers sub-clauses
+    assert spans["1"].body(CONTRACT) == "1. The client shall pay monthly.\n"
+    assert spans["3"].parent is spans["Article II"]
+    assert spans["Article I"].end == spans["Article II"].start
+
+
+def test_chunked_input_matches_whole_text():
+    whole = _shape(ClauseSegmenter().segment(CONTRACT))
+    # Chunks cut mid-line (as PDF pages or network reads may be) give the same spans
+    for size in (7, 40, 101):
+        chunks = [CONTRACT[i:i + size] for i in range(0, len(CONTRACT), size)]
+        assert _shape(ClauseSegmenter().segment(iter(chunks))) == whole
+
+
+def test_fold_items_keeps_list_items_in_their_clause():
+    spans = {s.label: s for s in ClauseSegmenter(fold_items=True).segment(CONTRACT)}
+    assert "(a)" not in spans
+    assert spans["1.1"].body(CONTRACT).endswith("(b) by cheque.\n")
@@ -0,0 +1,52 @@
+import io
+import os
+import time
+
+from backend.core.uploads import UploadStore, content_sha256
+
+
+def _age(path, days):
+    old = time.time() - days * 24 * 3600
+    os.utime(path, (old, old))
+
+
+def test_identical_uploads_are_stored_once(tmp_path):
+    store = UploadStore(str(tmp_path), persist=True)
+    first_hash, first = store.accept(b"contract text", "a.TXT")
+    second_hash, second = store.accept(io.BytesIO(b"contract text"), "b.txt")
+    assert first == second == str(tmp_path / (first_hash + ".txt"))
+    assert first_hash == second_hash == content_sha256(b"contract text")
+    assert store.stats()["files"] == 1
+
+
+def test_held_files_survive_eviction(tmp_path):
+    store = UploadStore(str(tmp_path), persist=True, retention_days=1)
+    _, held = store.accept(b"in use", "a.txt")
+    _age(held, 5)
+    store.accept(b"other", "b.txt")
+    assert os.path.exists(held)
+    store.release(held)
+    store.evict()
+    assert not os.path.exists(held)
+
+
+def test_size_budget_evicts_oldest_first(tmp_path):
+    store = UploadStore(str(tmp_path), persist=True, max_bytes=25)
+    paths = []
+    for n in range(3):
+        _, path = store.accept(f"contract number {n}".encode(), "c.txt")  # 17 bytes each
+        store.release(path)
+        _age(path, 3 - n)
+        paths.append(path)
+    store.evict()
+    assert [os.path.exists(p) for p in paths] == [False, False, True]
+
+
+def test_stored_files_age_out_without_persist(tmp_path):
+    _, path = UploadStore(str(tmp_path), persist=True, retention_days=1).accept(b"old upload", "a.txt")
+    _age(path, 5)
+    store = UploadStore(str(tmp_path), persist=False, retention_days=1)
+    content_hash, source = store.accept(io.BytesIO(b"new upload"), "b.txt")
+    assert content_hash == content_sha256(b"new upload") and not isinstance(source, str)
+    assert not os.path.exists(path)
+    assert store.stats()["files"] == 0  # Nothing is written when not persisting